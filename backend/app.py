@@ -1,18 +1,58 @@
-from flask import Flask, jsonify, send_from_directory
+from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_migrate import Migrate
-from config import Config
+from config import Config, DEFAULT_ADMIN_PASSWORD, DEFAULT_SECRET_KEY
 from models import db
+from database import configure_engine, engine_options, replica_binds, replica_router
+from auth import token_cache
+from cache import response_cache
+from compression import response_compressor
+from jobs import job_queue
+from metrics import metrics
 from routes import api_bp
+from serializers import PortfolioJSONProvider
+from batch import batch_bp
+from changes import change_feed, changes_bp
+from search import include_name, search_bp, search_reindex_command
+from uploads import uploads_cli
+from static_assets import precompress_command, send_upload
+from export import export_static_command
+from schema import MIGRATIONS_DIR, deploy_command, prepare_schema
+from seed import seed_command
+from snapshots import snapshot_store, snapshots_cli
+from sprites import register_rebuild_hook, sprites_command
 import os
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    if app.config.get('REQUIRE_SECRETS'):
+        unset = [key for key, default in (('SECRET_KEY', DEFAULT_SECRET_KEY), ('ADMIN_PASSWORD', DEFAULT_ADMIN_PASSWORD)) if app.config.get(key) in (None, '', default)]
+        if unset:
+            raise RuntimeError(f"{' and '.join(unset)} must be set (and not the development default) in production")
+    app.json = PortfolioJSONProvider(app)
     
     # Initialize extensions
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**engine_options(app.config), **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+    app.config['SQLALCHEMY_BINDS'] = {**app.config.get('SQLALCHEMY_BINDS', {}), **replica_binds(app.config)}
     db.init_app(app)
-    migrate = Migrate(app, db)
+    replica_router.init_app(app)
+    # Registered before the compressor so its after_request hook runs last and sees the final response
+    metrics.init_app(app)
+    with app.app_context():
+        for key, engine in db.engines.items():
+            configure_engine(engine, app.config, read_only=key in replica_router.names)
+            metrics.instrument_engine(engine)
+            if key in replica_router.names:
+                replica_router.watch(key, engine)
+    migrate = Migrate(app, db, directory=MIGRATIONS_DIR, include_name=include_name)
+    response_cache.init_app(app)
+    response_compressor.init_app(app)
+    job_queue.init_app(app)
+    token_cache.init_app(app)
+    change_feed.init_app(app)
+    snapshot_store.init_app(app)
+    register_rebuild_hook(app)
     
     # Enable CORS
     CORS(app, resources={r"/*": {"origins": "*"}})
@@ -22,11 +62,24 @@ def create_app(config_class=Config):
     
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix='/api')
+    app.register_blueprint(batch_bp, url_prefix='/api')
+    app.register_blueprint(search_bp, url_prefix='/api')
+    app.register_blueprint(changes_bp, url_prefix='/api')
+    
+    # CLI commands
+    app.cli.add_command(uploads_cli)
+    uploads_cli.add_command(precompress_command)
+    uploads_cli.add_command(sprites_command)
+    app.cli.add_command(export_static_command)
+    app.cli.add_command(deploy_command)
+    app.cli.add_command(search_reindex_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(snapshots_cli)
     
     # Serve uploaded files
     @app.route('/uploads/<path:filename>')
     def uploaded_file(filename):
-        return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+        return send_upload(app.config['UPLOAD_FOLDER'], filename)
     
     # Health check endpoint
     @app.route('/')
@@ -37,14 +90,15 @@ def create_app(config_class=Config):
             'version': '2.0.0'
         })
     
-    # Create tables
-    with app.app_context():
-        db.create_all()
+    # Create or verify tables according to SCHEMA_MODE
+    prepare_schema(app)
     
     return app
 
 if __name__ == '__main__':
-    app = create_app()
+    # Development server only; production runs `gunicorn -c gunicorn.conf.py wsgi:app`
+    from config import config
+    app = create_app(config.get(os.environ.get('FLASK_CONFIG'), Config))
     app.run(
         host=app.config['HOST'],
         port=app.config['PORT'],
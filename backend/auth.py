@@ -0,0 +1,170 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+import jwt
+from flask import current_app, g, jsonify, request
+from sqlalchemy import delete, select
+from cache import on_commit
+from models import db, RevokedToken
+
+
+def generate_token():
+    return jwt.encode({'admin': True, 'exp': datetime.utcnow().timestamp() + 86400}, current_app.config['SECRET_KEY'], algorithm='HS256')
+
+def token_digest(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def bearer_token():
+    header = request.headers.get('Authorization')
+    if not header or not header.startswith('Bearer '):
+        return None
+    return header.split(' ')[1]
+
+
+class TokenCache:
+    """Verified admin tokens, so repeat requests skip ``jwt.decode``.
+
+    Entries are keyed by the SHA-256 of the token and live until the
+    token's ``exp`` claim or ``TOKEN_CACHE_TTL`` seconds, whichever comes
+    first, in an LRU of ``TOKEN_CACHE_SIZE`` entries. Revoked digests are
+    stored in the ``revoked_tokens`` table and re-read at most every
+    ``TOKEN_REVOCATION_REFRESH`` seconds (immediately after a local
+    revocation), so a logout reaches every worker.
+    """
+
+    def __init__(self, app=None):
+        self._entries = OrderedDict()
+        self._revoked = {}
+        self._revoked_at = None
+        self._lock = threading.Lock()
+        self.max_entries = 1024
+        self.ttl = 300
+        self.refresh = 5
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.revoked_hits = 0
+        self.check_seconds = 0.0
+        self.decode_seconds = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_entries = app.config.get('TOKEN_CACHE_SIZE', 1024)
+        self.ttl = app.config.get('TOKEN_CACHE_TTL', 300)
+        self.refresh = app.config.get('TOKEN_REVOCATION_REFRESH', 5)
+        app.extensions['token_cache'] = self
+
+    def _revoked_digests(self):
+        now = time.monotonic()
+        if self._revoked_at is None or now - self._revoked_at >= self.refresh:
+            rows = db.session.execute(select(RevokedToken.digest, RevokedToken.expires_at).where(RevokedToken.expires_at > datetime.utcnow()))
+            self._revoked = {digest: expires_at for digest, expires_at in rows}
+            self._revoked_at = now
+        return self._revoked
+
+    def _decode(self, token):
+        started = time.perf_counter()
+        try:
+            payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+        except jwt.PyJWTError:
+            return None
+        finally:
+            self.decode_seconds += time.perf_counter() - started
+        return payload if payload.get('admin') == True else None
+
+    def verify(self, token):
+        """True if ``token`` is a valid, unrevoked admin token."""
+        started = time.perf_counter()
+        try:
+            digest = token_digest(token)
+            if digest in self._revoked_digests():
+                self.revoked_hits += 1
+                return False
+            now = time.time()
+            with self._lock:
+                expires = self._entries.get(digest)
+                if expires is not None and expires > now:
+                    self._entries.move_to_end(digest)
+                    self.hits += 1
+                    return True
+                self._entries.pop(digest, None)
+                self.misses += 1
+            payload = self._decode(token)
+            if payload is None:
+                self.rejected += 1
+                return False
+            with self._lock:
+                self._entries[digest] = min(float(payload['exp']), now + self.ttl) if self.ttl else float(payload['exp'])
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return True
+        finally:
+            elapsed = time.perf_counter() - started
+            self.check_seconds += elapsed
+            g.auth_time = elapsed
+
+    def revoke(self, token):
+        """Persist ``token`` as revoked until its own expiry."""
+        try:
+            exp = jwt.decode(token, options={'verify_signature': False})['exp']
+        except (jwt.PyJWTError, KeyError):
+            return False
+        digest = token_digest(token)
+        db.session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        db.session.merge(RevokedToken(digest=digest, expires_at=datetime.utcfromtimestamp(exp)))
+        db.session.commit()
+        with self._lock:
+            self._entries.pop(digest, None)
+        return True
+
+    def mark_stale(self):
+        self._revoked_at = None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._revoked_at = None
+
+    def stats(self):
+        checks = self.hits + self.misses + self.revoked_hits
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / checks, 4) if checks else 0.0,
+            'rejected': self.rejected,
+            'revoked': len(self._revoked),
+            'revoked_hits': self.revoked_hits,
+            'avg_check_us': round(self.check_seconds / checks * 1e6, 1) if checks else 0.0,
+            'avg_decode_us': round(self.decode_seconds / self.misses * 1e6, 1) if self.misses else 0.0,
+        }
+
+
+token_cache = TokenCache()
+
+@on_commit
+def _reload_revocations(tables):
+    if RevokedToken.__tablename__ in tables:
+        token_cache.mark_stale()
+
+
+def verify_token(token):
+    return token_cache.verify(token)
+
+def admin_required(f):
+    @wraps(f)
+    def decorator(*args, **kwargs):
+        g.db_primary = True  # admin reads and writes never go to a replica
+        token = bearer_token()
+        if not token:
+            return jsonify({'error': 'No token provided'}), 401
+        if not verify_token(token):
+            return jsonify({'error': 'Invalid token'}), 401
+        return f(*args, **kwargs)
+    return decorator
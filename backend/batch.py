@@ -0,0 +1,222 @@
+from datetime import datetime
+from flask import Blueprint, jsonify, request
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from auth import admin_required
+from models import db, SocialLink, Skill, Service, Certification, WorkExperience, ExperienceSkill, Project, ProjectTechnology, KPI
+from tags import link_skills, sync_project_technologies
+
+batch_bp = Blueprint('batch', __name__)
+
+
+class Resource:
+    """How batch operations map onto one model."""
+
+    def __init__(self, model, fields, required=(), dates=(), children=(), derived=None, on_delete=None):
+        self.model = model
+        self.fields = fields
+        self.required = required
+        self.dates = dates
+        self.children = children  # (model, foreign key column) removed along with a row
+        self.derived = derived  # (field, fn(ids)) refreshing data derived from that field
+        self.on_delete = on_delete  # fn(ids) releasing references to rows about to be removed
+
+    def values(self, data):
+        values = {k: data[k] for k in self.fields if k in data}
+        if 'order' in values and values['order'] is None:
+            values['order'] = 0  # bulk UPDATEs bypass the ORM's null-to-0 listener (models.py)
+        for key in self.dates:
+            if values.get(key):
+                values[key] = datetime.fromisoformat(values[key])
+        return values
+
+
+RESOURCES = {
+    'social-links': Resource(SocialLink, ['platform', 'url', 'icon', 'order'], required=['platform', 'url']),
+    'skills': Resource(Skill, ['name', 'category', 'icon', 'order'], required=['name'], derived=('name', lambda ids: link_skills()), on_delete=lambda ids: link_skills(exclude=ids)),
+    'services': Resource(Service, ['title', 'description', 'icon', 'order'], required=['title', 'description']),
+    'certifications': Resource(Certification, ['name', 'issuer', 'badge_image', 'cert_image', 'issued_date', 'order'], required=['name'], dates=['issued_date']),
+    'experience': Resource(WorkExperience, ['company', 'role', 'start_date', 'end_date', 'summary', 'order'], required=['company', 'role', 'start_date'], dates=['start_date', 'end_date'], children=[(ExperienceSkill, ExperienceSkill.experience_id)]),
+    'experience-skills': Resource(ExperienceSkill, ['experience_id', 'skill_name', 'explanation', 'order'], required=['experience_id', 'skill_name', 'explanation']),
+    'projects': Resource(Project, ['name', 'description', 'image', 'live_url', 'github_url', 'technologies', 'order'], required=['name', 'description'], children=[(ProjectTechnology, ProjectTechnology.project_id)], derived=('technologies', sync_project_technologies)),
+    'kpis': Resource(KPI, ['title', 'description', 'status', 'target_date', 'visibility', 'order'], required=['title', 'description', 'status'], dates=['target_date']),
+}
+
+OPERATIONS = ('create', 'update', 'delete', 'reorder')
+
+
+def validate(op):
+    """Return an error message for a malformed operation, or None."""
+    if not isinstance(op, dict):
+        return 'Operation must be an object'
+    if op.get('resource') not in RESOURCES:
+        return f"Unknown resource: {op.get('resource')}"
+    if op.get('op') not in OPERATIONS:
+        return f"Unknown op: {op.get('op')}"
+    resource = RESOURCES[op['resource']]
+    if op.get('data') is not None and not isinstance(op['data'], dict):
+        return '"data" must be an object'
+    if op['op'] == 'create':
+        missing = [k for k in resource.required if not (op.get('data') or {}).get(k)]
+        if missing:
+            return f"Missing fields: {', '.join(missing)}"
+    elif op['op'] == 'reorder':
+        if not isinstance(op.get('ids'), list) or not all(isinstance(i, int) for i in op['ids']):
+            return 'reorder needs an "ids" list'
+    elif not isinstance(op.get('id'), int):
+        return f"{op['op']} needs an integer id"
+    if op['op'] in ('create', 'update'):
+        try:
+            resource.values(op.get('data') or {})
+        except (TypeError, ValueError) as e:
+            return f'Invalid date: {e}'
+    return None
+
+def referenced_ids(ops):
+    """Per model, every existing id the operations point at."""
+    ids = {}
+    for op in ops:
+        model = RESOURCES[op['resource']].model
+        if op['op'] == 'reorder':
+            ids.setdefault(model, set()).update(op['ids'])
+        elif op['op'] in ('update', 'delete'):
+            ids.setdefault(model, set()).add(op['id'])
+        elif op['resource'] == 'experience-skills':
+            ids.setdefault(WorkExperience, set()).add(op['data']['experience_id'])
+    return ids
+
+def missing_ids(ops):
+    """Errors for operations on rows that do not exist (one query per model)
+    or that an earlier operation of the batch deletes."""
+    existing = {}
+    for model, ids in referenced_ids(ops).items():
+        existing[model] = set(db.session.scalars(select(model.id).where(model.id.in_(ids))))
+    deleted = {}  # (model, id) -> index of the deleting operation
+    errors = {}
+
+    def problem(model, id):
+        if (model, id) in deleted:
+            return f'Deleted by operation {deleted[(model, id)]}'
+        return None if id in existing[model] else 'Not found'
+
+    for index, op in enumerate(ops):
+        model = RESOURCES[op['resource']].model
+        if op['op'] == 'reorder':
+            unknown = [i for i in op['ids'] if problem(model, i)]
+            if unknown:
+                errors[index] = f"Not found: {', '.join(map(str, unknown))}"
+        elif op['op'] in ('update', 'delete'):
+            error = problem(model, op['id'])
+            if error:
+                errors[index] = error
+            elif op['op'] == 'delete':
+                deleted[(model, op['id'])] = index
+        elif op['op'] == 'create' and op['resource'] == 'experience-skills':
+            error = problem(WorkExperience, op['data']['experience_id'])
+            if error:
+                errors[index] = f'Experience: {error}'
+    return errors
+
+
+def runs(ops):
+    """Split operations into consecutive runs of the same (resource, op)."""
+    run = []
+    for index, op in enumerate(ops):
+        if run and (op['resource'], op['op']) != (run[-1][1]['resource'], run[-1][1]['op']):
+            yield run
+            run = []
+        run.append((index, op))
+    if run:
+        yield run
+
+def apply_run(run, results):
+    """Apply one run with a single bulk statement (or one flush for creates)."""
+    resource = RESOURCES[run[0][1]['resource']]
+    model, kind = resource.model, run[0][1]['op']
+    if kind == 'create':
+        rows = [model(**resource.values(op['data'])) for _, op in run]
+        db.session.add_all(rows)
+        db.session.flush()
+        for (index, _), row in zip(run, rows):
+            results[index] = {'index': index, 'status': 'created', 'id': row.id}
+    elif kind == 'update':
+        params = [{'id': op['id'], **resource.values(op.get('data') or {})} for _, op in run]
+        params = [p for p in params if len(p) > 1]
+        if params:
+            # Bulk UPDATE by primary key; rows setting the same columns share one executemany
+            db.session.execute(update(model), params)
+        for index, op in run:
+            results[index] = {'index': index, 'status': 'updated', 'id': op['id']}
+    elif kind == 'reorder':
+        params = [{'id': id, 'order': position} for _, op in run for position, id in enumerate(op['ids'])]
+        if params:
+            db.session.execute(update(model), params)
+        for index, op in run:
+            results[index] = {'index': index, 'status': 'reordered', 'ids': op['ids']}
+    elif kind == 'delete':
+        ids = [op['id'] for _, op in run]
+        if resource.on_delete:
+            resource.on_delete(ids)
+        for child, foreign_key in resource.children:
+            db.session.execute(delete(child).where(foreign_key.in_(ids)))
+        db.session.execute(delete(model).where(model.id.in_(ids)))
+        for index, op in run:
+            results[index] = {'index': index, 'status': 'deleted', 'id': op['id']}
+
+    if resource.derived and kind in ('create', 'update'):
+        field, refresh = resource.derived
+        ids = [results[index]['id'] for index, op in run if field in (op.get('data') or {})]
+        if ids:
+            refresh(ids)
+
+
+def run_batch(ops):
+    """Validate and apply ``ops`` in one transaction; all or nothing.
+
+    Returns ``(results, status_code)`` with one result per operation.
+    """
+    errors = {i: e for i, e in ((i, validate(op)) for i, op in enumerate(ops)) if e}
+    if not errors:
+        errors = missing_ids(ops)
+    if errors:
+        return [{'index': i, 'status': 'error', 'error': errors[i]} if i in errors else {'index': i, 'status': 'skipped'} for i in range(len(ops))], 400
+
+    results = [None] * len(ops)
+    try:
+        for run in runs(ops):
+            apply_run(run, results)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        return [{'index': i, 'status': 'error', 'error': str(getattr(e, 'orig', None) or e)} for i in range(len(ops))], 409
+    return results, 200
+
+
+def operations_from_request(resource=None):
+    data = request.get_json(silent=True)
+    ops = data.get('operations') if isinstance(data, dict) else data
+    if not isinstance(ops, list):
+        return None
+    if resource:
+        ops = [{**op, 'resource': resource} if isinstance(op, dict) else op for op in ops]
+    return ops
+
+@batch_bp.route('/batch', methods=['POST'])
+@admin_required
+def batch():
+    ops = operations_from_request()
+    if ops is None:
+        return jsonify({'error': 'Expected a list of operations'}), 400
+    results, status = run_batch(ops)
+    return jsonify({'results': results}), status
+
+@batch_bp.route('/<resource>/batch', methods=['POST'])
+@admin_required
+def resource_batch(resource):
+    if resource not in RESOURCES:
+        return jsonify({'error': 'Unknown resource'}), 404
+    ops = operations_from_request(resource)
+    if ops is None:
+        return jsonify({'error': 'Expected a list of operations'}), 400
+    results, status = run_batch(ops)
+    return jsonify({'results': results}), status
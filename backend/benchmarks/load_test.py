@@ -0,0 +1,219 @@
+"""Load-test the API in-process and compare against a stored baseline.
+
+    python benchmarks/load_test.py [--db bench.db] [--requests 300] [--concurrency 8] [--no-cache] [--replicas N]
+                                   [--only get_projects ...] [--save-baseline FILE] [--baseline FILE]
+
+The app is built with create_app against a SQLite database filled by the
+synthetic seeder (created and seeded on first use, then migrated and reused
+so runs are comparable). Each scenario is driven by --concurrency threads, each with its
+own test client, for --requests requests in total. Queries per request are
+read from the Server-Timing header.
+
+With --baseline, every scenario is compared to the saved run and the
+script exits with status 1 when p95 latency or throughput regresses by
+more than --tolerance, or when a scenario issues more queries than before.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from config import Config  # noqa: E402
+from seed import DEFAULT_SIZES  # noqa: E402
+
+# name, method, path, admin, JSON body ({n} is replaced by the request number)
+SCENARIOS = [
+    ('get_portfolio', 'GET', '/api/portfolio?sections=about,skills,services,certifications,kpis,contact', False, None),
+    ('get_projects', 'GET', '/api/projects', False, None),
+    ('get_projects_page', 'GET', '/api/projects?limit=50', False, None),
+    ('get_projects_tech', 'GET', '/api/projects?tech=python,aws&limit=50', False, None),
+    ('get_project_facets', 'GET', '/api/projects/facets?tech=python', False, None),
+    ('get_experience', 'GET', '/api/experience', False, None),
+    ('get_experience_page', 'GET', '/api/experience?limit=20', False, None),
+    ('get_experience_detail', 'GET', '/api/experience/1', False, None),
+    ('get_skills', 'GET', '/api/skills', False, None),
+    ('get_certifications', 'GET', '/api/certifications', False, None),
+    ('get_kpis', 'GET', '/api/kpis', False, None),
+    ('search', 'GET', '/api/search?q=cloud+cache', False, None),
+    ('admin_get_all_kpis', 'GET', '/api/kpis/all?limit=100', True, None),
+    ('admin_update_project', 'PUT', '/api/projects/1', True, {'description': 'Updated description {n}'}),
+]
+
+QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def build_app(db_path, cache, sizes, replicas=0):
+    from app import create_app
+    from models import db
+    from schema import upgrade_database
+    from seed import seed_synthetic
+    from sqlalchemy import text
+
+    overrides = {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'SCHEMA_MODE': 'skip',
+        'ADMIN_PASSWORD': 'bench',
+        'RESPONSE_CACHE_ENABLED': cache,
+        'SERVER_TIMING': True,
+        'METRICS_QUERY_WARN': 10 ** 6,
+        'STATIC_EXPORT_ON_COMMIT': False,
+        'UPLOAD_FOLDER': os.path.join(os.path.dirname(os.path.abspath(db_path)), 'uploads'),
+    }
+    fresh = not os.path.exists(db_path)
+    app = create_app(type('LoadTestConfig', (Config,), overrides))
+    with app.app_context():
+        upgrade_database()
+        if fresh:
+            started = time.perf_counter()
+            counts = seed_synthetic(sizes)
+            print(f"Seeded {db_path} in {time.perf_counter() - started:.1f}s: " + ', '.join(f'{t}={n}' for t, n in counts.items()))
+        if replicas:
+            db.session.execute(text('PRAGMA wal_checkpoint(TRUNCATE)'))
+        db.session.remove()
+    if replicas:
+        # Static snapshots standing in for replicas: public reads go to them, writes stay on db_path
+        urls = []
+        for i in range(replicas):
+            path = f'{db_path}.replica{i}'
+            shutil.copyfile(db_path, path)
+            urls.append(f'sqlite:///{path}')
+        app = create_app(type('LoadTestConfig', (Config,), {**overrides, 'DATABASE_REPLICA_URLS': urls}))
+    return app
+
+
+def run_scenario(app, scenario, requests, concurrency, headers):
+    name, method, path, admin, body = scenario
+    latencies, queries, sizes, errors = [], [], [], [0]
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker():
+        client = app.test_client()
+        local = []
+        for n in counter:
+            payload = json.loads(json.dumps(body).replace('{n}', str(n))) if body else None
+            started = time.perf_counter()
+            response = client.open(path, method=method, json=payload, headers=headers if admin else None)
+            response.get_data()
+            elapsed = time.perf_counter() - started
+            match = QUERIES_RE.search(response.headers.get('Server-Timing', ''))
+            local.append((elapsed, int(match.group(1)) if match else 0, len(response.get_data()), response.status_code))
+        with lock:
+            for elapsed, count, size, status in local:
+                latencies.append(elapsed)
+                queries.append(count)
+                sizes.append(size)
+                if status >= 400:
+                    errors[0] += 1
+
+    for _ in range(3):  # warm up caches and connections
+        app.test_client().open(path, method=method, json=json.loads(json.dumps(body).replace('{n}', 'warmup')) if body else None, headers=headers if admin else None)
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    pct = lambda p: round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': round(len(latencies) / wall, 1),
+        'p50_ms': pct(0.50),
+        'p95_ms': pct(0.95),
+        'p99_ms': pct(0.99),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2),
+        'queries': round(statistics.fmean(queries), 2),
+        'bytes': int(statistics.fmean(sizes)),
+    }
+
+
+def environment(args):
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        revision = ''
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'cpus': os.cpu_count(), 'platform': platform.platform(),
+            'revision': revision, 'requests': args.requests, 'concurrency': args.concurrency, 'cache': not args.no_cache, 'replicas': args.replicas,
+            'sizes': {'projects': args.projects, 'experiences': args.experiences, 'skills_per_experience': args.skills_per_experience}}
+
+
+def compare(results, baseline, tolerance):
+    """Print deltas against ``baseline``; return the names that regressed."""
+    regressions = []
+    print(f"\n{'scenario':<24}{'p95 ms':>18}{'req/s':>20}{'queries':>14}")
+    for name, r in results.items():
+        before = baseline['results'].get(name)
+        if not before:
+            print(f"{name:<24}{'(new)':>18}")
+            continue
+        p95 = (r['p95_ms'] - before['p95_ms']) / before['p95_ms'] if before['p95_ms'] else 0.0
+        rps = (r['rps'] - before['rps']) / before['rps'] if before['rps'] else 0.0
+        worse = p95 > tolerance or rps < -tolerance or r['queries'] > before['queries']
+        if worse:
+            regressions.append(name)
+        print(f"{name:<24}{before['p95_ms']:>8} -> {r['p95_ms']:<7}{before['rps']:>9} -> {r['rps']:<8}{before['queries']:>5} -> {r['queries']:<5}{'  REGRESSED' if worse else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=os.path.join(tempfile.gettempdir(), 'portfolio-loadtest.db'), help='SQLite file, seeded when it does not exist')
+    parser.add_argument('--requests', type=int, default=300, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--no-cache', action='store_true', help='disable the response cache to measure the routes themselves')
+    parser.add_argument('--only', nargs='*', help='scenario names to run')
+    parser.add_argument('--replicas', type=int, default=0, help='serve public reads from N snapshot copies of the database')
+    parser.add_argument('--projects', type=int, default=DEFAULT_SIZES['projects'])
+    parser.add_argument('--experiences', type=int, default=DEFAULT_SIZES['experiences'])
+    parser.add_argument('--skills-per-experience', type=int, default=DEFAULT_SIZES['skills_per_experience'])
+    parser.add_argument('--save-baseline', metavar='FILE', help='write this run to FILE')
+    parser.add_argument('--baseline', metavar='FILE', help='compare against a run saved with --save-baseline')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='allowed relative p95/throughput change (default 0.15)')
+    args = parser.parse_args()
+
+    sizes = {'projects': args.projects, 'experiences': args.experiences, 'skills_per_experience': args.skills_per_experience}
+    app = build_app(os.path.abspath(args.db), not args.no_cache, sizes, args.replicas)
+    token = app.test_client().post('/api/auth/login', json={'password': 'bench'}).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    scenarios = [s for s in SCENARIOS if not args.only or s[0] in args.only]
+    results = {}
+    print(f"{'scenario':<24}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'KiB':>8}{'errors':>8}")
+    for scenario in scenarios:
+        r = results[scenario[0]] = run_scenario(app, scenario, args.requests, args.concurrency, headers)
+        print(f"{scenario[0]:<24}{r['rps']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['queries']:>9}{r['bytes'] / 1024:>8.1f}{r['errors']:>8}")
+
+    run = {'environment': environment(args), 'results': results}
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(run, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        mismatched = {k: (baseline['environment'].get(k), v) for k, v in run['environment'].items() if k not in ('revision', 'platform') and baseline['environment'].get(k) != v}
+        if mismatched:
+            print(f"\nWarning: baseline recorded with different settings: {mismatched}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Measure serialization CPU for large project and experience payloads.
+
+    python benchmarks/serialize_bench.py [--rows 500] [--runs 200]
+
+Compares the original hand-written serializers encoded by Flask's default
+JSON provider with the compiled row serializers encoded by
+PortfolioJSONProvider (stdlib and, when installed, orjson). Rows are
+built in memory, so no database time is included.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+from models import ExperienceSkill, Project, WorkExperience  # noqa: E402
+from routes import experience_to_dict, project_to_dict  # noqa: E402
+from serializers import PortfolioJSONProvider, orjson  # noqa: E402
+
+
+def legacy_experience(e):
+    return {'id': e.id, 'company': e.company, 'role': e.role, 'start_date': e.start_date.isoformat(), 'end_date': e.end_date.isoformat() if e.end_date else None, 'summary': e.summary, 'order': e.order, 'skills_acquired': [{'id': s.id, 'skill_name': s.skill_name, 'explanation': s.explanation, 'order': s.order} for s in e.skills_acquired]}
+
+def legacy_project(p):
+    return {'id': p.id, 'name': p.name, 'description': p.description, 'image': p.image, 'live_url': p.live_url, 'github_url': p.github_url, 'technologies': p.technologies, 'order': p.order}
+
+
+def build_rows(count):
+    projects = [Project(id=i, name=f'Project {i}', description='A longer project description. ' * 8, image=f'/uploads/{i:064x}.png',
+                        live_url=f'https://example.com/{i}', github_url=f'https://github.com/example/{i}', technologies='python, flask, angular, aws', order=i)
+                for i in range(count)]
+    experience = []
+    for i in range(count):
+        e = WorkExperience(id=i, company=f'Company {i}', role='Engineer', start_date=date(2020, 1, 1), end_date=date(2022, 6, 30) if i % 2 else None,
+                           summary='Worked on things. ' * 10, order=i)
+        e.skills_acquired = [ExperienceSkill(id=i * 10 + j, skill_name=f'Skill {j}', explanation='Explained at length. ' * 4, order=j) for j in range(5)]
+        experience.append(e)
+    return projects, experience
+
+
+def measure(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500)
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    projects, experience = build_rows(args.rows)
+    app = Flask(__name__)
+    providers = [('legacy + flask json', DefaultJSONProvider(app), legacy_project, legacy_experience)]
+    for backend in ('stdlib', 'orjson') if orjson is not None else ('stdlib',):
+        app.config['JSON_BACKEND'] = backend
+        providers.append((f'compiled + {backend}', PortfolioJSONProvider(app), project_to_dict, experience_to_dict))
+
+    print(f"{args.rows} rows, median of {args.runs} runs")
+    print(f"{'serializer':<24}{'projects ms':>14}{'experience ms':>16}")
+    baseline = None
+    for name, provider, project, exp in providers:
+        timings = (measure(lambda: provider.response([project(p) for p in projects]), args.runs),
+                   measure(lambda: provider.response([exp(e) for e in experience]), args.runs))
+        baseline = baseline or timings
+        speedup = ' '.join(f'{b / t:.1f}x' for b, t in zip(baseline, timings))
+        print(f"{name:<24}{timings[0]:>14.2f}{timings[1]:>16.2f}   {speedup}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Compare request throughput of the Werkzeug dev server and gunicorn.
+
+    python benchmarks/serve_bench.py [--duration 10] [--concurrency 16] [--path /api/portfolio]
+
+Both servers run as subprocesses against the same throwaway SQLite
+database, and are hammered with keep-alive HTTP/1.1 clients on threads.
+"""
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+
+def prepare_database(path):
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    from app import create_app
+    from config import Config
+    from models import db, About, Skill, Project, WorkExperience, ExperienceSkill
+    from schema import upgrade_database
+    app = create_app(type('BenchConfig', (Config,), {'SCHEMA_MODE': 'skip'}))
+    with app.app_context():
+        upgrade_database()
+        db.session.add(About(overview='Benchmark portfolio'))
+        db.session.add_all(Skill(name=f'Skill {i}', category='backend', order=i) for i in range(30))
+        db.session.add_all(Project(name=f'Project {i}', description='x' * 2000, technologies='python, aws', order=i) for i in range(50))
+        for i in range(20):
+            exp = WorkExperience(company=f'Company {i}', role='Engineer', start_date=date(2020, 1, 1), summary='y' * 1000, order=i)
+            exp.skills_acquired = [ExperienceSkill(skill_name=f'S{j}', explanation='z' * 300, order=j) for j in range(10)]
+            db.session.add(exp)
+        db.session.commit()
+
+
+def wait_for(port, timeout=20):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/')
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def load(port, path, duration, concurrency):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop = time.time() + duration
+
+    def worker():
+        conn, local = None, []
+        while time.time() < stop:
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+                start = time.perf_counter()
+                conn.request('GET', path)
+                response = conn.getresponse()
+                response.read()
+                local.append(time.perf_counter() - start)
+                if response.getheader('Connection', '').lower() == 'close' or response.version == 10:
+                    conn.close()
+                    conn = None
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn = None
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': round(pct(0.50), 2),
+        'p95_ms': round(pct(0.95), 2),
+        'p99_ms': round(pct(0.99), 2),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else 0,
+    }
+
+
+def run_server(name, cmd, env, port, args):
+    proc = subprocess.Popen(cmd, cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for(port)
+        load(port, args.path, 1, args.concurrency)  # warm-up
+        return load(port, args.path, args.duration, args.concurrency)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--path', default='/api/portfolio')
+    parser.add_argument('--workers', type=int, default=0, help='gunicorn workers (0 = 2 x cores + 1)')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    db_path = os.path.join(tmp, 'bench.db')
+    prepare_database(db_path)
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', ADMIN_PASSWORD='bench', SECRET_KEY='bench-secret', HOST='127.0.0.1', DEBUG='False', WSGI_WORKERS=str(args.workers))
+
+    results = {
+        'dev server': run_server('dev', [sys.executable, 'app.py'], dict(env, PORT='5101'), 5101, args),
+        'gunicorn': run_server('gunicorn', [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'], dict(env, PORT='5102', FLASK_CONFIG='production'), 5102, args),
+    }
+    print(f"{'server':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<12}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['errors']:>8}")
+
+
+if __name__ == '__main__':
+    main()
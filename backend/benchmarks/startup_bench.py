@@ -0,0 +1,54 @@
+"""Measure cold-start time of create_app for each SCHEMA_MODE.
+
+    python benchmarks/startup_bench.py [--runs 7]
+
+Every run is a fresh interpreter against the same migrated SQLite database,
+so module import and schema handling are both included, as they are when a
+new worker boots.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, time
+start = time.perf_counter()
+from app import create_app
+from config import Config
+imported = time.perf_counter()
+create_app(Config)
+done = time.perf_counter()
+print(json.dumps({'import': imported - start, 'create_app': done - imported}))
+"""
+
+
+def run(env):
+    out = subprocess.run([sys.executable, '-c', PROBE], cwd=BACKEND, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'startup.db')
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{db_path}', FLASK_APP='app.py')
+    subprocess.run([sys.executable, '-m', 'flask', 'deploy'], cwd=BACKEND, env=env, capture_output=True, check=True)
+
+    print(f"{'SCHEMA_MODE':<12}{'import ms':>12}{'create_app ms':>16}")
+    for mode in ('create', 'verify', 'skip'):
+        samples = [run(dict(env, SCHEMA_MODE=mode)) for _ in range(args.runs)]
+        imported = statistics.median(s['import'] for s in samples) * 1000
+        created = statistics.median(s['create_app'] for s in samples) * 1000
+        print(f"{mode:<12}{imported:>12.1f}{created:>16.1f}")
+
+
+if __name__ == '__main__':
+    main()
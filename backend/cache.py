@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class CachedResponse:
+    """A rendered response body kept in the cache, plus its compressed
+    forms (encoding -> bytes) as they are first requested. Bodies loaded
+    from the snapshot store are memoryviews of the shared file."""
+    __slots__ = ('body', 'status', 'mimetype', 'headers', 'created_at', 'encoded', 'snapshot')
+
+    def __init__(self, body, status, mimetype, headers=()):
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.headers = headers
+        self.created_at = time.monotonic()
+        self.encoded = {}
+        self.snapshot = None  # (store, path) when backed by the snapshot store
+
+    @classmethod
+    def from_response(cls, response):
+        headers = [(k, v) for k, v in response.headers.items() if k not in ('Content-Type', 'Content-Length')]
+        return cls(response.get_data(), response.status_code, response.mimetype, headers)
+
+    def to_response(self):
+        # A memoryview is passed through as the single chunk of the body, without copying
+        body = self.body if isinstance(self.body, bytes) else [self.body]
+        return current_app.response_class(body, status=self.status, mimetype=self.mimetype, headers=self.headers)
+
+
+class ResponseCache:
+    """Size-bounded LRU cache for public GET responses.
+
+    Keys combine the endpoint, its view/query arguments and the current
+    version of every table the route reads. Committing a change to a table
+    bumps its version, so stale entries are never looked up again and simply
+    age out of the LRU. With a ``shared`` store (snapshots.py) the versions
+    are the generations shared by all workers and misses are looked up in
+    the store before the view runs.
+    """
+
+    def __init__(self, app=None):
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.max_entries = 512
+        self.ttl = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.shared = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('RESPONSE_CACHE_ENABLED', True)
+        self.max_entries = app.config.get('RESPONSE_CACHE_SIZE', 512)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 0)
+        self.clear()  # entries of another app in this process must not be served
+        app.extensions['response_cache'] = self
+
+    def versions(self, tables):
+        if self.shared is not None:
+            return self.shared.generations(tables)
+        return tuple(self._versions.get(t, 0) for t in tables)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.monotonic() - entry.created_at > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'versions': dict(self._versions),
+            }
+
+    def cached(self, *models, shared=True):
+        """Cache a GET view until one of ``models``' tables is written.
+
+        Only canonical requests (no query string) of ``shared`` views go to
+        the snapshot store; anything else is cached in memory only, so
+        arbitrary query strings cannot make clients write files.
+        """
+        tables = tuple(m.__tablename__ for m in models)
+
+        def wrapper(f):
+            @wraps(f)
+            def decorator(*args, **kwargs):
+                if not self.enabled or request.method != 'GET':
+                    return f(*args, **kwargs)
+                key = (request.endpoint, tuple(sorted(kwargs.items())), tuple(sorted(request.args.items(multi=True))), self.versions(tables))
+                entry = self.get(key)
+                if entry is not None:
+                    g.response_cache = 'hit'
+                    g.response_cache_entry = entry
+                    return entry.to_response()
+                store = self.shared if shared and not request.args else None
+                entry = store.load(key) if store is not None else None
+                if entry is not None:
+                    g.response_cache = 'shared'
+                    g.response_cache_entry = entry
+                    self.set(key, entry)
+                    return entry.to_response()
+                g.response_cache = 'miss'
+                # A lagging replica would be cached (and ETag-stamped) until the next write, so fills read the primary
+                g.db_primary = True
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    entry = CachedResponse.from_response(response)
+                    if store is not None:
+                        entry = store.save(key, entry)
+                    g.response_cache_entry = entry
+                    self.set(key, entry)
+                return response
+            return decorator
+        return wrapper
+
+
+response_cache = ResponseCache()
+
+
+# ========== INVALIDATION ==========
+# Tables touched by a session are collected on flush (and on bulk ORM
+# statements, which bypass the unit of work) and invalidated only once the
+# transaction actually commits. Other subsystems that derive data from the
+# tables subscribe with on_commit().
+
+_commit_listeners = []
+
+def on_commit(fn):
+    """Call ``fn(tables)`` after every commit that wrote to ``tables``."""
+    _commit_listeners.append(fn)
+    return fn
+
+def _touched(session):
+    return session.info.setdefault('touched_tables', set())
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    touched = _touched(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, '__tablename__', None)
+        if table:
+            touched.add(table)
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_tables(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, 'table', None)
+        if table is not None:
+            _touched(orm_execute_state.session).add(table.name)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed_tables(session):
+    touched = session.info.pop('touched_tables', None)
+    if touched:
+        response_cache.invalidate(touched)
+        for listener in _commit_listeners:
+            listener(touched)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back_tables(session):
+    session.info.pop('touched_tables', None)
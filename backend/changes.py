@@ -0,0 +1,286 @@
+import threading
+import time
+from datetime import datetime, timedelta
+from itertools import chain
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from sqlalchemy import delete, event, func, insert, or_, select
+from sqlalchemy.orm import Session
+from auth import admin_required
+from cache import on_commit
+from models import db, Change, SocialLink, About, Skill, Service, Certification, WorkExperience, ExperienceSkill, Project, Technology, KPI, Contact
+from routes import (about_to_dict, certification_to_dict, contact_to_dict, experience_skill_to_dict, experience_to_dict, kpi_to_dict,
+                    project_to_dict, service_to_dict, skill_to_dict, social_link_to_dict, technology_to_dict)
+
+changes_bp = Blueprint('changes', __name__)
+
+# Logged tables: table -> (model, serializer for the row's current state)
+FEED = {m.__tablename__: (m, serialize) for m, serialize in (
+    (SocialLink, social_link_to_dict),
+    (About, about_to_dict),
+    (Skill, skill_to_dict),
+    (Service, service_to_dict),
+    (Certification, certification_to_dict),
+    (WorkExperience, experience_to_dict),
+    (ExperienceSkill, experience_skill_to_dict),
+    (Project, project_to_dict),
+    (Technology, technology_to_dict),
+    (KPI, kpi_to_dict),
+    (Contact, contact_to_dict),
+)}
+
+# Child tables whose writes also change the serialized parent: table -> (parent table, foreign key)
+PARENTS = {
+    'experience_skills': ('work_experience', 'experience_id'),
+    'project_technologies': ('projects', 'project_id'),
+}
+
+LOGGED = set(FEED) | set(PARENTS)
+
+# Within one flush or statement a row is logged once, with the strongest op
+RANK = {'update': 0, 'create': 1, 'delete': 2}
+
+
+class ChangeFeed:
+    """Wakes long-poll and stream readers of ``/api/changes``.
+
+    Every admin write appends rows to the ``changes`` table inside the
+    writing transaction (see the session listeners below), so the feed is
+    shared by all workers. A commit in this process wakes its waiting
+    readers at once; readers in other workers notice within
+    ``CHANGES_POLL_INTERVAL`` seconds. Entries older than
+    ``CHANGES_RETENTION_DAYS`` are pruned at most hourly by the writer.
+
+    SQLite serializes writers, so ids become visible in order. A server
+    database can commit a later id before an earlier one, and a reader that
+    already moved past the gap would never see the earlier change; there,
+    entries younger than ``CHANGES_SETTLE_SECONDS`` (and everything after
+    them) are held back, which covers any write transaction shorter than
+    that.
+    """
+
+    def __init__(self, app=None):
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._pruned_at = 0.0
+        self.retention_days = 30
+        self.poll_interval = 1.0
+        self.wait_max = 25
+        self.stream_max = 300
+        self.heartbeat = 15
+        self.limit_max = 1000
+        self.settle = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.retention_days = app.config.get('CHANGES_RETENTION_DAYS', 30)
+        self.poll_interval = app.config.get('CHANGES_POLL_INTERVAL', 1.0)
+        self.wait_max = app.config.get('CHANGES_WAIT_MAX', 25)
+        self.stream_max = app.config.get('CHANGES_STREAM_MAX', 300)
+        self.heartbeat = app.config.get('CHANGES_HEARTBEAT', 15)
+        self.limit_max = app.config.get('CHANGES_LIMIT_MAX', 1000)
+        self.settle = app.config.get('CHANGES_SETTLE_SECONDS')
+        if self.settle is None:
+            self.settle = 0 if app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite') else 5
+        app.extensions['change_feed'] = self
+
+    def notify(self):
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    def wait(self, timeout):
+        """Block until the next local commit or ``timeout`` seconds."""
+        with self._condition:
+            generation = self._generation
+            self._condition.wait_for(lambda: self._generation != generation, timeout)
+
+    def prune_due(self):
+        if not self.retention_days or time.monotonic() - self._pruned_at < 3600:
+            return False
+        self._pruned_at = time.monotonic()
+        return True
+
+
+change_feed = ChangeFeed()
+
+
+# ========== RECORDING ==========
+# ORM writes are logged after each flush and bulk UPDATE/DELETE statements
+# (batch.py) before they run, so ids matched by a WHERE clause are still
+# there to read. The log rows are written on the session's own connection
+# and commit or roll back with the change itself. Bulk INSERTs (used only by
+# the seeder) are not logged.
+
+def _key_columns(table):
+    return ('id', PARENTS[table][1]) if table in PARENTS else ('id',)
+
+def _add(pending, table, row_id, op):
+    key = (table, row_id)
+    if row_id is not None and (key not in pending or RANK[op] > RANK[pending[key]]):
+        pending[key] = op
+
+def _collect(pending, table, row, op):
+    if table in FEED:
+        _add(pending, table, row.get('id'), op)
+    if table in PARENTS:
+        parent, column = PARENTS[table]
+        _add(pending, parent, row[column], 'update')
+
+def _log(session, pending):
+    if not pending:
+        return
+    now = datetime.utcnow()
+    connection = session.connection()
+    connection.execute(insert(Change.__table__), [{'table_name': table, 'row_id': row_id, 'op': op, 'created_at': now} for (table, row_id), op in pending.items()])
+    if change_feed.prune_due():
+        connection.execute(delete(Change.__table__).where(Change.created_at < now - timedelta(days=change_feed.retention_days)))
+
+@event.listens_for(Session, 'after_flush')
+def _log_flushed_rows(session, flush_context):
+    pending = {}
+    for obj, op in chain(((o, 'create') for o in session.new),
+                         ((o, 'update') for o in session.dirty if session.is_modified(o)),
+                         ((o, 'delete') for o in session.deleted)):
+        table = getattr(obj, '__tablename__', None)
+        if table in LOGGED:
+            _collect(pending, table, {c: getattr(obj, c, None) for c in _key_columns(table)}, op)
+    _log(session, pending)
+
+@event.listens_for(Session, 'do_orm_execute')
+def _log_bulk_statements(orm_execute_state):
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    statement = orm_execute_state.statement
+    table = getattr(statement, 'table', None)
+    if table is None or table.name not in LOGGED:
+        return
+    op = 'delete' if orm_execute_state.is_delete else 'update'
+    columns = [c for c in _key_columns(table.name) if c in table.c]
+    parameters = orm_execute_state.parameters
+    query = select(*(table.c[c] for c in columns))
+    if isinstance(parameters, list) and statement.whereclause is None:
+        query = query.where(table.c.id.in_([p['id'] for p in parameters]))  # bulk UPDATE by primary key
+    elif statement.whereclause is not None:
+        query = query.where(statement.whereclause)
+    pending = {}
+    for row in orm_execute_state.session.connection().execute(query).mappings():
+        _collect(pending, table.name, row, op)
+    _log(orm_execute_state.session, pending)
+
+@on_commit
+def _wake_readers(tables):
+    if not tables.isdisjoint(LOGGED):
+        change_feed.notify()
+
+
+# ========== API ==========
+
+def first_unsettled(since):
+    """The lowest id after ``since`` that is too recent to hand out, as a
+    scalar subquery (NULL when every entry has settled)."""
+    cutoff = datetime.utcnow() - timedelta(seconds=change_feed.settle)
+    return select(func.min(Change.id)).where(Change.id > since, Change.created_at > cutoff).scalar_subquery()
+
+def read_changes(since, limit, tables):
+    statement = select(Change).where(Change.id > since)
+    if change_feed.settle:
+        held = first_unsettled(since)
+        statement = statement.where(or_(held.is_(None), Change.id < held))
+    if tables:
+        statement = statement.where(Change.table_name.in_(tables))
+    changes = db.session.scalars(statement.order_by(Change.id).limit(limit + 1)).all()
+    return changes[:limit], len(changes) > limit
+
+def current_rows(changes):
+    """Serialized current state of every created/updated row, one query per table."""
+    ids = {}
+    for change in changes:
+        if change.op != 'delete':
+            ids.setdefault(change.table_name, set()).add(change.row_id)
+    rows = {}
+    for table, row_ids in ids.items():
+        model, serialize = FEED[table]
+        for row in model.query.filter(model.id.in_(row_ids)):
+            rows[(table, row.id)] = serialize(row)
+    return rows
+
+def feed_page(changes, cursor, has_more, data):
+    rows = current_rows(changes) if data else {}
+    entries = []
+    for change in changes:
+        entry = {'id': change.id, 'table': change.table_name, 'row_id': change.row_id, 'op': change.op, 'at': change.created_at}
+        if data and change.op != 'delete':
+            entry['data'] = rows.get((change.table_name, change.row_id))  # None if deleted by a later change
+        entries.append(entry)
+    return {'changes': entries, 'cursor': changes[-1].id if changes else cursor, 'has_more': has_more}
+
+def latest_cursor():
+    latest = func.coalesce(func.max(Change.id), 0)
+    if change_feed.settle:
+        latest = func.coalesce(first_unsettled(0) - 1, latest)
+    return db.session.scalar(select(latest))
+
+def parse_feed_args():
+    """``(since, limit, tables, data, wait)`` from the query string, or raise ValueError."""
+    since = request.headers.get('Last-Event-ID') or request.args.get('since', '0')
+    since = latest_cursor() if since == 'latest' else int(since)
+    limit = int(request.args.get('limit', 100))
+    tables = [t.strip() for t in request.args.get('tables', '').split(',') if t.strip()]
+    unknown = [t for t in tables if t not in FEED]
+    if since < 0 or limit < 1 or unknown:
+        raise ValueError(f"Unknown tables: {', '.join(unknown)}" if unknown else 'since and limit must be positive')
+    wait = min(max(float(request.args.get('wait', 0)), 0), change_feed.wait_max)
+    return since, min(limit, change_feed.limit_max), tables, request.args.get('data', '1') != '0', wait
+
+def cursor_expired(since):
+    """Whether entries after ``since`` may have been pruned: the cursor is
+    older than the oldest retained entry, or the log is empty although the
+    cursor says the client has seen some."""
+    if not since:
+        return False
+    oldest = db.session.scalar(select(func.min(Change.id)))
+    return oldest is None or since < oldest - 1
+
+def stream_changes(since, limit, tables, data):
+    """Server-Sent Events: one ``changes`` event per batch, ``id`` = cursor."""
+    deadline = time.monotonic() + change_feed.stream_max
+    beat = time.monotonic()
+    yield f'retry: {int(change_feed.poll_interval * 1000)}\n\n'
+    while time.monotonic() < deadline:
+        changes, has_more = read_changes(since, limit, tables)
+        if changes:
+            page = feed_page(changes, since, has_more, data)
+            since = page['cursor']
+            beat = time.monotonic()
+            yield f"id: {since}\nevent: changes\ndata: {current_app.json.dumps(page)}\n\n"
+        elif time.monotonic() - beat >= change_feed.heartbeat:
+            beat = time.monotonic()
+            yield ': keepalive\n\n'
+        # End the read transaction so the next query sees new commits
+        db.session.close()
+        if not has_more:
+            change_feed.wait(change_feed.poll_interval)
+
+
+@changes_bp.route('/changes', methods=['GET'])
+@admin_required
+def get_changes():
+    try:
+        since, limit, tables, data, wait = parse_feed_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if cursor_expired(since):
+        return jsonify({'error': 'Cursor is older than the retained change log; reload the collections', 'cursor': since}), 410
+
+    if 'text/event-stream' in request.headers.get('Accept', ''):
+        return Response(stream_with_context(stream_changes(since, limit, tables, data)), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+    deadline = time.monotonic() + wait
+    changes, has_more = read_changes(since, limit, tables)
+    while not changes and time.monotonic() < deadline:
+        db.session.close()
+        change_feed.wait(min(change_feed.poll_interval, deadline - time.monotonic()))
+        changes, has_more = read_changes(since, limit, tables)
+    return jsonify(feed_page(changes, since, has_more, data)), 200
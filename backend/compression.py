@@ -0,0 +1,134 @@
+import gzip
+import threading
+from flask import g, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Default levels are the maximum: used for files and cache entries that are
+# compressed once and served many times
+ENCODERS = {'gzip': lambda data, level=9: gzip.compress(data, compresslevel=level, mtime=0)}
+if brotli is not None:
+    ENCODERS['br'] = lambda data, level=11: brotli.compress(data, quality=level)
+
+# Preference order when the client accepts several encodings
+PREFERRED = ('br', 'gzip')
+
+FILE_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+COMPRESSIBLE_EXTENSIONS = {'svg', 'json', 'txt', 'css', 'js', 'html', 'xml'}
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/javascript', 'application/xml', 'image/svg+xml'}
+
+
+def accepted_encodings(request):
+    """Encodings from ``PREFERRED`` that the request's Accept-Encoding allows."""
+    return [enc for enc in PREFERRED if enc in ENCODERS and request.accept_encodings[enc]]
+
+def is_compressible_mimetype(mimetype):
+    return bool(mimetype) and (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES)
+
+def encoded_etag(etag, encoding):
+    """The strong ETag of the ``encoding`` representation of a response."""
+    return f'{etag}-{encoding}'
+
+
+class ResponseCompressor:
+    """gzip/brotli negotiation for dynamic responses.
+
+    Runs after every request and compresses 200 responses with a
+    compressible mimetype once they reach ``COMPRESSION_MIN_SIZE`` bytes.
+    Responses served from the response cache are compressed once at the
+    maximum level and the result is kept on the cache entry, so hits cost
+    no compression CPU; other responses use the cheaper
+    ``COMPRESSION_LEVEL_GZIP`` / ``COMPRESSION_LEVEL_BR``. File responses
+    (uploads) are left alone, they have precompressed siblings.
+
+    Each encoding gets its own strong ETag (``"<etag>-gzip"``), which
+    ``conditional_get`` accepts in ``If-None-Match``.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.min_size = 1024
+        self.levels = {'gzip': 6, 'br': 4}
+        self.compressed = 0
+        self.reused = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('COMPRESSION_ENABLED', True)
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+        self.levels = {'gzip': app.config.get('COMPRESSION_LEVEL_GZIP', 6), 'br': app.config.get('COMPRESSION_LEVEL_BR', 4)}
+        app.extensions['compression'] = self
+        app.after_request(self.compress_response)
+
+    def _encode(self, body, encoding, entry):
+        if entry is None:
+            with self._lock:
+                self.compressed += 1
+            return ENCODERS[encoding](body, self.levels[encoding])
+        data = entry.encoded.get(encoding)
+        if data is None:
+            data = ENCODERS[encoding](body)
+            if entry.snapshot:
+                store, path = entry.snapshot
+                data = store.save_encoded(path, encoding, data)
+            entry.encoded[encoding] = data
+            with self._lock:
+                self.compressed += 1
+        else:
+            with self._lock:
+                self.reused += 1
+        return data
+
+    def compress_response(self, response):
+        if (not self.enabled or response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers or 'Content-Range' in response.headers
+                or not is_compressible_mimetype(response.mimetype)):
+            return response
+        # Cached bodies are read from the entry, so snapshot-backed ones are not copied
+        entry = g.get('response_cache_entry')
+        if entry is not None and response.calculate_content_length() != len(entry.body):
+            entry = None
+        body = entry.body if entry is not None else response.get_data()
+        if len(body) < self.min_size:
+            return response
+        response.vary.add('Accept-Encoding')
+        encodings = accepted_encodings(request)
+        if not encodings:
+            return response
+        data = self._encode(body, encodings[0], entry)
+        if len(data) >= len(body):
+            return response
+        with self._lock:
+            self.bytes_in += len(body)
+            self.bytes_out += len(data)
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encodings[0]
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(encoded_etag(etag, encodings[0]))
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'min_size': self.min_size,
+                'encodings': [enc for enc in PREFERRED if enc in ENCODERS],
+                'compressed': self.compressed,
+                'reused': self.reused,
+                'bytes_in': self.bytes_in,
+                'bytes_out': self.bytes_out,
+                'ratio': round(self.bytes_out / self.bytes_in, 4) if self.bytes_in else 0.0,
+            }
+
+
+response_compressor = ResponseCompressor()
@@ -0,0 +1,84 @@
+import hashlib
+import time
+from datetime import timezone
+from functools import wraps
+from flask import current_app, g, request
+from sqlalchemy import func, select
+from cache import response_cache
+from compression import ENCODERS, encoded_etag
+from models import db
+
+def table_stamp(models):
+    """Return ``(digest, last_modified)`` for the given models.
+
+    Uses a single aggregate query over ``max(updated_at)`` and ``count(*)``
+    per table, so no rows are loaded or serialized.
+    """
+    tables = tuple(m.__tablename__ for m in models)
+    versions = response_cache.versions(tables)
+    # Per app: tables -> (table versions, computed_at, stamp); recomputed
+    # whenever one of the tables is written (or the response cache TTL elapses)
+    stamps = current_app.extensions.setdefault('etag_stamps', {})
+    memo = stamps.get(tables)
+    if memo and response_cache.enabled and memo[0] == versions and not (response_cache.ttl and time.monotonic() - memo[1] > response_cache.ttl):
+        return memo[2]
+
+    if response_cache.enabled:
+        g.db_primary = True  # the stamp is memoized, so it must not come from a lagging replica
+    columns = []
+    for m in models:
+        columns.append(select(func.max(m.updated_at)).scalar_subquery())
+        columns.append(select(func.count()).select_from(m).scalar_subquery())
+    row = db.session.execute(select(*columns)).one()
+
+    parts, last_modified = [], None
+    for table, latest, count in zip(tables, row[0::2], row[1::2]):
+        parts.append(f"{table}:{latest.isoformat() if latest else ''}:{count}")
+        if latest and (last_modified is None or latest > last_modified):
+            last_modified = latest
+    if last_modified is not None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    stamp = (hashlib.sha1('|'.join(parts).encode()).hexdigest(), last_modified)
+    stamps[tables] = (versions, time.monotonic(), stamp)
+    return stamp
+
+
+def conditional_get(*models):
+    """Answer ``If-None-Match``/``If-Modified-Since`` with 304 for a GET view.
+
+    The strong ETag is derived from the tables' stamp plus the request's
+    path and query string. Last-Modified only moves forward with
+    ``updated_at``, so deletions are reflected in the ETag (via the row
+    count) but not in Last-Modified; clients that send both validators get
+    the ETag comparison, as RFC 9110 requires. If-None-Match uses the weak
+    comparison, so ETags weakened by a proxy (e.g. nginx gzip) still match,
+    as do the per-encoding ETags set by the response compressor.
+    """
+    def wrapper(f):
+        @wraps(f)
+        def decorator(*args, **kwargs):
+            digest, last_modified = table_stamp(models)
+            etag = hashlib.sha1(f"{digest}|{request.full_path}".encode()).hexdigest()[:32]
+
+            not_modified = False
+            if request.if_none_match:
+                for candidate in (etag, *(encoded_etag(etag, enc) for enc in ENCODERS)):
+                    if request.if_none_match.contains_weak(candidate):
+                        not_modified, etag = True, candidate
+                        break
+            elif request.if_modified_since and last_modified:
+                not_modified = last_modified <= request.if_modified_since
+
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = current_app.config['PUBLIC_CACHE_CONTROL']
+            return response
+        return decorator
+    return wrapper
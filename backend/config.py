@@ -3,9 +3,13 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Development fallbacks; ProductionConfig refuses to start with them (see create_app)
+DEFAULT_SECRET_KEY = 'dev-secret-key-change-in-production'
+DEFAULT_ADMIN_PASSWORD = 'admin123'
+
 class Config:
     """Base configuration"""
-    SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
+    SECRET_KEY = os.environ.get('SECRET_KEY') or DEFAULT_SECRET_KEY
     DEBUG = os.environ.get('DEBUG', 'True') == 'True'
     HOST = os.environ.get('HOST', '0.0.0.0')
     PORT = int(os.environ.get('PORT', 5001))
@@ -13,23 +17,128 @@ class Config:
     # Database
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///portfolio.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Engine profile (database.py); SQLite pragmas are set on every connection
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # ms
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -65536))  # negative = KiB, i.e. 64 MiB
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'True') == 'True'
+    # Read replicas (comma-separated URLs) serving public GET reads; writes and admin routes use the primary
+    DATABASE_REPLICA_URLS = [u.strip() for u in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if u.strip()]
+    DATABASE_REPLICA_STICKY = float(os.environ.get('DATABASE_REPLICA_STICKY', 2.0))  # seconds after a local commit to read from the primary
+    DATABASE_REPLICA_RETRY = int(os.environ.get('DATABASE_REPLICA_RETRY', 30))  # seconds a failing replica is skipped
+    # Startup schema handling: create (db.create_all), verify (check Alembic head, no DDL) or skip
+    SCHEMA_MODE = os.environ.get('SCHEMA_MODE', 'create')
     
     # Admin
-    ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD') or 'admin123'  # CHANGE THIS!
+    ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD') or DEFAULT_ADMIN_PASSWORD  # CHANGE THIS!
+    REQUIRE_SECRETS = False  # refuse to start without a real SECRET_KEY and ADMIN_PASSWORD
     
     # File Upload
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp', 'pdf', 'svg'}
+    
+    UPLOAD_CACHE_MAX_AGE = int(os.environ.get('UPLOAD_CACHE_MAX_AGE', 3600))  # seconds; content-addressed files are immutable
+    
+    # Static export of the public API (flask export-static)
+    STATIC_EXPORT_DIR = os.environ.get('STATIC_EXPORT_DIR') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static_export')
+    STATIC_EXPORT_ON_COMMIT = os.environ.get('STATIC_EXPORT_ON_COMMIT', 'False') == 'True'
+    STATIC_EXPORT_COPY_UPLOADS = os.environ.get('STATIC_EXPORT_COPY_UPLOADS', 'False') == 'True'
+    
+    # Background jobs (upload processing)
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', min(4, os.cpu_count() or 1)))
+    JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', 64))  # max queued + running jobs
+    JOB_HISTORY = int(os.environ.get('JOB_HISTORY', 256))  # finished jobs kept for status lookups
+    JOB_ASYNC = os.environ.get('JOB_ASYNC', 'True') == 'True'
+    JOB_STATE_DIR = os.environ.get('JOB_STATE_DIR')  # shared by all workers; default job_state/ next to UPLOAD_FOLDER
+    JOB_STATE_TTL = int(os.environ.get('JOB_STATE_TTL', 86400))  # seconds a job's status stays available
+    JOB_LEASE = int(os.environ.get('JOB_LEASE', 600))  # seconds without a state write before a running job counts as interrupted
+    
+    # Resized image variants generated for raster uploads
+    IMAGE_VARIANT_WIDTHS = [int(w) for w in os.environ.get('IMAGE_VARIANT_WIDTHS', '160,480,1080').split(',')]
+    IMAGE_VARIANT_FORMATS = os.environ.get('IMAGE_VARIANT_FORMATS', 'avif,webp').split(',')  # plus a PNG/JPEG fallback
+    IMAGE_VARIANT_QUALITY = int(os.environ.get('IMAGE_VARIANT_QUALITY', 80))
+    # Skill icon SVG sprite and certification badge atlas (sprites.py), rebuilt on the job queue after changes
+    SPRITES_ENABLED = os.environ.get('SPRITES_ENABLED', 'True') == 'True'
+    SPRITE_BADGE_SIZE = int(os.environ.get('SPRITE_BADGE_SIZE', 200))  # px; atlas cell edge
+    
+    # List pagination (?limit=&cursor=); 0 returns whole collections by default
+    PAGE_SIZE_DEFAULT = int(os.environ.get('PAGE_SIZE_DEFAULT', 0))
+    PAGE_SIZE_MAX = int(os.environ.get('PAGE_SIZE_MAX', 500))
+    
+    # Response cache (public GET routes, invalidated on admin commits)
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 512))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 0))  # seconds, 0 = until invalidated
+    PUBLIC_CACHE_CONTROL = os.environ.get('PUBLIC_CACHE_CONTROL', 'public, no-cache')  # revalidate via ETag
+    # Shared, memory-mapped response snapshots and table generations (snapshots.py); default dir is next to UPLOAD_FOLDER
+    # Disabling it with several gunicorn workers requires RESPONSE_CACHE_TTL > 0 (checked in gunicorn.conf.py)
+    SNAPSHOT_ENABLED = os.environ.get('SNAPSHOT_ENABLED', 'True') == 'True'
+    SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR')
+    SNAPSHOT_MAX_FILES = int(os.environ.get('SNAPSHOT_MAX_FILES', 4096))
+
+    # gzip/brotli for API responses; cached responses are compressed once at the maximum level
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'True') == 'True'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # bytes; smaller bodies are sent as is
+    COMPRESSION_LEVEL_GZIP = int(os.environ.get('COMPRESSION_LEVEL_GZIP', 6))  # uncached responses
+    COMPRESSION_LEVEL_BR = int(os.environ.get('COMPRESSION_LEVEL_BR', 4))
+
+    # /api/search: auto (SQLite FTS5 index when present, else in-memory), fts5 or memory
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto')
+    SEARCH_LIMIT_MAX = int(os.environ.get('SEARCH_LIMIT_MAX', 50))
+
+    # Request metrics on /metrics (Prometheus text) and in Server-Timing headers
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True') == 'True'
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', 'True') == 'True'
+    METRICS_QUERY_WARN = int(os.environ.get('METRICS_QUERY_WARN', 20))  # log requests issuing more SQL statements than this
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # bearer token for scrapers; admin tokens are always accepted
+
+    # JSON encoder for responses: auto (orjson when installed), orjson or stdlib
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+
+    # Admin change feed (/api/changes); long-poll and stream requests hold a worker thread
+    CHANGES_RETENTION_DAYS = int(os.environ.get('CHANGES_RETENTION_DAYS', 30))  # 0 = keep forever
+    CHANGES_POLL_INTERVAL = float(os.environ.get('CHANGES_POLL_INTERVAL', 1.0))  # seconds; how soon other workers' commits are seen
+    CHANGES_WAIT_MAX = int(os.environ.get('CHANGES_WAIT_MAX', 25))  # max ?wait= seconds, below WSGI_TIMEOUT
+    CHANGES_STREAM_MAX = int(os.environ.get('CHANGES_STREAM_MAX', 300))  # seconds before an event stream is closed for the client to reconnect
+    CHANGES_HEARTBEAT = int(os.environ.get('CHANGES_HEARTBEAT', 15))
+    CHANGES_LIMIT_MAX = int(os.environ.get('CHANGES_LIMIT_MAX', 1000))
+    # Seconds new entries are held back so out-of-order commits are not skipped; unset = 0 on SQLite, 5 elsewhere
+    CHANGES_SETTLE_SECONDS = float(os.environ['CHANGES_SETTLE_SECONDS']) if 'CHANGES_SETTLE_SECONDS' in os.environ else None
+
+    # Admin token verification cache (auth.py)
+    TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 1024))
+    TOKEN_CACHE_TTL = int(os.environ.get('TOKEN_CACHE_TTL', 300))  # seconds before a token is re-verified, 0 = until exp
+    TOKEN_REVOCATION_REFRESH = int(os.environ.get('TOKEN_REVOCATION_REFRESH', 5))  # seconds between revocation list reloads
+
+    # Production WSGI server (gunicorn.conf.py); 0 workers = 2 x CPU cores + 1
+    WSGI_WORKERS = int(os.environ.get('WSGI_WORKERS', 0)) or (os.cpu_count() or 1) * 2 + 1
+    WSGI_THREADS = int(os.environ.get('WSGI_THREADS', 1))
+    WSGI_KEEPALIVE = int(os.environ.get('WSGI_KEEPALIVE', 5))  # seconds to hold idle keep-alive connections
+    WSGI_TIMEOUT = int(os.environ.get('WSGI_TIMEOUT', 30))
+    WSGI_GRACEFUL_TIMEOUT = int(os.environ.get('WSGI_GRACEFUL_TIMEOUT', 30))
+    WSGI_MAX_REQUESTS = int(os.environ.get('WSGI_MAX_REQUESTS', 10000))  # recycle workers to bound memory growth
+    WSGI_ACCESS_LOG = os.environ.get('WSGI_ACCESS_LOG', 'False') == 'True'
+    WSGI_PRELOAD = os.environ.get('WSGI_PRELOAD', 'True') == 'True'  # faster forks and shared memory, but SIGHUP keeps the old code
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
 
 class ProductionConfig(Config):
-    """Production configuration"""
+    """Production configuration, served by gunicorn through wsgi.py"""
     DEBUG = False
+    WSGI_THREADS = int(os.environ.get('WSGI_THREADS', 2))
+    SCHEMA_MODE = os.environ.get('SCHEMA_MODE', 'verify')  # migrations run once via `flask deploy`
+    SECRET_KEY = os.environ.get('SECRET_KEY')
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD')  # Must be set in production!
+    REQUIRE_SECRETS = True
 
 config = {
     'development': DevelopmentConfig,
@@ -0,0 +1,211 @@
+import itertools
+import threading
+import time
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql.elements import TextClause
+
+
+def is_sqlite(uri):
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database.
+
+    Server databases get a sized, pre-pinged, recycled connection pool.
+    SQLite is tuned per connection instead (see :func:`configure_engine`),
+    apart from the driver-level busy timeout.
+    """
+    if is_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        return {'connect_args': {'timeout': config['SQLITE_BUSY_TIMEOUT'] / 1000}}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+def sqlite_pragmas(config):
+    return {
+        'journal_mode': config['SQLITE_JOURNAL_MODE'],
+        'synchronous': config['SQLITE_SYNCHRONOUS'],
+        'busy_timeout': config['SQLITE_BUSY_TIMEOUT'],
+        'cache_size': config['SQLITE_CACHE_SIZE'],
+        'mmap_size': config['SQLITE_MMAP_SIZE'],
+        'temp_store': 'MEMORY',
+    }
+
+def configure_engine(engine, config, read_only=False):
+    """Apply the SQLite pragmas to every new connection of ``engine``.
+
+    WAL lets readers proceed while an admin write is in progress;
+    ``synchronous=NORMAL`` is durable across application crashes in WAL
+    mode and avoids an fsync per commit. Replica connections are opened
+    with ``query_only`` so a misrouted write fails instead of diverging.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(config)
+    if read_only:
+        pragmas['query_only'] = 1
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+
+# ========== READ REPLICAS ==========
+
+REPLICA_PREFIX = 'replica_'
+
+def replica_binds(config):
+    """SQLALCHEMY_BINDS entries (``replica_0``, ...) for DATABASE_REPLICA_URLS."""
+    return {f'{REPLICA_PREFIX}{i}': {'url': url, **engine_options({**config, 'SQLALCHEMY_DATABASE_URI': url})}
+            for i, url in enumerate(config.get('DATABASE_REPLICA_URLS') or [])}
+
+def _is_read(clause):
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip()[:6].upper() in ('SELECT', 'WITH')
+    return bool(getattr(clause, 'is_select', False))
+
+
+class ReplicaRouter:
+    """Sends public reads to read replicas and everything else to the primary.
+
+    A statement goes to a replica only when it is a SELECT issued while
+    serving a GET/HEAD request that is not an admin route, outside a flush,
+    in a session that has not written yet, and no commit happened within
+    ``DATABASE_REPLICA_STICKY`` seconds, in this process or, when the
+    snapshot store shares its commit clock, in any worker (so responses
+    built and cached right after a write see it despite replication lag).
+    Responses and ETag stamps that are about to be cached are always built
+    from the primary (cache.py, conditional.py): a replica lagging beyond
+    the sticky window would otherwise be served until the next write. Healthy
+    replicas are taken round-robin. A replica is probed before its first use
+    and skipped for ``DATABASE_REPLICA_RETRY`` seconds when the probe or a
+    later connection fails; with none left, reads fall back to the primary.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._next = itertools.count()
+        self.names = []
+        self.sticky = 2.0
+        self.retry = 30
+        self.last_commit = float('-inf')
+        self.commit_clock = None  # unix time of the last commit in any worker (snapshots.py)
+        self.down_until = {}
+        self.verified = set()
+        self.replica_reads = 0
+        self.fallback_reads = 0
+        self.failures = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.names = sorted(k for k in app.config.get('SQLALCHEMY_BINDS') or {} if k.startswith(REPLICA_PREFIX))
+        self.sticky = app.config.get('DATABASE_REPLICA_STICKY', 2.0)
+        self.retry = app.config.get('DATABASE_REPLICA_RETRY', 30)
+        self.down_until = {}
+        self.verified = set()
+        app.extensions['replica_router'] = self
+
+    def watch(self, name, engine):
+        """Mark replica ``name`` down when ``engine`` cannot connect."""
+        @event.listens_for(engine, 'handle_error')
+        def on_error(context):
+            if context.is_disconnect or context.connection is None:
+                self.mark_down(name)
+
+    def use_replica(self, session, clause):
+        if not self.names or not has_request_context() or request.method not in ('GET', 'HEAD'):
+            return False
+        if g.get('db_primary') or session.info.get('db_primary') or session._flushing:
+            return False
+        if not _is_read(clause) or time.monotonic() - self.last_commit <= self.sticky:
+            return False
+        return self.commit_clock is None or time.time() - self.commit_clock() > self.sticky
+
+    def mark_down(self, name):
+        with self._lock:
+            if self.down_until.get(name, 0) > time.monotonic():
+                return
+            self.down_until[name] = time.monotonic() + self.retry
+            self.verified.discard(name)
+            self.failures += 1
+
+    def available(self, name, engine):
+        """Whether ``name`` is up; a replica not used since it (re)joined is
+        probed first, so a dead one is skipped without failing a request."""
+        if self.down_until.get(name, 0) > time.monotonic():
+            return False
+        if name not in self.verified:
+            try:
+                with engine.connect() as connection:
+                    connection.exec_driver_sql('SELECT 1')
+            except SQLAlchemyError:
+                self.mark_down(name)
+                return False
+            self.verified.add(name)
+        return True
+
+    def pick(self, session, engines):
+        """The session's replica engine, chosen on its first read so every
+        statement of a request sees the same replica; None for the primary."""
+        name = session.info.get('db_replica')
+        if name is None or not self.available(name, engines[name]):
+            start = next(self._next)
+            candidates = (self.names[(start + i) % len(self.names)] for i in range(len(self.names)))
+            name = session.info['db_replica'] = next((n for n in candidates if self.available(n, engines[n])), None)
+        if name is None:
+            self.fallback_reads += 1
+            return None
+        self.replica_reads += 1
+        return engines[name]
+
+    def stats(self):
+        now = time.monotonic()
+        return {
+            'replicas': len(self.names),
+            'healthy_replicas': sum(1 for n in self.names if self.down_until.get(n, 0) <= now),
+            'replica_reads': self.replica_reads,
+            'fallback_reads': self.fallback_reads,
+            'failures': self.failures,
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """``db.session`` class choosing the primary or a replica per statement."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and replica_router.use_replica(self, clause):
+            engine = replica_router.pick(self, self._db.engines)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# Read-after-write: once a session writes, its later reads stay on the primary
+@event.listens_for(RoutingSession, 'after_flush')
+def _stick_after_flush(session, flush_context):
+    session.info['db_primary'] = True
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _stick_after_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['db_primary'] = True
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _note_commit(session):
+    if session.info.get('db_primary'):
+        replica_router.last_commit = time.monotonic()
@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import click
+from flask import current_app, has_app_context
+from flask.cli import with_appcontext
+from cache import on_commit
+from jobs import job_queue, QueueFull
+from models import WorkExperience
+from routes import PUBLIC_MODELS
+
+# Every public, argument-free GET route; experience detail pages are added per row
+PUBLIC_PATHS = [
+    '/api/portfolio',
+    '/api/social-links',
+    '/api/about',
+    '/api/skills',
+    '/api/services',
+    '/api/certifications',
+    '/api/experience',
+    '/api/projects',
+    '/api/projects/facets',
+    '/api/kpis',
+    '/api/contact',
+]
+
+PUBLIC_TABLES = {m.__tablename__ for m in PUBLIC_MODELS}
+
+
+def export_paths():
+    return PUBLIC_PATHS + [f'/api/experience/{id}' for (id,) in WorkExperience.query.with_entities(WorkExperience.id)]
+
+def uploads_manifest(folder):
+    files = []
+    for entry in sorted(os.scandir(folder), key=lambda e: e.name):
+        if entry.is_file() and not entry.name.startswith('.'):
+            stat = entry.stat()
+            files.append({'url': f'/uploads/{entry.name}', 'size': stat.st_size, 'modified': int(stat.st_mtime)})
+    return {'files': files}
+
+
+def export_site(app, out_dir, copy_uploads=False):
+    """Render every public GET response into ``out_dir``.
+
+    Each path is written as ``<out_dir><path>/index.json`` (so ``/api/experience``
+    and ``/api/experience/3`` can coexist), next to a ``manifest.json`` of
+    path -> ETag and an ``uploads/manifest.json`` of uploaded files. The site
+    is built in a sibling directory and swapped in at the end, so a static
+    server never sees a half-written export.
+
+    Returns the number of responses written.
+    """
+    out_dir = os.path.abspath(out_dir)
+    staging, previous = out_dir + '.new', out_dir + '.old'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    client = app.test_client()
+    manifest = {}
+    with app.app_context():
+        paths = export_paths()
+    for path in paths:
+        response = client.get(path)
+        if response.status_code != 200:
+            continue
+        target = os.path.join(staging, path.lstrip('/'), 'index.json')
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(response.get_data())
+        manifest[path] = response.headers.get('ETag')
+
+    upload_folder = app.config['UPLOAD_FOLDER']
+    uploads_dir = os.path.join(staging, 'uploads')
+    if copy_uploads:
+        shutil.copytree(upload_folder, uploads_dir, ignore=shutil.ignore_patterns('.*'))
+    else:
+        os.makedirs(uploads_dir)
+    with open(os.path.join(uploads_dir, 'manifest.json'), 'w') as f:
+        json.dump(uploads_manifest(upload_folder), f)
+    with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.replace(out_dir, previous)
+    os.replace(staging, out_dir)
+    shutil.rmtree(previous, ignore_errors=True)
+    return len(manifest)
+
+
+@on_commit
+def _schedule_export(tables):
+    """Re-export after admin commits when ``STATIC_EXPORT_ON_COMMIT`` is set.
+
+    Runs on the job queue; a burst of commits collapses into one export
+    while a previous one is still waiting to start.
+    """
+    if not tables & PUBLIC_TABLES or not has_app_context() or not current_app.config.get('STATIC_EXPORT_ON_COMMIT'):
+        return
+    app = current_app._get_current_object()
+    state = app.extensions.setdefault('static_export', {'job': None})
+    job = state['job']
+    if job is not None and job.status == 'queued':
+        return
+    try:
+        state['job'] = job_queue.submit('static-export', lambda job: export_site(app, app.config['STATIC_EXPORT_DIR'], app.config['STATIC_EXPORT_COPY_UPLOADS']))
+    except QueueFull:
+        app.logger.warning('Static export skipped: job queue is full')
+
+
+@click.command('export-static')
+@click.argument('out_dir', required=False)
+@click.option('--copy-uploads', is_flag=True, default=None, help='Copy uploaded files into the export as well.')
+@with_appcontext
+def export_static_command(out_dir, copy_uploads):
+    """Pre-render the public API into OUT_DIR (default STATIC_EXPORT_DIR)."""
+    app = current_app._get_current_object()
+    out_dir = out_dir or app.config['STATIC_EXPORT_DIR']
+    if copy_uploads is None:
+        copy_uploads = app.config['STATIC_EXPORT_COPY_UPLOADS']
+    count = export_site(app, out_dir, copy_uploads)
+    click.echo(f"Exported {count} response(s) to {out_dir}")
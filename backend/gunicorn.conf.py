@@ -0,0 +1,41 @@
+# Gunicorn settings for wsgi:app, read from the selected Config class.
+# Graceful stop: SIGTERM. With WSGI_PRELOAD (default) SIGHUP only re-forks
+# workers from the code the master already imported; deploy new code with
+# SIGUSR2 (starts a new master) followed by SIGTERM to the old one, or a
+# full restart. With WSGI_PRELOAD=False, SIGHUP reloads the code.
+import os
+from config import config as _configs
+
+_settings = _configs[os.environ.get('FLASK_CONFIG', 'production')]
+
+bind = f"{_settings.HOST}:{_settings.PORT}"
+workers = _settings.WSGI_WORKERS
+threads = _settings.WSGI_THREADS
+worker_class = 'gthread' if threads > 1 else 'sync'
+keepalive = _settings.WSGI_KEEPALIVE
+timeout = _settings.WSGI_TIMEOUT
+graceful_timeout = _settings.WSGI_GRACEFUL_TIMEOUT
+max_requests = _settings.WSGI_MAX_REQUESTS
+max_requests_jitter = max_requests // 10
+
+# Without the shared snapshot generations a write only invalidates the
+# cache of the worker that made it; the others would serve stale responses
+# (and ETags) forever unless entries expire.
+if workers > 1 and _settings.RESPONSE_CACHE_ENABLED and not _settings.SNAPSHOT_ENABLED and not _settings.RESPONSE_CACHE_TTL:
+    raise RuntimeError('SNAPSHOT_ENABLED=False with several workers needs RESPONSE_CACHE_TTL > 0 or RESPONSE_CACHE_ENABLED=False')
+
+# Build the app once in the master so workers fork with it already imported
+preload_app = _settings.WSGI_PRELOAD
+
+accesslog = '-' if _settings.WSGI_ACCESS_LOG else None
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # Connections opened while preloading belong to the master; each worker
+    # must start with an empty pool instead of sharing those sockets.
+    from models import db
+    from wsgi import app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,101 @@
+import os
+import tempfile
+from PIL import Image, ImageOps
+
+try:  # AVIF encoding needs the optional pillow-avif-plugin on Pillow < 11
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+RASTER_EXTENSIONS = {'png', 'jpg', 'jpeg', 'webp', 'gif'}
+
+PIL_FORMATS = {'webp': 'WEBP', 'avif': 'AVIF', 'jpeg': 'JPEG', 'png': 'PNG'}
+
+SAVE_OPTIONS = {
+    'webp': lambda q: {'format': 'WEBP', 'quality': q, 'method': 4},
+    'avif': lambda q: {'format': 'AVIF', 'quality': q},
+    'jpeg': lambda q: {'format': 'JPEG', 'quality': q, 'optimize': True, 'progressive': True},
+    'png': lambda q: {'format': 'PNG', 'optimize': True},
+}
+
+
+def is_raster(filename):
+    return filename.rsplit('.', 1)[-1].lower() in RASTER_EXTENSIONS
+
+def supported_formats(formats):
+    Image.init()
+    return [f for f in formats if PIL_FORMATS[f] in Image.SAVE]
+
+
+def _has_alpha(img):
+    return img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info)
+
+def _save(img, target, options):
+    """Encode ``img`` to a temporary file next to ``target`` and rename it
+    into place, so a concurrent job or a crash mid-encode never leaves a
+    truncated file under the final name."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix='.variant-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            img.save(out, **options)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def build_variants(path, widths, formats, quality=80, url_prefix='/uploads/', progress=None):
+    """Write resized, recompressed copies of the image at ``path``.
+
+    Each target width (never upscaled past the original) is written once per
+    modern format in ``formats`` that this Pillow build can encode, plus a
+    PNG (images with transparency) or JPEG fallback. Files are written next
+    to the original as ``<stem>_<width>w.<ext>``; variants that already
+    exist are kept as they are.
+
+    Returns ``(info, variants)`` where ``info`` holds the original
+    dimensions and ``variants`` lists ``{'url', 'width', 'height', 'format'}``.
+    ``progress`` is called with a 0..1 fraction after every file written.
+    Non-raster and animated images return no variants.
+    """
+    if not is_raster(path):
+        return None, []
+    folder, filename = os.path.split(path)
+    stem = os.path.splitext(filename)[0]
+
+    with Image.open(path) as source:
+        if getattr(source, 'is_animated', False):
+            return {'width': source.width, 'height': source.height}, []
+        img = ImageOps.exif_transpose(source)
+        info = {'width': img.width, 'height': img.height}
+        fallback = 'png' if _has_alpha(img) else 'jpeg'
+        img = img.convert('RGBA' if fallback == 'png' else 'RGB')
+
+        targets = sorted({min(w, img.width) for w in widths})
+        outputs = supported_formats(formats) + [fallback]
+        total, done = len(targets) * len(outputs), 0
+        variants = []
+        for width in targets:
+            height = max(1, round(img.height * width / img.width))
+            resized = None
+            for fmt in outputs:
+                name = f"{stem}_{width}w.{'jpg' if fmt == 'jpeg' else fmt}"
+                target = os.path.join(folder, name)
+                # Content-addressed names and atomic writes mean an existing variant is complete and correct
+                if not os.path.exists(target):
+                    if resized is None:
+                        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+                    _save(resized, target, SAVE_OPTIONS[fmt](quality))
+                variants.append({'url': f"{url_prefix}{name}", 'width': width, 'height': height, 'format': fmt})
+                done += 1
+                if progress:
+                    progress(done / total)
+    return info, variants
+
+def srcset(variants):
+    """Group variants into ``{format: 'url 160w, url 480w'}`` srcset strings."""
+    sets = {}
+    for v in variants:
+        sets.setdefault(v['format'], []).append(f"{v['url']} {v['width']}w")
+    return {fmt: ', '.join(entries) for fmt, entries in sets.items()}
@@ -0,0 +1,236 @@
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+class QueueFull(Exception):
+    """Raised when the job queue already holds ``max_pending`` jobs."""
+
+
+INTERRUPTED = 'Interrupted: the worker running it exited'
+
+
+class Job:
+    """A unit of background work and its observable state."""
+
+    def __init__(self, name):
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.status = 'queued'  # queued, running, done, failed
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.on_change = None  # called with the job when its state should be published
+        self._published = 0.0
+
+    def set_progress(self, fraction):
+        self.progress = round(min(max(fraction, 0.0), 1.0), 3)
+        if self.on_change and (self.progress - self._published >= 0.05 or self.progress == 1.0):
+            self._published = self.progress
+            self.on_change(self)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls(data['name'])
+        for key, value in data.items():
+            setattr(job, key, value)
+        return job
+
+
+class JobQueue:
+    """Bounded in-process thread pool for work that must not block requests.
+
+    The pool is created lazily (and re-created after a fork), so it is safe
+    to build the app in a pre-forking server's master process.
+
+    Jobs run in the worker that submitted them, but their state is also
+    written to ``JOB_STATE_DIR`` (one JSON file per job, on every status
+    change and every 5% of progress), so a status poll answered by another
+    gunicorn worker still finds the job. Files of finished jobs are removed
+    after ``JOB_STATE_TTL`` seconds.
+
+    Each write also records the owning process and renews a lease of
+    ``JOB_LEASE`` seconds. A queued or running job whose lease ran out, or
+    whose owner on this host has exited (e.g. gunicorn recycled the worker
+    mid-job), is marked failed when the app starts and when it is looked
+    up. Failures are logged to the app logger.
+    """
+
+    def __init__(self, app=None):
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self.workers = 2
+        self.max_pending = 64
+        self.history = 256
+        self.run_async = True
+        self.state_dir = None
+        self.state_ttl = 86400
+        self.lease = 600
+        self.logger = logging.getLogger(__name__)
+        self._submitted = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.workers = app.config.get('JOB_WORKERS', 2)
+        self.max_pending = app.config.get('JOB_QUEUE_SIZE', 64)
+        self.history = app.config.get('JOB_HISTORY', 256)
+        self.run_async = app.config.get('JOB_ASYNC', True)
+        self.state_dir = app.config.get('JOB_STATE_DIR') or os.path.join(os.path.dirname(app.config['UPLOAD_FOLDER']), 'job_state')
+        self.state_ttl = app.config.get('JOB_STATE_TTL', 86400)
+        self.lease = app.config.get('JOB_LEASE', 600)
+        self.logger = app.logger
+        os.makedirs(self.state_dir, exist_ok=True)
+        app.extensions['job_queue'] = self
+        self.reclaim()
+
+    def _save(self, job):
+        if self.state_dir is None:
+            return
+        path = os.path.join(self.state_dir, f'{job.id}.json')
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        owner = {'host': socket.gethostname(), 'pid': os.getpid(), 'lease_until': time.time() + self.lease}
+        with open(tmp, 'w') as f:
+            json.dump({**job.to_dict(), 'owner': owner}, f, default=str)
+        os.replace(tmp, path)
+
+    def _load(self, job_id):
+        if self.state_dir is None or not JOB_ID_RE.match(job_id):
+            return None
+        try:
+            with open(os.path.join(self.state_dir, f'{job_id}.json')) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        owner = data.pop('owner', None)
+        job = Job.from_dict(data)
+        if job.status in ('queued', 'running') and self._abandoned(owner):
+            job.status, job.error, job.finished_at = 'failed', INTERRUPTED, time.time()
+            self._save(job)
+        return job
+
+    def _abandoned(self, owner):
+        if not owner or owner['lease_until'] < time.time():
+            return True
+        if owner['host'] != socket.gethostname() or owner['pid'] == os.getpid():
+            return False
+        try:
+            os.kill(owner['pid'], 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        return False
+
+    def reclaim(self):
+        """Mark queued/running jobs of exited workers failed; returns how many."""
+        started, count = time.time(), 0
+        for entry in os.scandir(self.state_dir):
+            job_id = entry.name[:-len('.json')]
+            if entry.name.endswith('.json') and job_id not in self._jobs:
+                job = self._load(job_id)
+                count += job is not None and job.error == INTERRUPTED and job.finished_at >= started
+        return count
+
+    def _sweep(self):
+        """Remove state files of jobs (from any worker) older than ``state_ttl``."""
+        cutoff = time.time() - self.state_ttl
+        for entry in os.scandir(self.state_dir):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def _get_executor(self):
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+            self._pid = os.getpid()
+        return self._executor
+
+    def pending(self):
+        return sum(1 for j in self._jobs.values() if j.status in ('queued', 'running'))
+
+    def submit(self, name, fn, *args, **kwargs):
+        """Run ``fn(job, *args, **kwargs)`` in the pool and return the Job.
+
+        With ``JOB_ASYNC`` disabled the job runs inline before returning.
+        """
+        job = Job(name)
+        job.on_change = self._save
+        with self._lock:
+            if self.run_async and self.pending() >= self.max_pending:
+                raise QueueFull(f'{self.max_pending} jobs already pending')
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                oldest = next(iter(self._jobs.values()))
+                if oldest.status in ('queued', 'running'):
+                    break
+                self._jobs.popitem(last=False)
+            self._submitted += 1
+            sweep = self.state_dir is not None and self._submitted % 64 == 0
+        self._save(job)
+        if sweep:
+            self._sweep()
+        if self.run_async:
+            self._get_executor().submit(self._run, job, fn, args, kwargs)
+        else:
+            self._run(job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = 'running'
+        job.started_at = time.time()
+        self._save(job)
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.progress = 1.0
+            job.status = 'done'
+        except Exception as e:
+            job.error = f'{type(e).__name__}: {e}'
+            job.status = 'failed'
+            self.logger.exception('Job %s (%s) failed', job.id, job.name)
+        finally:
+            job.finished_at = time.time()
+            self._save(job)
+
+    def get(self, job_id):
+        """The job, from this worker's memory or the shared state files."""
+        return self._jobs.get(job_id) or self._load(job_id)
+
+    def stats(self):
+        statuses = {}
+        for job in list(self._jobs.values()):
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {'workers': self.workers, 'max_pending': self.max_pending, 'async': self.run_async, 'jobs': statuses}
+
+
+job_queue = JobQueue()
@@ -0,0 +1,185 @@
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from auth import admin_required, bearer_token
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    """Cumulative Prometheus histogram for one label set."""
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        running = 0
+        for bound, count in zip((*self.buckets, '+Inf'), self.counts):
+            running += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {running}'
+        yield f'{name}_sum{{{labels}}} {self.sum:.6f}'
+        yield f'{name}_count{{{labels}}} {self.count}'
+
+
+def _labels(**labels):
+    return ','.join(f'{k}="{v}"' for k, v in labels.items())
+
+
+class Metrics:
+    """Per-request timing, database and cache instrumentation.
+
+    Records, per endpoint, a latency histogram, the number of SQL queries
+    and the time spent in them (from engine events), the response size and
+    the response cache outcome. Everything is served in the Prometheus text
+    format on ``/metrics`` and summarized per response in a
+    ``Server-Timing`` header. Requests issuing more than
+    ``METRICS_QUERY_WARN`` queries are logged, so N+1 patterns surface
+    without waiting for a scrape.
+
+    Metrics are kept per process; with several gunicorn workers each scrape
+    sees the worker that answered it. ``/metrics`` needs either an admin
+    token or, for scrapers, ``METRICS_TOKEN`` as a bearer token.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.enabled = True
+        self.server_timing = True
+        self.query_warn = 20
+        self.token = None
+        self.started = time.time()
+        self.requests = {}
+        self.latency = {}
+        self.queries = {}
+        self.query_time = {}
+        self.sizes = {}
+        self.cache = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        self.server_timing = app.config.get('SERVER_TIMING', True)
+        self.query_warn = app.config.get('METRICS_QUERY_WARN', 20)
+        self.token = app.config.get('METRICS_TOKEN') or None
+        app.extensions['metrics'] = self
+        if not self.enabled:
+            return
+        app.before_request(self.start_request)
+        app.after_request(self.finish_request)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+
+    def instrument_engine(self, engine):
+        """Count and time every statement ``engine`` runs inside a request."""
+        if not self.enabled:
+            return
+
+        # The start time lives on the statement's execution context, which is
+        # discarded along with it when the statement raises
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            if context is not None:
+                context.metrics_started = time.perf_counter()
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_execute(conn, cursor, statement, parameters, context, executemany):
+            started = getattr(context, 'metrics_started', None)
+            if started is None:
+                return
+            elapsed = time.perf_counter() - started
+            if has_app_context() and 'metrics_started' in g:
+                g.metrics_queries += 1
+                g.metrics_query_time += elapsed
+
+    def start_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_query_time = 0.0
+
+    def finish_request(self, response):
+        if 'metrics_started' not in g:
+            return response
+        duration = time.perf_counter() - g.metrics_started
+        endpoint = request.endpoint or 'unmatched'
+        key = (endpoint, request.method)
+        size = response.calculate_content_length() or 0
+        cache_status = g.get('response_cache')
+        queries, query_time = g.metrics_queries, g.metrics_query_time
+
+        with self._lock:
+            status = (*key, str(response.status_code))
+            self.requests[status] = self.requests.get(status, 0) + 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.queries.setdefault(key, Histogram(QUERY_BUCKETS)).observe(queries)
+            self.query_time[key] = self.query_time.get(key, 0.0) + query_time
+            self.sizes.setdefault(key, Histogram(SIZE_BUCKETS)).observe(size)
+            if cache_status:
+                outcome = (endpoint, cache_status)
+                self.cache[outcome] = self.cache.get(outcome, 0) + 1
+
+        if queries > self.query_warn:
+            current_app.logger.warning('%s %s issued %d queries (%.1f ms)', request.method, request.path, queries, query_time * 1000)
+        if self.server_timing:
+            timings = [f'app;dur={duration * 1000:.2f}', f'db;dur={query_time * 1000:.2f};desc="{queries} queries"']
+            if 'auth_time' in g:
+                timings.append(f'auth;dur={g.auth_time * 1000:.3f}')
+            if cache_status:
+                timings.append(f'cache;desc={cache_status}')
+            response.headers['Server-Timing'] = ', '.join(timings)
+        return response
+
+    def render(self):
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples)
+
+        with self._lock:
+            family('portfolio_http_requests_total', 'counter', 'Requests by endpoint, method and status.',
+                   [f'portfolio_http_requests_total{{{_labels(endpoint=e, method=m, status=s)}}} {n}' for (e, m, s), n in sorted(self.requests.items())])
+            family('portfolio_http_request_duration_seconds', 'histogram', 'Time from request start to response, in seconds.',
+                   [line for (e, m), h in sorted(self.latency.items()) for line in h.samples('portfolio_http_request_duration_seconds', _labels(endpoint=e, method=m))])
+            family('portfolio_db_queries_per_request', 'histogram', 'SQL statements executed per request.',
+                   [line for (e, m), h in sorted(self.queries.items()) for line in h.samples('portfolio_db_queries_per_request', _labels(endpoint=e, method=m))])
+            family('portfolio_db_query_seconds_total', 'counter', 'Time spent executing SQL, in seconds.',
+                   [f'portfolio_db_query_seconds_total{{{_labels(endpoint=e, method=m)}}} {t:.6f}' for (e, m), t in sorted(self.query_time.items())])
+            family('portfolio_http_response_size_bytes', 'histogram', 'Response body size as sent, in bytes.',
+                   [line for (e, m), h in sorted(self.sizes.items()) for line in h.samples('portfolio_http_response_size_bytes', _labels(endpoint=e, method=m))])
+            family('portfolio_response_cache_requests_total', 'counter', 'Response cache lookups by endpoint and outcome.',
+                   [f'portfolio_response_cache_requests_total{{{_labels(endpoint=e, result=r)}}} {n}' for (e, r), n in sorted(self.cache.items())])
+
+        for extension, prefix in (('response_cache', 'portfolio_response_cache'), ('token_cache', 'portfolio_token_cache'), ('compression', 'portfolio_compression'), ('replica_router', 'portfolio_db_router'), ('snapshots', 'portfolio_snapshots')):
+            stats = current_app.extensions[extension].stats() if extension in current_app.extensions else {}
+            for name, value in sorted(stats.items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    family(f'{prefix}_{name}', 'gauge', f'{extension} {name}.', [f'{prefix}_{name} {value}'])
+        family('portfolio_process_start_time_seconds', 'gauge', 'Start time of this process.', [f'portfolio_process_start_time_seconds {self.started:.0f}'])
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        token = bearer_token()
+        if self.token and token and hmac.compare_digest(token.encode(), self.token.encode()):
+            return self.metrics_response()
+        return admin_required(self.metrics_response)()
+
+    def metrics_response(self):
+        return current_app.response_class(self.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+metrics = Metrics()
@@ -0,0 +1,31 @@
+"""Index (order, id) on every ordered list table
+
+Revision ID: 114b0a0b0f49
+Revises: 497d0d196184
+Create Date: 2026-10-18 11:26:53.084117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '114b0a0b0f49'
+down_revision = '497d0d196184'
+branch_labels = None
+depends_on = None
+
+TABLES = ('social_links', 'skills', 'services', 'certifications', 'work_experience', 'projects', 'kpis')
+
+
+def upgrade():
+    # Backs ORDER BY "order", id and the (order, id) keyset cursor of the list endpoints
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(f'ix_{table}_order_id', ['order', 'id'], unique=False)
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table}_order_id')
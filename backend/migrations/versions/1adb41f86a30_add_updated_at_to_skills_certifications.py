@@ -0,0 +1,32 @@
+"""Add updated_at to skills, certifications and experience_skills
+
+Revision ID: 1adb41f86a30
+Revises: 45709ca1a055
+Create Date: 2026-10-18 09:12:41.218604
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1adb41f86a30'
+down_revision = '45709ca1a055'
+branch_labels = None
+depends_on = None
+
+TABLES = ('skills', 'certifications', 'experience_skills')
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        # Existing rows have never been edited, so they were last modified when created
+        op.execute(f'UPDATE {table} SET updated_at = created_at')
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,26 @@
+"""Index experience_skills by experience and order
+
+Revision ID: 497d0d196184
+Revises: 1adb41f86a30
+Create Date: 2026-10-18 10:04:17.530912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '497d0d196184'
+down_revision = '1adb41f86a30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('experience_skills', schema=None) as batch_op:
+        batch_op.create_index('ix_experience_skills_experience_id_order', ['experience_id', 'order'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('experience_skills', schema=None) as batch_op:
+        batch_op.drop_index('ix_experience_skills_experience_id_order')
@@ -0,0 +1,68 @@
+"""Add SQLite FTS5 search index and triggers
+
+Revision ID: 6e2b9d4f1a83
+Revises: c3f1e8a25d07
+Create Date: 2026-10-18 13:37:22.604918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e2b9d4f1a83'
+down_revision = 'c3f1e8a25d07'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of search.fts_statements() / search.rebuild_statements()
+CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(title, body, parent_id UNINDEXED, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS search_index_projects_ai AFTER INSERT ON projects BEGIN INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 1, new.name, coalesce(new.description, '') || ' ' || coalesce(new.technologies, ''), NULL); END",
+    'CREATE TRIGGER IF NOT EXISTS search_index_projects_ad AFTER DELETE ON projects BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 1; END',
+    "CREATE TRIGGER IF NOT EXISTS search_index_projects_au AFTER UPDATE ON projects BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 1; INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 1, new.name, coalesce(new.description, '') || ' ' || coalesce(new.technologies, ''), NULL); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_work_experience_ai AFTER INSERT ON work_experience BEGIN INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 2, new.role || ' at ' || new.company, coalesce(new.summary, ''), NULL); END",
+    'CREATE TRIGGER IF NOT EXISTS search_index_work_experience_ad AFTER DELETE ON work_experience BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 2; END',
+    "CREATE TRIGGER IF NOT EXISTS search_index_work_experience_au AFTER UPDATE ON work_experience BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 2; INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 2, new.role || ' at ' || new.company, coalesce(new.summary, ''), NULL); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_experience_skills_ai AFTER INSERT ON experience_skills BEGIN INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 3, new.skill_name, coalesce(new.explanation, ''), new.experience_id); END",
+    'CREATE TRIGGER IF NOT EXISTS search_index_experience_skills_ad AFTER DELETE ON experience_skills BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 3; END',
+    "CREATE TRIGGER IF NOT EXISTS search_index_experience_skills_au AFTER UPDATE ON experience_skills BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 3; INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 3, new.skill_name, coalesce(new.explanation, ''), new.experience_id); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_skills_ai AFTER INSERT ON skills BEGIN INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 4, new.name, coalesce(new.category, ''), NULL); END",
+    'CREATE TRIGGER IF NOT EXISTS search_index_skills_ad AFTER DELETE ON skills BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 4; END',
+    "CREATE TRIGGER IF NOT EXISTS search_index_skills_au AFTER UPDATE ON skills BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 4; INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 4, new.name, coalesce(new.category, ''), NULL); END",
+    "CREATE TRIGGER IF NOT EXISTS search_index_certifications_ai AFTER INSERT ON certifications BEGIN INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 5, new.name, coalesce(new.issuer, ''), NULL); END",
+    'CREATE TRIGGER IF NOT EXISTS search_index_certifications_ad AFTER DELETE ON certifications BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 5; END',
+    "CREATE TRIGGER IF NOT EXISTS search_index_certifications_au AFTER UPDATE ON certifications BEGIN DELETE FROM search_index WHERE rowid = old.id * 8 + 5; INSERT INTO search_index(rowid, title, body, parent_id) VALUES (new.id * 8 + 5, new.name, coalesce(new.issuer, ''), NULL); END",
+]
+
+REBUILD = [
+    'DELETE FROM search_index',
+    "INSERT INTO search_index(rowid, title, body, parent_id) SELECT r.id * 8 + 1, r.name, coalesce(r.description, '') || ' ' || coalesce(r.technologies, ''), NULL FROM projects AS r",
+    "INSERT INTO search_index(rowid, title, body, parent_id) SELECT r.id * 8 + 2, r.role || ' at ' || r.company, coalesce(r.summary, ''), NULL FROM work_experience AS r",
+    "INSERT INTO search_index(rowid, title, body, parent_id) SELECT r.id * 8 + 3, r.skill_name, coalesce(r.explanation, ''), r.experience_id FROM experience_skills AS r",
+    "INSERT INTO search_index(rowid, title, body, parent_id) SELECT r.id * 8 + 4, r.name, coalesce(r.category, ''), NULL FROM skills AS r",
+    "INSERT INTO search_index(rowid, title, body, parent_id) SELECT r.id * 8 + 5, r.name, coalesce(r.issuer, ''), NULL FROM certifications AS r",
+]
+
+TRIGGERS = [f'search_index_{table}_{suffix}' for table in ('projects', 'work_experience', 'experience_skills', 'skills', 'certifications') for suffix in ('ai', 'ad', 'au')]
+
+
+def fts5_available(bind):
+    return bind.dialect.name == 'sqlite' and bind.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar()
+
+
+def upgrade():
+    # Other databases (or SQLite builds without FTS5) use the in-memory index
+    bind = op.get_bind()
+    if not fts5_available(bind):
+        return
+    for statement in CREATE + REBUILD:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS search_index')
@@ -0,0 +1,92 @@
+"""Normalize project technologies into technologies / project_technologies
+
+Revision ID: 9a4c7e215b6d
+Revises: 6e2b9d4f1a83
+Create Date: 2026-10-18 14:21:09.533170
+
+"""
+import json
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4c7e215b6d'
+down_revision = '6e2b9d4f1a83'
+branch_labels = None
+depends_on = None
+
+
+def parse(value):
+    # Frozen copy of tags.parse_technologies
+    value = (value or '').strip()
+    try:
+        value = json.loads(value) if value.startswith('[') else value.split(',')
+    except ValueError:
+        value = value.strip('[]').split(',')
+    names, seen = [], set()
+    for name in value or []:
+        name = ' '.join(str(name).strip().strip('"\'').split())
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def upgrade():
+    technologies = op.create_table('technologies',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('slug', sa.String(length=100), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('skill_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('slug')
+    )
+    with op.batch_alter_table('technologies', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_technologies_skill_id'), ['skill_id'], unique=False)
+
+    project_technologies = op.create_table('project_technologies',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('technology_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.ForeignKeyConstraint(['technology_id'], ['technologies.id'], ),
+        sa.PrimaryKeyConstraint('project_id', 'technology_id')
+    )
+    with op.batch_alter_table('project_technologies', schema=None) as batch_op:
+        batch_op.create_index('ix_project_technologies_technology_id_project_id', ['technology_id', 'project_id'], unique=False)
+
+    # Backfill from the free-form column. Ids come from the database (so a
+    # Postgres sequence stays in step) and are read back by slug.
+    bind = op.get_bind()
+    now = datetime.utcnow()
+    skills = {}
+    for id, name in bind.execute(sa.text('SELECT id, name FROM skills ORDER BY id')):
+        skills.setdefault(name.lower(), id)
+    names, tagged = {}, []
+    for project_id, value in bind.execute(sa.text('SELECT id, technologies FROM projects ORDER BY id')):
+        for position, name in enumerate(parse(value)):
+            names.setdefault(name.lower(), name)
+            tagged.append((project_id, name.lower(), position))
+    if not names:
+        return
+    op.bulk_insert(technologies, [{'slug': slug, 'name': name, 'skill_id': skills.get(slug), 'created_at': now, 'updated_at': now} for slug, name in names.items()])
+    ids = dict(bind.execute(sa.select(technologies.c.slug, technologies.c.id)).all())
+    op.bulk_insert(project_technologies, [{'project_id': project_id, 'technology_id': ids[slug], 'position': position, 'created_at': now, 'updated_at': now} for project_id, slug, position in tagged])
+
+def downgrade():
+    # projects.technologies is kept up to date, so dropping the tables loses nothing
+    with op.batch_alter_table('project_technologies', schema=None) as batch_op:
+        batch_op.drop_index('ix_project_technologies_technology_id_project_id')
+
+    op.drop_table('project_technologies')
+    with op.batch_alter_table('technologies', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_technologies_skill_id'))
+
+    op.drop_table('technologies')
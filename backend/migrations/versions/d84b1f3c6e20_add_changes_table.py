@@ -0,0 +1,37 @@
+"""Add changes table
+
+Revision ID: d84b1f3c6e20
+Revises: 9a4c7e215b6d
+Create Date: 2026-10-18 15:02:47.618204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd84b1f3c6e20'
+down_revision = '9a4c7e215b6d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(length=50), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('op', sa.String(length=10), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True
+    )
+    with op.batch_alter_table('changes', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_changes_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('changes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_changes_created_at'))
+
+    op.drop_table('changes')
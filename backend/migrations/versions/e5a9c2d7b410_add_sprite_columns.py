@@ -0,0 +1,30 @@
+"""Add icon_sprite to skills and badge_sprite to certifications
+
+Revision ID: e5a9c2d7b410
+Revises: d84b1f3c6e20
+Create Date: 2026-10-18 17:41:09.352871
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9c2d7b410'
+down_revision = 'd84b1f3c6e20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('skills', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('icon_sprite', sa.String(length=255), nullable=True))
+    with op.batch_alter_table('certifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('badge_sprite', sa.String(length=255), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('certifications', schema=None) as batch_op:
+        batch_op.drop_column('badge_sprite')
+    with op.batch_alter_table('skills', schema=None) as batch_op:
+        batch_op.drop_column('icon_sprite')
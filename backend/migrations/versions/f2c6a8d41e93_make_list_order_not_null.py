@@ -0,0 +1,43 @@
+"""Make the order column of list tables NOT NULL (default 0)
+
+Revision ID: f2c6a8d41e93
+Revises: e5a9c2d7b410
+Create Date: 2026-10-18 19:12:40.218734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a8d41e93'
+down_revision = 'e5a9c2d7b410'
+branch_labels = None
+depends_on = None
+
+TABLES = ('social_links', 'skills', 'services', 'certifications', 'work_experience', 'projects', 'kpis')
+
+
+def alter_order(table, **kwargs):
+    # SQLite applies this by recreating the table, which drops its triggers
+    # (the search index ones), so they are re-created from their saved SQL
+    bind = op.get_bind()
+    triggers = []
+    if bind.dialect.name == 'sqlite':
+        triggers = [sql for (sql,) in bind.execute(sa.text("SELECT sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = :table"), {'table': table})]
+    with op.batch_alter_table(table, schema=None) as batch_op:
+        batch_op.alter_column('order', existing_type=sa.Integer(), **kwargs)
+    for sql in triggers:
+        op.execute(sql)
+
+
+def upgrade():
+    # Keyset pagination sorts on the raw (order, id) so the ix_*_order_id indexes serve it
+    for table in TABLES:
+        op.execute(sa.text(f'UPDATE {table} SET "order" = 0 WHERE "order" IS NULL'))
+        alter_order(table, nullable=False, server_default='0')
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        alter_order(table, nullable=True, server_default=None)
@@ -1,15 +1,19 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from sqlalchemy import event
+from database import RoutingSession
 
-db = SQLAlchemy()
+# Public reads may be served by a read replica (database.ReplicaRouter)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class SocialLink(db.Model):
     __tablename__ = 'social_links'
+    __table_args__ = (db.Index('ix_social_links_order_id', 'order', 'id'),)
     id = db.Column(db.Integer, primary_key=True)
     platform = db.Column(db.String(50), nullable=False)  # github, linkedin, tiktok
     url = db.Column(db.String(255), nullable=False)
     icon = db.Column(db.String(100))
-    order = db.Column(db.Integer, default=0)
+    order = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -23,80 +27,117 @@ class About(db.Model):
 
 class Skill(db.Model):
     __tablename__ = 'skills'
+    __table_args__ = (db.Index('ix_skills_order_id', 'order', 'id'),)
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     category = db.Column(db.String(50))  # frontend, backend, cloud, etc.
     icon = db.Column(db.String(255))  # path to SVG icon
-    order = db.Column(db.Integer, default=0)
+    icon_sprite = db.Column(db.String(255))  # <sprite url>#<symbol id>, set by sprites.py
+    order = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Service(db.Model):
     __tablename__ = 'services'
+    __table_args__ = (db.Index('ix_services_order_id', 'order', 'id'),)
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     icon = db.Column(db.String(100))
-    order = db.Column(db.Integer, default=0)
+    order = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Certification(db.Model):
     __tablename__ = 'certifications'
+    __table_args__ = (db.Index('ix_certifications_order_id', 'order', 'id'),)
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     issuer = db.Column(db.String(200))
     badge_image = db.Column(db.String(255))
+    badge_sprite = db.Column(db.String(255))  # <atlas url>#xywh=x,y,w,h, set by sprites.py
     cert_image = db.Column(db.String(255))
     issued_date = db.Column(db.Date)
-    order = db.Column(db.Integer, default=0)
+    order = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class WorkExperience(db.Model):
     __tablename__ = 'work_experience'
+    __table_args__ = (db.Index('ix_work_experience_order_id', 'order', 'id'),)
     id = db.Column(db.Integer, primary_key=True)
     company = db.Column(db.String(200), nullable=False)
     role = db.Column(db.String(200), nullable=False)
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date)  # NULL = current
     summary = db.Column(db.Text)
-    order = db.Column(db.Integer, default=0)
+    order = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationship
-    skills_acquired = db.relationship('ExperienceSkill', backref='experience', cascade='all, delete-orphan', lazy=True)
+    # Loaded with one extra SELECT ... IN query for any number of experiences, already ordered
+    skills_acquired = db.relationship('ExperienceSkill', backref='experience', cascade='all, delete-orphan', lazy='selectin', order_by=lambda: (ExperienceSkill.order, ExperienceSkill.id))
 
 class ExperienceSkill(db.Model):
     __tablename__ = 'experience_skills'
+    __table_args__ = (db.Index('ix_experience_skills_experience_id_order', 'experience_id', 'order'),)
     id = db.Column(db.Integer, primary_key=True)
     experience_id = db.Column(db.Integer, db.ForeignKey('work_experience.id'), nullable=False)
     skill_name = db.Column(db.String(100), nullable=False)
     explanation = db.Column(db.Text, nullable=False)  # What was done to acquire this skill
     order = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Project(db.Model):
     __tablename__ = 'projects'
+    __table_args__ = (db.Index('ix_projects_order_id', 'order', 'id'),)
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     image = db.Column(db.String(255))
     live_url = db.Column(db.String(255))
     github_url = db.Column(db.String(255))
-    technologies = db.Column(db.Text)  # JSON string or comma-separated
-    order = db.Column(db.Integer, default=0)
+    technologies = db.Column(db.Text)  # as entered (JSON list or comma-separated); normalized into tags
+    order = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Relationship
+    tags = db.relationship('ProjectTechnology', cascade='all, delete-orphan', lazy='selectin', order_by=lambda: ProjectTechnology.position)
+
+class Technology(db.Model):
+    __tablename__ = 'technologies'
+    id = db.Column(db.Integer, primary_key=True)
+    slug = db.Column(db.String(100), nullable=False, unique=True)  # lower-cased name, used by ?tech=
+    name = db.Column(db.String(100), nullable=False)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skills.id'), index=True)  # Skill of the same name, if any
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ProjectTechnology(db.Model):
+    __tablename__ = 'project_technologies'
+    # The primary key serves project -> tags; this index serves tag -> projects filtering and facet counts
+    __table_args__ = (db.Index('ix_project_technologies_technology_id_project_id', 'technology_id', 'project_id'),)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), primary_key=True)
+    technology_id = db.Column(db.Integer, db.ForeignKey('technologies.id'), primary_key=True)
+    position = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    technology = db.relationship('Technology', lazy='joined')
+
 class KPI(db.Model):
     __tablename__ = 'kpis'
+    __table_args__ = (db.Index('ix_kpis_order_id', 'order', 'id'),)
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     status = db.Column(db.String(50), nullable=False)  # Planned, In Progress, Completed
     target_date = db.Column(db.Date)
     visibility = db.Column(db.String(50), default='Public')  # Public, Coming Soon
-    order = db.Column(db.Integer, default=0)
+    order = db.Column(db.Integer, default=0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -111,3 +152,29 @@ class Contact(db.Model):
     cv_url = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'
+    digest = db.Column(db.String(64), primary_key=True)  # sha256 of the JWT, never the token itself
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Change(db.Model):
+    __tablename__ = 'changes'
+    # AUTOINCREMENT so ids are never reused; the id is the /api/changes cursor
+    __table_args__ = {'sqlite_autoincrement': True}
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)  # create, update, delete
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+# List positions are NOT NULL; an explicit null from the API means "no position", i.e. 0
+ORDERED_MODELS = (SocialLink, Skill, Service, Certification, WorkExperience, Project, KPI)
+
+def _null_order_as_zero(target, value, oldvalue, initiator):
+    return 0 if value is None else value
+
+for _model in ORDERED_MODELS:
+    event.listen(_model.order, 'set', _null_order_as_zero, retval=True)
@@ -0,0 +1,99 @@
+import base64
+import json
+from urllib.parse import urlencode
+from flask import current_app, jsonify, request
+from sqlalchemy import tuple_
+from sqlalchemy.orm import load_only, noload
+from serializers import row_serializer
+
+
+class PageError(ValueError):
+    """Raised for malformed ``limit``, ``cursor`` or ``fields`` arguments."""
+
+
+def encode_cursor(row):
+    raw = json.dumps([row.order, row.id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        order, id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return int(order), int(id)
+    except (ValueError, TypeError):
+        raise PageError('Invalid cursor')
+
+
+def parse_limit():
+    limit = request.args.get('limit', current_app.config['PAGE_SIZE_DEFAULT'])
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise PageError('Invalid limit')
+    if limit < 0:
+        raise PageError('Invalid limit')
+    return min(limit, current_app.config['PAGE_SIZE_MAX']) if limit else None
+
+def parse_fields(allowed):
+    fields = request.args.get('fields')
+    if not fields:
+        return None
+    fields = [f.strip() for f in fields.split(',') if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise PageError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def paginate(query, model, serializer, allowed_fields, relations=None):
+    """Apply keyset pagination on ``(order, id)`` and ``?fields=`` projection.
+
+    ``?limit=`` caps the page size (``PAGE_SIZE_MAX``) and ``?cursor=``
+    resumes after the last row of the previous page. With ``?fields=`` only
+    the requested columns (plus ``order`` and ``id``, which the cursor needs)
+    are SELECTed. ``relations`` maps list relationships to the serializer of
+    their items; unrequested relationships are not loaded at all.
+
+    Returns ``(items, next_cursor)``; ``next_cursor`` is None on the last page.
+    """
+    relations = relations or {}
+    limit = parse_limit()
+    fields = parse_fields(allowed_fields)
+
+    # ``order`` is NOT NULL, so (order, id) is a total order the ix_*_order_id indexes serve directly
+    query = query.order_by(model.order, model.id)
+    cursor = request.args.get('cursor')
+    if cursor:
+        query = query.filter(tuple_(model.order, model.id) > tuple_(*decode_cursor(cursor)))
+    if fields:
+        columns = {f for f in fields if f not in relations} | {'order', 'id'}
+        query = query.options(load_only(*(getattr(model, c) for c in columns)))
+        for name in relations:
+            if name not in fields:
+                query = query.options(noload(getattr(model, name)))
+
+    rows = query.limit(limit + 1).all() if limit else query.all()
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+
+    if fields:
+        serializer = row_serializer(model, fields, relations)
+    items = [serializer(r) for r in rows]
+    return items, next_cursor
+
+def paginated_response(query, model, serializer, allowed_fields, relations=None):
+    """JSON list response for :func:`paginate`; the next page is advertised
+    in ``X-Next-Cursor`` and a ``Link: rel="next"`` header so the body stays
+    a plain list."""
+    try:
+        items, next_cursor = paginate(query, model, serializer, allowed_fields, relations)
+    except PageError as e:
+        return jsonify({'error': str(e)}), 400
+    response = jsonify(items)
+    if next_cursor:
+        args = request.args.to_dict()
+        args['cursor'] = next_cursor
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.path}?{urlencode(args)}>; rel="next"'
+    return response, 200
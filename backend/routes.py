@@ -1,8 +1,17 @@
+import hmac
 from flask import Blueprint, jsonify, request, current_app
-from werkzeug.utils import secure_filename
-from models import db, SocialLink, About, Skill, Service, Certification, WorkExperience, ExperienceSkill, Project, KPI, Contact
+from auth import admin_required, bearer_token, generate_token, token_cache
+from cache import response_cache
+from compression import response_compressor
+from snapshots import snapshot_store
+from conditional import conditional_get
+from pagination import paginated_response
+from serializers import row_serializer
+from jobs import job_queue, QueueFull
+from uploads import process_upload, store_upload, upload_options
+from models import db, SocialLink, About, Skill, Service, Certification, WorkExperience, ExperienceSkill, Project, ProjectTechnology, Technology, KPI, Contact
+from tags import filter_projects, link_skills, parse_tech_filter, set_project_technologies, technology_facets
 from datetime import datetime
-import jwt
 import os
 
 api_bp = Blueprint('api', __name__)
@@ -10,35 +19,114 @@ api_bp = Blueprint('api', __name__)
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
-def generate_token():
-    return jwt.encode({'admin': True, 'exp': datetime.utcnow().timestamp() + 86400}, current_app.config['SECRET_KEY'], algorithm='HS256')
-
-def verify_token(token):
-    try:
-        payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
-        return payload.get('admin') == True
-    except:
-        return False
-
-def admin_required(f):
-    def decorator(*args, **kwargs):
-        token = request.headers.get('Authorization')
-        if not token or not token.startswith('Bearer '):
-            return jsonify({'error': 'No token provided'}), 401
-        token = token.split(' ')[1]
-        if not verify_token(token):
-            return jsonify({'error': 'Invalid token'}), 401
-        return f(*args, **kwargs)
-    decorator.__name__ = f.__name__
-    return decorator
+# ========== SERIALIZERS ==========
+
+# Fields selectable through ?fields= on the list routes
+SOCIAL_LINK_FIELDS = ('id', 'platform', 'url', 'icon', 'order')
+SKILL_FIELDS = ('id', 'name', 'category', 'icon', 'icon_sprite', 'order')
+SERVICE_FIELDS = ('id', 'title', 'description', 'icon', 'order')
+CERTIFICATION_FIELDS = ('id', 'name', 'issuer', 'badge_image', 'badge_sprite', 'cert_image', 'issued_date', 'order')
+EXPERIENCE_SKILL_FIELDS = ('id', 'skill_name', 'explanation', 'order')
+EXPERIENCE_FIELDS = ('id', 'company', 'role', 'start_date', 'end_date', 'summary', 'order', 'skills_acquired')
+PROJECT_FIELDS = ('id', 'name', 'description', 'image', 'live_url', 'github_url', 'technologies', 'order', 'tags')
+TECHNOLOGY_FIELDS = ('id', 'slug', 'name', 'skill_id')
+KPI_FIELDS = ('id', 'title', 'description', 'status', 'target_date', 'visibility', 'order')
+
+# Compiled once per model; dates are encoded by the app's JSON provider
+social_link_to_dict = row_serializer(SocialLink, SOCIAL_LINK_FIELDS)
+skill_to_dict = row_serializer(Skill, SKILL_FIELDS)
+service_to_dict = row_serializer(Service, SERVICE_FIELDS)
+certification_to_dict = row_serializer(Certification, CERTIFICATION_FIELDS)
+experience_skill_to_dict = row_serializer(ExperienceSkill, EXPERIENCE_SKILL_FIELDS)
+EXPERIENCE_RELATIONS = {'skills_acquired': experience_skill_to_dict}
+experience_to_dict = row_serializer(WorkExperience, EXPERIENCE_FIELDS, EXPERIENCE_RELATIONS)
+technology_to_dict = row_serializer(Technology, TECHNOLOGY_FIELDS)
+
+def project_tag_to_dict(tag):
+    return technology_to_dict(tag.technology)
+
+PROJECT_RELATIONS = {'tags': project_tag_to_dict}
+project_to_dict = row_serializer(Project, PROJECT_FIELDS, PROJECT_RELATIONS)
+kpi_to_dict = row_serializer(KPI, KPI_FIELDS)
+
+def about_to_dict(about):
+    return {'id': about.id if about else None, 'overview': about.overview if about else '', 'profile_image': about.profile_image if about else None}
+
+def contact_to_dict(contact):
+    return {'id': contact.id if contact else None, 'email': contact.email if contact else '', 'phone': contact.phone if contact else '', 'linkedin': contact.linkedin if contact else '', 'github': contact.github if contact else '', 'location': contact.location if contact else '', 'cv_url': contact.cv_url if contact else ''}
+
+# ========== PUBLIC LOADERS ==========
+# Each loader is a single query (experience adds one selectin query for its
+# ordered skills) and is shared by the individual GET routes and /portfolio.
+
+def load_social_links():
+    return [social_link_to_dict(l) for l in SocialLink.query.order_by(SocialLink.order, SocialLink.id).all()]
+
+def load_about():
+    return about_to_dict(About.query.first())
+
+def load_skills():
+    return [skill_to_dict(s) for s in Skill.query.order_by(Skill.order, Skill.id).all()]
+
+def load_services():
+    return [service_to_dict(s) for s in Service.query.order_by(Service.order, Service.id).all()]
+
+def load_certifications():
+    return [certification_to_dict(c) for c in Certification.query.order_by(Certification.order, Certification.id).all()]
+
+def load_experience():
+    return [experience_to_dict(e) for e in WorkExperience.query.order_by(WorkExperience.order, WorkExperience.id).all()]
+
+def load_projects():
+    return [project_to_dict(p) for p in Project.query.order_by(Project.order, Project.id).all()]
+
+def load_kpis():
+    return [kpi_to_dict(k) for k in KPI.query.filter_by(visibility='Public').order_by(KPI.order, KPI.id).all()]
+
+def load_contact():
+    return contact_to_dict(Contact.query.first())
+
+PROJECT_MODELS = (Project, ProjectTechnology, Technology)
+
+PUBLIC_MODELS = (SocialLink, About, Skill, Service, Certification, WorkExperience, ExperienceSkill, *PROJECT_MODELS, KPI, Contact)
+
+PORTFOLIO_SECTIONS = {
+    'social_links': load_social_links,
+    'about': load_about,
+    'skills': load_skills,
+    'services': load_services,
+    'certifications': load_certifications,
+    'experience': load_experience,
+    'projects': load_projects,
+    'kpis': load_kpis,
+    'contact': load_contact,
+}
 
 @api_bp.route('/auth/login', methods=['POST'])
 def login():
-    data = request.get_json()
-    if data.get('password') == current_app.config['ADMIN_PASSWORD']:
+    data = request.get_json(silent=True)
+    password = data.get('password') if isinstance(data, dict) else None
+    expected = current_app.config['ADMIN_PASSWORD']
+    if isinstance(password, str) and password and expected and hmac.compare_digest(password.encode(), expected.encode()):
         return jsonify({'token': generate_token(), 'message': 'Login successful'}), 200
     return jsonify({'error': 'Invalid password'}), 401
 
+@api_bp.route('/auth/logout', methods=['POST'])
+@admin_required
+def logout():
+    token_cache.revoke(bearer_token())
+    return jsonify({'message': 'Logged out'}), 200
+
+@api_bp.route('/auth/stats', methods=['GET'])
+@admin_required
+def get_auth_stats():
+    return jsonify(token_cache.stats()), 200
+
+@api_bp.route('/cache/stats', methods=['GET'])
+@admin_required
+def get_cache_stats():
+    return jsonify({**response_cache.stats(), 'compression': response_compressor.stats(), 'snapshots': snapshot_store.stats()}), 200
+
 @api_bp.route('/upload', methods=['POST'])
 @admin_required
 def upload_file():
@@ -48,18 +136,42 @@ def upload_file():
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        name, ext = os.path.splitext(filename)
-        filename = f"{name}_{int(datetime.utcnow().timestamp())}{ext}"
+        filename, created = store_upload(file, current_app.config['UPLOAD_FOLDER'])
         filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        return jsonify({'url': f"/uploads/{filename}"}), 200
+        url = f"/uploads/{filename}"
+        try:
+            job = job_queue.submit('upload', process_upload, filepath, url, upload_options(current_app.config))
+        except QueueFull:
+            return jsonify({'error': 'Upload queue is full, retry shortly', 'url': url}), 503, {'Retry-After': '5'}
+        if job.status == 'done':
+            return jsonify({**job.result, 'job_id': job.id, 'deduplicated': not created}), 200
+        return jsonify({'url': url, 'job_id': job.id, 'status': job.status, 'status_url': f"/api/upload/jobs/{job.id}", 'deduplicated': not created}), 202
     return jsonify({'error': 'File type not allowed'}), 400
 
+@api_bp.route('/upload/jobs/<job_id>', methods=['GET'])
+@admin_required
+def get_upload_job(job_id):
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.to_dict()), 200
+
+@api_bp.route('/portfolio', methods=['GET'])
+@conditional_get(*PUBLIC_MODELS)
+@response_cache.cached(*PUBLIC_MODELS)
+def get_portfolio():
+    sections = request.args.get('sections')
+    names = [n.strip() for n in sections.split(',') if n.strip()] if sections else list(PORTFOLIO_SECTIONS)
+    unknown = [n for n in names if n not in PORTFOLIO_SECTIONS]
+    if unknown:
+        return jsonify({'error': f"Unknown sections: {', '.join(unknown)}"}), 400
+    return jsonify({name: PORTFOLIO_SECTIONS[name]() for name in names}), 200
+
 @api_bp.route('/social-links', methods=['GET'])
+@conditional_get(SocialLink)
+@response_cache.cached(SocialLink)
 def get_social_links():
-    links = SocialLink.query.order_by(SocialLink.order).all()
-    return jsonify([{'id': l.id, 'platform': l.platform, 'url': l.url, 'icon': l.icon, 'order': l.order} for l in links]), 200
+    return paginated_response(SocialLink.query, SocialLink, social_link_to_dict, SOCIAL_LINK_FIELDS)
 
 @api_bp.route('/social-links', methods=['POST'])
 @admin_required
@@ -89,9 +201,10 @@ def delete_social_link(id):
     return jsonify({'message': 'Deleted'}), 200
 
 @api_bp.route('/about', methods=['GET'])
+@conditional_get(About)
+@response_cache.cached(About)
 def get_about():
-    about = About.query.first()
-    return jsonify({'id': about.id if about else None, 'overview': about.overview if about else '', 'profile_image': about.profile_image if about else None}), 200
+    return jsonify(load_about()), 200
 
 @api_bp.route('/about', methods=['POST', 'PUT'])
 @admin_required
@@ -108,9 +221,10 @@ def upsert_about():
     return jsonify({'message': 'Updated'}), 200
 
 @api_bp.route('/skills', methods=['GET'])
+@conditional_get(Skill)
+@response_cache.cached(Skill)
 def get_skills():
-    skills = Skill.query.order_by(Skill.order).all()
-    return jsonify([{'id': s.id, 'name': s.name, 'category': s.category, 'icon': s.icon, 'order': s.order} for s in skills]), 200
+    return paginated_response(Skill.query, Skill, skill_to_dict, SKILL_FIELDS)
 
 @api_bp.route('/skills', methods=['POST'])
 @admin_required
@@ -123,6 +237,8 @@ def create_skill():
         order=data.get('order', 0)
     )
     db.session.add(skill)
+    db.session.flush()
+    link_skills()
     db.session.commit()
     return jsonify({'id': skill.id}), 201
 
@@ -134,20 +250,26 @@ def update_skill(id):
     for key in ['name', 'category', 'icon', 'order']:
         if key in data:
             setattr(skill, key, data[key])
+    if 'name' in data:
+        db.session.flush()
+        link_skills()
     db.session.commit()
     return jsonify({'message': 'Updated'}), 200
 
 @api_bp.route('/skills/<int:id>', methods=['DELETE'])
 @admin_required
 def delete_skill(id):
-    db.session.delete(Skill.query.get_or_404(id))
+    skill = Skill.query.get_or_404(id)
+    link_skills(exclude=[id])
+    db.session.delete(skill)
     db.session.commit()
     return jsonify({'message': 'Deleted'}), 200
 
 @api_bp.route('/services', methods=['GET'])
+@conditional_get(Service)
+@response_cache.cached(Service)
 def get_services():
-    services = Service.query.order_by(Service.order).all()
-    return jsonify([{'id': s.id, 'title': s.title, 'description': s.description, 'icon': s.icon, 'order': s.order} for s in services]), 200
+    return paginated_response(Service.query, Service, service_to_dict, SERVICE_FIELDS)
 
 @api_bp.route('/services', methods=['POST'])
 @admin_required
@@ -177,9 +299,10 @@ def delete_service(id):
     return jsonify({'message': 'Deleted'}), 200
 
 @api_bp.route('/certifications', methods=['GET'])
+@conditional_get(Certification)
+@response_cache.cached(Certification)
 def get_certifications():
-    certs = Certification.query.order_by(Certification.order).all()
-    return jsonify([{'id': c.id, 'name': c.name, 'issuer': c.issuer, 'badge_image': c.badge_image, 'cert_image': c.cert_image, 'issued_date': c.issued_date.isoformat() if c.issued_date else None, 'order': c.order} for c in certs]), 200
+    return paginated_response(Certification.query, Certification, certification_to_dict, CERTIFICATION_FIELDS)
 
 @api_bp.route('/certifications', methods=['POST'])
 @admin_required
@@ -211,14 +334,16 @@ def delete_certification(id):
     return jsonify({'message': 'Deleted'}), 200
 
 @api_bp.route('/experience', methods=['GET'])
+@conditional_get(WorkExperience, ExperienceSkill)
+@response_cache.cached(WorkExperience, ExperienceSkill)
 def get_experience():
-    exps = WorkExperience.query.order_by(WorkExperience.order).all()
-    return jsonify([{'id': e.id, 'company': e.company, 'role': e.role, 'start_date': e.start_date.isoformat(), 'end_date': e.end_date.isoformat() if e.end_date else None, 'summary': e.summary, 'order': e.order, 'skills_acquired': [{'id': s.id, 'skill_name': s.skill_name, 'explanation': s.explanation, 'order': s.order} for s in e.skills_acquired]} for e in exps]), 200
+    return paginated_response(WorkExperience.query, WorkExperience, experience_to_dict, EXPERIENCE_FIELDS, EXPERIENCE_RELATIONS)
 
 @api_bp.route('/experience/<int:id>', methods=['GET'])
+@conditional_get(WorkExperience, ExperienceSkill)
+@response_cache.cached(WorkExperience, ExperienceSkill)
 def get_experience_detail(id):
-    exp = WorkExperience.query.get_or_404(id)
-    return jsonify({'id': exp.id, 'company': exp.company, 'role': exp.role, 'start_date': exp.start_date.isoformat(), 'end_date': exp.end_date.isoformat() if exp.end_date else None, 'summary': exp.summary, 'skills_acquired': [{'id': s.id, 'skill_name': s.skill_name, 'explanation': s.explanation, 'order': s.order} for s in sorted(exp.skills_acquired, key=lambda x: x.order)]}), 200
+    return jsonify(experience_to_dict(WorkExperience.query.get_or_404(id))), 200
 
 @api_bp.route('/experience', methods=['POST'])
 @admin_required
@@ -258,6 +383,8 @@ def add_experience_skill(exp_id):
     data = request.get_json()
     skill = ExperienceSkill(experience_id=exp_id, skill_name=data['skill_name'], explanation=data['explanation'], order=data.get('order', 0))
     db.session.add(skill)
+    db.session.flush()
+    link_skills()
     db.session.commit()
     return jsonify({'id': skill.id}), 201
 
@@ -280,15 +407,24 @@ def delete_experience_skill(id):
     return jsonify({'message': 'Deleted'}), 200
 
 @api_bp.route('/projects', methods=['GET'])
+@conditional_get(*PROJECT_MODELS)
+@response_cache.cached(*PROJECT_MODELS)
 def get_projects():
-    projects = Project.query.order_by(Project.order).all()
-    return jsonify([{'id': p.id, 'name': p.name, 'description': p.description, 'image': p.image, 'live_url': p.live_url, 'github_url': p.github_url, 'technologies': p.technologies, 'order': p.order} for p in projects]), 200
+    query = filter_projects(Project.query, parse_tech_filter(request.args.get('tech')))
+    return paginated_response(query, Project, project_to_dict, PROJECT_FIELDS, PROJECT_RELATIONS)
+
+@api_bp.route('/projects/facets', methods=['GET'])
+@conditional_get(*PROJECT_MODELS)
+@response_cache.cached(*PROJECT_MODELS)
+def get_project_facets():
+    return jsonify({'technologies': technology_facets(parse_tech_filter(request.args.get('tech')))}), 200
 
 @api_bp.route('/projects', methods=['POST'])
 @admin_required
 def create_project():
     data = request.get_json()
-    project = Project(name=data['name'], description=data['description'], image=data.get('image'), live_url=data.get('live_url'), github_url=data.get('github_url'), technologies=data.get('technologies'), order=data.get('order', 0))
+    project = Project(name=data['name'], description=data['description'], image=data.get('image'), live_url=data.get('live_url'), github_url=data.get('github_url'), order=data.get('order', 0))
+    set_project_technologies(project, data.get('technologies'))
     db.session.add(project)
     db.session.commit()
     return jsonify({'id': project.id}), 201
@@ -298,9 +434,11 @@ def create_project():
 def update_project(id):
     project = Project.query.get_or_404(id)
     data = request.get_json()
-    for key in ['name', 'description', 'image', 'live_url', 'github_url', 'technologies', 'order']:
+    for key in ['name', 'description', 'image', 'live_url', 'github_url', 'order']:
         if key in data:
             setattr(project, key, data[key])
+    if 'technologies' in data:
+        set_project_technologies(project, data['technologies'])
     db.session.commit()
     return jsonify({'message': 'Updated'}), 200
 
@@ -312,15 +450,15 @@ def delete_project(id):
     return jsonify({'message': 'Deleted'}), 200
 
 @api_bp.route('/kpis', methods=['GET'])
+@conditional_get(KPI)
+@response_cache.cached(KPI)
 def get_kpis():
-    kpis = KPI.query.filter_by(visibility='Public').order_by(KPI.order).all()
-    return jsonify([{'id': k.id, 'title': k.title, 'description': k.description, 'status': k.status, 'target_date': k.target_date.isoformat() if k.target_date else None, 'visibility': k.visibility, 'order': k.order} for k in kpis]), 200
+    return paginated_response(KPI.query.filter_by(visibility='Public'), KPI, kpi_to_dict, KPI_FIELDS)
 
 @api_bp.route('/kpis/all', methods=['GET'])
 @admin_required
 def get_all_kpis():
-    kpis = KPI.query.order_by(KPI.order).all()
-    return jsonify([{'id': k.id, 'title': k.title, 'description': k.description, 'status': k.status, 'target_date': k.target_date.isoformat() if k.target_date else None, 'visibility': k.visibility, 'order': k.order} for k in kpis]), 200
+    return paginated_response(KPI.query, KPI, kpi_to_dict, KPI_FIELDS)
 
 @api_bp.route('/kpis', methods=['POST'])
 @admin_required
@@ -352,9 +490,10 @@ def delete_kpi(id):
     return jsonify({'message': 'Deleted'}), 200
 
 @api_bp.route('/contact', methods=['GET'])
+@conditional_get(Contact)
+@response_cache.cached(Contact)
 def get_contact():
-    contact = Contact.query.first()
-    return jsonify({'id': contact.id if contact else None, 'email': contact.email if contact else '', 'phone': contact.phone if contact else '', 'linkedin': contact.linkedin if contact else '', 'github': contact.github if contact else '', 'location': contact.location if contact else '', 'cv_url': contact.cv_url if contact else ''}), 200
+    return jsonify(load_contact()), 200
 
 @api_bp.route('/contact', methods=['POST', 'PUT'])
 @admin_required
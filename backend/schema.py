@@ -0,0 +1,99 @@
+import os
+import sys
+import click
+from alembic.script import ScriptDirectory
+from flask import current_app
+from flask.cli import with_appcontext
+from flask_migrate import stamp, upgrade
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from models import db
+from search import create_fts_index
+from snapshots import snapshot_store, warm_snapshots
+from sprites import rebuild_sprites
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database is not at the Alembic head this code expects."""
+
+
+_heads = None
+
+def migration_heads():
+    global _heads
+    if _heads is None:
+        _heads = set(ScriptDirectory(MIGRATIONS_DIR).get_heads())
+    return _heads
+
+def current_revisions():
+    try:
+        return {row[0] for row in db.session.execute(text('SELECT version_num FROM alembic_version'))}
+    except (OperationalError, ProgrammingError):
+        db.session.rollback()
+        return set()
+    finally:
+        db.session.close()
+
+
+def prepare_schema(app):
+    """Apply ``SCHEMA_MODE`` at startup.
+
+    ``create``  runs ``db.create_all()`` (development default).
+    ``verify``  issues no DDL; one query checks ``alembic_version`` against
+                the migration head and refuses to start on a mismatch.
+    ``skip``    does nothing.
+
+    Nothing is done when running under the ``flask`` command.
+    """
+    mode = app.config['SCHEMA_MODE']
+    # `flask db ...` and `flask deploy` manage the schema themselves and must
+    # be able to run against an outdated (or empty) database
+    if mode == 'skip' or os.environ.get('FLASK_RUN_FROM_CLI') == 'true':
+        return
+    with app.app_context():
+        if mode == 'create':
+            db.create_all(bind_key=None)  # never the read replicas
+        elif mode == 'verify':
+            current, heads = current_revisions(), migration_heads()
+            if current != heads:
+                raise SchemaOutOfDate(f"Database is at {sorted(current) or 'no revision'}, code expects {sorted(heads)}; run `flask deploy` first")
+        else:
+            raise ValueError(f'Unknown SCHEMA_MODE: {mode}')
+
+
+def upgrade_database():
+    """Bring the database to the migration head.
+
+    The migration history starts from tables created by ``db.create_all()``,
+    so an empty database is created from the models and stamped at head;
+    an existing one is upgraded. On SQLite the search index triggers are
+    then re-created in case a batch (copy-and-move) migration dropped them.
+    """
+    if not inspect(db.engine).get_table_names():
+        db.create_all(bind_key=None)
+        stamp(directory=MIGRATIONS_DIR)
+    else:
+        upgrade(directory=MIGRATIONS_DIR)
+        with db.engine.begin() as connection:
+            create_fts_index(connection)
+
+
+@click.command('deploy')
+@click.option('--serve', is_flag=True, help='Start gunicorn (wsgi:app) once the database is up to date.')
+@with_appcontext
+def deploy_command(serve):
+    """Run migrations once, then optionally serve."""
+    upgrade_database()
+    click.echo(f"Database at {', '.join(sorted(current_revisions()))}")
+    if current_app.config.get('SPRITES_ENABLED'):
+        result = rebuild_sprites()
+        click.echo(f"Sprites: {result['icons']} icon(s), {result['badges']} badge(s)")
+    if snapshot_store.enabled:
+        snapshot_store.clear()
+        click.echo(f'Rendered {warm_snapshots()} public response(s) into the snapshot store')
+    if serve:
+        backend = os.path.dirname(os.path.abspath(__file__))
+        os.chdir(backend)
+        os.execvp(sys.executable, [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'])
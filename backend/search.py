@@ -0,0 +1,270 @@
+import html
+import math
+import re
+import threading
+import click
+from bisect import bisect_left
+from flask import Blueprint, current_app, jsonify, request
+from flask.cli import with_appcontext
+from sqlalchemy import event, inspect, text
+from cache import response_cache
+from conditional import conditional_get, table_stamp
+from models import db, Project, WorkExperience, ExperienceSkill, Skill, Certification
+
+search_bp = Blueprint('search', __name__)
+
+SEARCH_TABLE = 'search_index'
+
+
+class Source:
+    """One searchable model: SQL expressions (over ``{r}``, the row alias
+    ``new``/``old`` in triggers) for the document title and body, and the
+    optional parent id returned with each hit."""
+
+    def __init__(self, kind, code, model, title, body, parent=None):
+        self.kind = kind
+        self.code = code  # rowid = id * 8 + code, so a row's document is found without a scan
+        self.model = model
+        self.title = title
+        self.body = body
+        self.parent = parent
+
+    def columns(self, r):
+        parent = self.parent.format(r=r) if self.parent else 'NULL'
+        return f"{r}.id * 8 + {self.code}, {self.title.format(r=r)}, {self.body.format(r=r)}, {parent}"
+
+
+SOURCES = [
+    Source('project', 1, Project, "{r}.name", "coalesce({r}.description, '') || ' ' || coalesce({r}.technologies, '')"),
+    Source('experience', 2, WorkExperience, "{r}.role || ' at ' || {r}.company", "coalesce({r}.summary, '')"),
+    Source('experience_skill', 3, ExperienceSkill, "{r}.skill_name", "coalesce({r}.explanation, '')", parent="{r}.experience_id"),
+    Source('skill', 4, Skill, "{r}.name", "coalesce({r}.category, '')"),
+    Source('certification', 5, Certification, "{r}.name", "coalesce({r}.issuer, '')"),
+]
+KINDS = {s.kind: s for s in SOURCES}
+CODES = {s.code: s for s in SOURCES}
+SEARCH_MODELS = tuple(s.model for s in SOURCES)
+
+
+# ========== SQLITE FTS5 INDEX ==========
+# Kept in sync by triggers, so ORM writes, batch bulk statements and raw SQL
+# all update it inside the writing transaction.
+
+def fts_statements():
+    statements = [f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(title, body, parent_id UNINDEXED, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"]
+    for s in SOURCES:
+        table = s.model.__tablename__
+        insert = f"INSERT INTO {SEARCH_TABLE}(rowid, title, body, parent_id) VALUES ({s.columns('new')});"
+        delete = f"DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 8 + {s.code};"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_{table}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_{table}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_{table}_au AFTER UPDATE ON {table} BEGIN {delete} {insert} END",
+        ]
+    return statements
+
+def rebuild_statements():
+    return [f"DELETE FROM {SEARCH_TABLE}"] + [f"INSERT INTO {SEARCH_TABLE}(rowid, title, body, parent_id) SELECT {s.columns('r')} FROM {s.model.__tablename__} AS r" for s in SOURCES]
+
+def fts_supported(connection):
+    if connection.dialect.name != 'sqlite':
+        return False
+    return bool(connection.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar())
+
+def has_fts_index(connection):
+    return connection.dialect.name == 'sqlite' and inspect(connection).has_table(SEARCH_TABLE)
+
+def create_fts_index(connection):
+    """Create the FTS5 table and its triggers (idempotent); fill it if new."""
+    if not fts_supported(connection):
+        return False
+    created = not has_fts_index(connection)
+    for statement in fts_statements():
+        connection.exec_driver_sql(statement)
+    if created:
+        for statement in rebuild_statements():
+            connection.exec_driver_sql(statement)
+    return True
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_search_index(target, connection, **kw):
+    create_fts_index(connection)
+
+def include_name(name, type_, parent_names):
+    """Alembic filter: the FTS table and its shadow tables are not models."""
+    return not (type_ == 'table' and name.startswith(SEARCH_TABLE))
+
+
+def fts_query(terms):
+    # Each term is quoted (so user input is never FTS syntax) and prefix-matched
+    return ' '.join('"' + t.replace('"', '""') + '"*' for t in terms)
+
+def search_fts(terms, kinds, limit):
+    codes = ', '.join(str(KINDS[k].code) for k in kinds)
+    rows = db.session.execute(text(
+        f"SELECT rowid, title, parent_id, bm25({SEARCH_TABLE}, 10.0, 1.0) AS rank, "
+        f"highlight({SEARCH_TABLE}, 0, char(2), char(3)), snippet({SEARCH_TABLE}, 1, char(2), char(3), '…', 12) "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH :query AND rowid % 8 IN ({codes}) ORDER BY rank LIMIT :limit"
+    ), {'query': fts_query(terms), 'limit': limit})
+    return [hit(CODES[rowid % 8], rowid // 8, parent_id, -rank, title, snippet) for rowid, _, parent_id, rank, title, snippet in rows]
+
+
+# ========== IN-MEMORY INDEX ==========
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+def tokenize(value):
+    return [t.lower() for t in TOKEN_RE.findall(value or '')]
+
+
+class MemoryIndex:
+    """Inverted index used when FTS5 is unavailable (non-SQLite databases).
+
+    Built from the source tables and rebuilt when their stamp changes;
+    lookups touch only the postings of the matching terms. Scores are BM25
+    with the title weighted like the FTS5 index.
+    """
+
+    TITLE_WEIGHT = 10.0
+    K1, B = 1.2, 0.75
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stamp = None
+        self.docs = {}
+        self.postings = {}
+        self.terms = []
+        self.average_length = 1.0
+
+    def ensure_current(self):
+        stamp = table_stamp(SEARCH_MODELS)[0]
+        if stamp != self.stamp:
+            with self._lock:
+                if stamp != self.stamp:
+                    self._build()
+                    self.stamp = stamp
+
+    def _build(self):
+        docs, postings = {}, {}
+        for s in SOURCES:
+            rows = db.session.execute(text(f"SELECT {s.columns('r')} FROM {s.model.__tablename__} AS r"))
+            for rowid, title, body, parent_id in rows:
+                key = (s.kind, rowid // 8)
+                fields = (tokenize(title), tokenize(body))
+                docs[key] = (title or '', body or '', parent_id, sum(len(f) for f in fields))
+                for weight, tokens in zip((self.TITLE_WEIGHT, 1.0), fields):
+                    for token in tokens:
+                        entry = postings.setdefault(token, {})
+                        entry[key] = entry.get(key, 0.0) + weight
+        self.docs, self.postings, self.terms = docs, postings, sorted(postings)
+        self.average_length = sum(d[3] for d in docs.values()) / len(docs) if docs else 1.0
+
+    def _expand(self, prefix):
+        terms = self.terms
+        for i in range(bisect_left(terms, prefix), len(terms)):
+            if not terms[i].startswith(prefix):
+                break
+            yield terms[i]
+
+    def search(self, terms, kinds, limit):
+        self.ensure_current()
+        docs, postings = self.docs, self.postings
+        if not docs:
+            return []
+        average = self.average_length or 1.0
+        scores = None
+        for term in terms:
+            term_scores = {}
+            for match in self._expand(term.lower()):
+                entry = postings[match]
+                idf = math.log(1 + (len(docs) - len(entry) + 0.5) / (len(entry) + 0.5))
+                for key, tf in entry.items():
+                    norm = tf + self.K1 * (1 - self.B + self.B * docs[key][3] / average)
+                    term_scores[key] = term_scores.get(key, 0.0) + idf * tf * (self.K1 + 1) / norm
+            # Every term must match, like the FTS5 query
+            scores = term_scores if scores is None else {k: v + term_scores[k] for k, v in scores.items() if k in term_scores}
+        ranked = sorted(((score, key) for key, score in (scores or {}).items() if key[0] in kinds), key=lambda item: (-item[0], item[1]))[:limit]
+        prefixes = [t.lower() for t in terms]
+        return [hit(KINDS[kind], id, docs[(kind, id)][2], score, mark(docs[(kind, id)][0], prefixes), excerpt(docs[(kind, id)][1], prefixes))
+                for score, (kind, id) in ranked]
+
+
+def _matches(word, prefixes):
+    lowered = word.lower()
+    return any(lowered.startswith(p) for p in prefixes)
+
+def mark(value, prefixes):
+    return TOKEN_RE.sub(lambda m: f'\x02{m.group(0)}\x03' if _matches(m.group(0), prefixes) else m.group(0), value)
+
+def excerpt(value, prefixes, words=12):
+    tokens = list(TOKEN_RE.finditer(value))
+    first = next((i for i, t in enumerate(tokens) if _matches(t.group(0), prefixes)), 0)
+    start = max(0, first - words // 3)
+    window = tokens[start:start + words]
+    if not window:
+        return ''
+    fragment = value[window[0].start():window[-1].end()]
+    return ('…' if start else '') + mark(fragment, prefixes) + ('…' if start + words < len(tokens) else '')
+
+
+memory_index = MemoryIndex()
+
+
+# ========== API ==========
+
+def to_html(value):
+    """Escape indexed text and turn the \\x02/\\x03 match markers into <mark>."""
+    return html.escape(value or '').replace('\x02', '<mark>').replace('\x03', '</mark>')
+
+def hit(source, id, parent_id, score, title, snippet):
+    result = {'type': source.kind, 'id': id, 'title': to_html(title), 'snippet': to_html(snippet), 'score': round(score, 4)}
+    if source.parent:
+        result['experience_id'] = parent_id
+    return result
+
+def search_backend():
+    backend = current_app.config.get('SEARCH_BACKEND', 'auto')
+    if backend == 'auto':
+        state = current_app.extensions.setdefault('search', {})
+        if 'backend' not in state:
+            with db.engine.connect() as connection:
+                state['backend'] = 'fts5' if has_fts_index(connection) and fts_supported(connection) else 'memory'
+        backend = state['backend']
+    return backend
+
+def search(terms, kinds, limit):
+    if search_backend() == 'fts5':
+        return search_fts(terms, kinds, limit)
+    return memory_index.search(terms, kinds, limit)
+
+
+@search_bp.route('/search', methods=['GET'])
+@conditional_get(*SEARCH_MODELS)
+@response_cache.cached(*SEARCH_MODELS, shared=False)
+def search_portfolio():
+    terms = TOKEN_RE.findall(request.args.get('q', ''))[:10]
+    if not terms:
+        return jsonify({'error': 'Missing search query'}), 400
+    kinds = [k.strip() for k in request.args.get('type', '').split(',') if k.strip()] or list(KINDS)
+    unknown = [k for k in kinds if k not in KINDS]
+    if unknown:
+        return jsonify({'error': f"Unknown types: {', '.join(unknown)}"}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), current_app.config['SEARCH_LIMIT_MAX'])
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+    return jsonify({'query': ' '.join(terms), 'results': search(terms, kinds, limit)}), 200
+
+
+@click.command('search-reindex')
+@with_appcontext
+def search_reindex_command():
+    """Create (if needed) and rebuild the full-text search index."""
+    with db.engine.begin() as connection:
+        if not create_fts_index(connection):
+            click.echo('FTS5 is not available; /api/search uses the in-memory index')
+            return
+        for statement in rebuild_statements():
+            connection.exec_driver_sql(statement)
+        count = connection.exec_driver_sql(f'SELECT count(*) FROM {SEARCH_TABLE}').scalar()
+    click.echo(f'Indexed {count} document(s)')
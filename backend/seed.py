@@ -0,0 +1,127 @@
+import random
+from datetime import date, datetime, timedelta
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, func, insert, select
+from models import (db, SocialLink, About, Skill, Service, Certification, WorkExperience, ExperienceSkill,
+                    Project, ProjectTechnology, Technology, KPI, Contact)
+
+DEFAULT_SIZES = {
+    'social_links': 10,
+    'skills': 200,
+    'services': 50,
+    'certifications': 200,
+    'experiences': 1000,
+    'skills_per_experience': 20,
+    'projects': 10000,
+    'technologies_per_project': 5,
+    'kpis': 500,
+}
+
+WORDS = ('cloud', 'python', 'angular', 'latency', 'pipeline', 'migration', 'cache', 'index', 'platform', 'service',
+         'design', 'deploy', 'monitoring', 'scale', 'query', 'storage', 'security', 'frontend', 'backend', 'testing',
+         'automation', 'network', 'container', 'serverless', 'analytics', 'dashboard', 'release', 'review', 'api', 'data')
+
+TECHNOLOGIES = ('Python', 'Flask', 'Angular', 'TypeScript', 'JavaScript', 'React', 'AWS', 'Azure', 'GCP', 'Docker',
+                'Kubernetes', 'Terraform', 'PostgreSQL', 'SQLite', 'Redis', 'Go', 'Rust', 'Java', 'Node.js', 'GraphQL',
+                'HTML', 'CSS', 'Linux', 'Nginx', 'Kafka', 'Spark', 'Pandas', 'FastAPI', 'Django', 'Vue')
+
+# Children are emptied before their parents
+SEEDED_MODELS = (ProjectTechnology, Technology, ExperienceSkill, WorkExperience, Project, SocialLink, Skill, Service,
+                 Certification, KPI, About, Contact)
+
+CHUNK = 2000
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def _insert(model, rows):
+    for start in range(0, len(rows), CHUNK):
+        db.session.execute(insert(model), rows[start:start + CHUNK])
+
+def _insert_returning_ids(model, rows):
+    """Bulk-insert ``rows`` and return the ids the database assigned, in
+    the order of ``rows`` (INSERT .. RETURNING, so no id is guessed)."""
+    statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+    ids = []
+    for start in range(0, len(rows), CHUNK):
+        ids += db.session.scalars(statement, rows[start:start + CHUNK]).all()
+    return ids
+
+def seed_synthetic(sizes=None, seed=0):
+    """Fill every portfolio table with deterministic synthetic rows.
+
+    ``sizes`` overrides entries of :data:`DEFAULT_SIZES`; the same sizes
+    and ``seed`` always produce the same database. Rows are written with
+    bulk INSERTs in one transaction. Returns the row count per table.
+    """
+    sizes = {**DEFAULT_SIZES, **(sizes or {})}
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 1)
+    stamps = {'created_at': now, 'updated_at': now}
+
+    _insert(About, [{'overview': _text(rng, 80), 'profile_image': '/uploads/profile.png', **stamps}])
+    _insert(Contact, [{'email': 'me@example.com', 'phone': '+1 555 0100', 'linkedin': 'https://linkedin.com/in/example',
+                       'github': 'https://github.com/example', 'location': 'Remote', 'cv_url': '/uploads/cv.pdf', **stamps}])
+    _insert(SocialLink, [{'platform': f'platform{i}', 'url': f'https://example.com/{i}', 'icon': 'link', 'order': i, **stamps}
+                         for i in range(sizes['social_links'])])
+    skill_names = [TECHNOLOGIES[i] if i < len(TECHNOLOGIES) else f'Skill {i}' for i in range(sizes['skills'])]
+    _insert(Skill, [{'name': name, 'category': rng.choice(('frontend', 'backend', 'cloud', 'data')), 'icon': name.lower(), 'order': i, **stamps}
+                    for i, name in enumerate(skill_names)])
+    _insert(Service, [{'title': f'Service {i}', 'description': _text(rng, 40), 'icon': 'star', 'order': i, **stamps}
+                      for i in range(sizes['services'])])
+    _insert(Certification, [{'name': f'Certification {i}', 'issuer': rng.choice(('AWS', 'Microsoft', 'Google')),
+                             'badge_image': f'/uploads/badge{i}.png', 'issued_date': date(2020, 1, 1) + timedelta(days=i % 1500), 'order': i, **stamps}
+                            for i in range(sizes['certifications'])])
+    _insert(KPI, [{'title': f'KPI {i}', 'description': _text(rng, 20), 'status': rng.choice(('Planned', 'In Progress', 'Completed')),
+                   'target_date': date(2026, 1, 1) + timedelta(days=i % 365), 'visibility': 'Public' if i % 4 else 'Coming Soon', 'order': i, **stamps}
+                  for i in range(sizes['kpis'])])
+
+    experience_ids = _insert_returning_ids(WorkExperience, [{'company': f'Company {i}', 'role': rng.choice(('Engineer', 'Senior Engineer', 'Lead', 'Architect')),
+                              'start_date': date(2010, 1, 1) + timedelta(days=i * 3 % 5000), 'end_date': None if i % 10 == 0 else date(2024, 1, 1),
+                              'summary': _text(rng, 60), 'order': i, **stamps}
+                             for i in range(sizes['experiences'])])
+    _insert(ExperienceSkill, [{'experience_id': experience_id, 'skill_name': rng.choice(skill_names), 'explanation': _text(rng, 25), 'order': j, **stamps}
+                              for experience_id in experience_ids for j in range(sizes['skills_per_experience'])])
+
+    technologies = list(TECHNOLOGIES)
+    skill_ids = dict(db.session.execute(select(func.lower(Skill.name), func.min(Skill.id)).group_by(func.lower(Skill.name))).all())
+    technology_ids = _insert_returning_ids(Technology, [{'slug': name.lower(), 'name': name, 'skill_id': skill_ids.get(name.lower()), **stamps} for name in technologies])
+    projects, picks = [], []
+    for i in range(sizes['projects']):
+        picked = rng.sample(range(len(technologies)), min(sizes['technologies_per_project'], len(technologies)))
+        projects.append({'name': f'Project {i}', 'description': _text(rng, 120), 'image': f'/uploads/project{i}.png',
+                         'live_url': f'https://example.com/p/{i}', 'github_url': f'https://github.com/example/p{i}',
+                         'technologies': ', '.join(technologies[t] for t in picked), 'order': i, **stamps})
+        picks.append(picked)
+    project_ids = _insert_returning_ids(Project, projects)
+    _insert(ProjectTechnology, [{'project_id': project_id, 'technology_id': technology_ids[t], 'position': p, **stamps}
+                                for project_id, picked in zip(project_ids, picks) for p, t in enumerate(picked)])
+    db.session.commit()
+    return {m.__tablename__: db.session.scalar(select(func.count()).select_from(m)) for m in reversed(SEEDED_MODELS)}
+
+def clear_portfolio():
+    for model in SEEDED_MODELS:
+        db.session.execute(delete(model))
+    db.session.commit()
+
+
+@click.command('seed')
+@click.option('--projects', type=int, default=DEFAULT_SIZES['projects'])
+@click.option('--experiences', type=int, default=DEFAULT_SIZES['experiences'])
+@click.option('--skills-per-experience', type=int, default=DEFAULT_SIZES['skills_per_experience'])
+@click.option('--skills', type=int, default=DEFAULT_SIZES['skills'])
+@click.option('--certifications', type=int, default=DEFAULT_SIZES['certifications'])
+@click.option('--kpis', type=int, default=DEFAULT_SIZES['kpis'])
+@click.option('--seed', 'random_seed', type=int, default=0, help='Random seed; the same options give the same data.')
+@click.option('--reset', is_flag=True, help='Delete all existing portfolio content first.')
+@with_appcontext
+def seed_command(random_seed, reset, **sizes):
+    """Fill the database with synthetic portfolio content for benchmarking."""
+    if db.session.scalar(select(func.count()).select_from(Project)) and not reset:
+        raise click.ClickException('The database already has content; pass --reset to replace it')
+    if reset:
+        clear_portfolio()
+    counts = seed_synthetic(sizes, random_seed)
+    click.echo(', '.join(f'{table}: {count}' for table, count in counts.items()))
@@ -0,0 +1,86 @@
+from datetime import date
+from functools import lru_cache
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:  # optional fast encoder; the stdlib json module is used without it
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _iso_default(o):
+    if isinstance(o, date):
+        return o.isoformat()
+    return _default(o)
+
+
+class PortfolioJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes with orjson when it is installed.
+
+    ``JSON_BACKEND`` selects ``orjson``, ``stdlib`` or ``auto`` (orjson if
+    importable). Both backends write ``date``/``datetime`` values as ISO 8601,
+    non-ASCII text as UTF-8 and keys sorted, so responses are the same
+    whichever one is active. Pretty printing (debug mode) and values orjson
+    rejects go through stdlib json.
+    """
+
+    default = staticmethod(_iso_default)
+
+    def __init__(self, app):
+        super().__init__(app)
+        backend = app.config.get('JSON_BACKEND', 'auto')
+        if backend == 'orjson' and orjson is None:
+            raise RuntimeError('JSON_BACKEND=orjson but orjson is not installed')
+        self.backend = 'orjson' if orjson is not None and backend in ('auto', 'orjson') else 'stdlib'
+        self._options = orjson.OPT_SORT_KEYS if self.sort_keys and orjson is not None else 0
+
+    def dumps_bytes(self, obj):
+        if self.backend == 'orjson':
+            try:
+                return orjson.dumps(obj, default=_iso_default, option=self._options)
+            except TypeError:
+                pass
+        return super().dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+    def dumps(self, obj, **kwargs):
+        if self.backend == 'orjson' and not kwargs:
+            return self.dumps_bytes(obj).decode()
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.backend == 'orjson' and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+
+@lru_cache(maxsize=256)
+def _compile(model, fields, relations):
+    relations, namespace, items = dict(relations), {}, []
+    for index, field in enumerate(fields):
+        if not field.isidentifier():
+            raise ValueError(f'Invalid field name: {field!r}')
+        if field in relations:
+            namespace[f'_r{index}'] = relations[field]
+            items.append(f"{field!r}: [_r{index}(x) for x in o.{field}]")
+        else:
+            items.append(f"{field!r}: o.{field}")
+    fn = eval(f"lambda o: {{{', '.join(items)}}}", namespace)
+    fn.__name__ = fn.__qualname__ = f'{model.__name__}_to_dict'
+    return fn
+
+def row_serializer(model, fields, relations=None):
+    """A function turning a ``model`` row into a dict of ``fields``.
+
+    The function is generated once per (model, fields) as a single dict
+    display, which avoids per-field lookups and calls at request time. Dates
+    are left as ``date`` objects for the JSON provider to encode.
+    ``relations`` maps list relationships to the serializer of their items.
+    """
+    relations = tuple(sorted((k, v) for k, v in (relations or {}).items() if k in fields))
+    return _compile(model, tuple(fields), relations)
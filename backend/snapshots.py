@@ -0,0 +1,260 @@
+import fcntl
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from cache import CachedResponse, on_commit, response_cache
+from database import replica_router
+
+MAGIC = b'PSNAP1\n'
+LENGTH = struct.Struct('<I')
+# generations file: last commit (unix time, double) followed by one counter per slot
+SLOTS = 256
+GENERATIONS_SIZE = 8 + SLOTS * 8
+ENCODINGS = ('gzip', 'br')
+
+
+def _slot(table):
+    return 8 + (zlib.crc32(table.encode()) % SLOTS) * 8  # collisions only cost an extra invalidation
+
+def _map(path):
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def code_fingerprint(database_uri):
+    """Digest of the backend modules and the database, so a deploy that may
+    change response formats starts a new snapshot namespace instead of
+    serving old bytes, and two databases never share snapshots."""
+    digest = hashlib.sha256(database_uri.encode())
+    backend = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(backend, '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class SnapshotStore:
+    """Response cache entries shared by every worker through files.
+
+    Each cached public response is also written (atomically) to
+    ``SNAPSHOT_DIR`` and memory-mapped, so workers share one page-cache copy
+    of the bytes instead of holding their own, and a worker that starts
+    after a restart or scale-up finds them already rendered. Compressed
+    forms are stored next to it as the compressor produces them.
+
+    Table versions live in a small memory-mapped ``generations`` file that
+    every admin commit bumps under a file lock. The response cache keys on
+    these shared generations, so a write in one worker invalidates the
+    entries (and ETags) of all of them. Snapshot names include a digest of
+    the backend code, so a deploy never serves bytes rendered by older
+    code; ``flask deploy`` clears the store after migrating and re-renders
+    the public routes. The oldest files are removed once there are more
+    than ``SNAPSHOT_MAX_FILES``.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._fd = None
+        self._generations = None
+        self.enabled = False
+        self.directory = None
+        self.namespace = ''
+        self.max_files = 4096
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.removed = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('SNAPSHOT_ENABLED', True)
+        app.extensions['snapshots'] = self
+        if not self.enabled:
+            response_cache.shared = replica_router.commit_clock = None
+            return
+        self.directory = app.config.get('SNAPSHOT_DIR') or os.path.join(os.path.dirname(app.config['UPLOAD_FOLDER']), 'snapshots')
+        self.namespace = app.config.get('SNAPSHOT_NAMESPACE') or code_fingerprint(app.config['SQLALCHEMY_DATABASE_URI'])
+        self.max_files = app.config.get('SNAPSHOT_MAX_FILES', 4096)
+        os.makedirs(self.directory, exist_ok=True)
+        self._open_generations()
+        response_cache.shared = self
+        replica_router.commit_clock = self.last_commit
+
+    # ---------- generations ----------
+
+    def _open_generations(self):
+        # lockf locks belong to the process, so the descriptor inherited by
+        # forked gunicorn workers still excludes the other workers
+        fd = os.open(os.path.join(self.directory, 'generations'), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.lockf(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < GENERATIONS_SIZE:
+                os.ftruncate(fd, GENERATIONS_SIZE)
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+        self._fd, self._generations = fd, mmap.mmap(fd, GENERATIONS_SIZE)
+
+    def generations(self, tables):
+        return tuple(struct.unpack_from('<Q', self._generations, _slot(t))[0] for t in tables)
+
+    def last_commit(self):
+        return struct.unpack_from('<d', self._generations, 0)[0]
+
+    def bump(self, tables=None):
+        """Advance the generation of ``tables`` (every table when None)."""
+        offsets = range(8, GENERATIONS_SIZE, 8) if tables is None else {_slot(t) for t in tables}
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                for offset in offsets:
+                    struct.pack_into('<Q', self._generations, offset, struct.unpack_from('<Q', self._generations, offset)[0] + 1)
+                struct.pack_into('<d', self._generations, 0, time.time())
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    # ---------- snapshots ----------
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(repr((self.namespace, key)).encode()).hexdigest()[:32])
+
+    def _write(self, path, parts):
+        tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            for part in parts:
+                f.write(part)
+        os.replace(tmp, path)
+        with self._lock:
+            self.writes += 1
+            sweep = self.writes % 64 == 0
+        if sweep:
+            self.sweep()
+
+    def _entry(self, path, snapshot):
+        view = memoryview(snapshot)
+        start = len(MAGIC) + LENGTH.size
+        size = LENGTH.unpack_from(view, len(MAGIC))[0]
+        meta = json.loads(bytes(view[start:start + size]))
+        entry = CachedResponse(view[start + size:], meta['status'], meta['mimetype'], [tuple(h) for h in meta['headers']])
+        entry.snapshot = (self, path)
+        return entry
+
+    def load(self, key):
+        """The stored entry for ``key`` (backed by the mapped file), or None."""
+        path = self._path(key)
+        try:
+            snapshot = _map(path)
+            if response_cache.ttl and time.time() - os.stat(path).st_mtime > response_cache.ttl:
+                raise FileNotFoundError(path)
+        except (FileNotFoundError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        if snapshot[:len(MAGIC)] != MAGIC:
+            return None
+        entry = self._entry(path, snapshot)
+        for encoding in ENCODINGS:
+            try:
+                entry.encoded[encoding] = memoryview(_map(f'{path}.{encoding}'))
+            except (FileNotFoundError, ValueError):
+                pass
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def save(self, key, entry):
+        """Store ``entry`` and return it backed by the shared mapping."""
+        path = self._path(key)
+        meta = json.dumps({'status': entry.status, 'mimetype': entry.mimetype, 'headers': list(entry.headers)}).encode()
+        self._write(path, (MAGIC, LENGTH.pack(len(meta)), meta, entry.body))
+        return self._entry(path, _map(path))
+
+    def save_encoded(self, path, encoding, data):
+        self._write(f'{path}.{encoding}', (data,))
+        return memoryview(_map(f'{path}.{encoding}'))
+
+    def sweep(self):
+        """Remove the least recently written files beyond ``max_files``
+        (mapped ones stay readable until unmapped) and stale temp files."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name == 'generations' or not entry.is_file():
+                continue
+            modified = entry.stat().st_mtime
+            if entry.name.endswith('.tmp'):
+                if time.time() - modified > 3600:
+                    os.unlink(entry.path)
+                continue
+            files.append((modified, entry.path))
+        excess = len(files) - self.max_files
+        if excess > 0:
+            for _, path in sorted(files)[:excess + self.max_files // 4]:
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            with self._lock:
+                self.removed += excess + self.max_files // 4
+
+    def clear(self):
+        """Delete every snapshot and invalidate what workers hold in memory,
+        for changes made outside the app (migrations, manual SQL)."""
+        self.bump()
+        count = 0
+        for entry in os.scandir(self.directory):
+            if entry.name != 'generations' and entry.is_file():
+                os.unlink(entry.path)
+                count += 1
+        return count
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'writes': self.writes,
+                'removed': self.removed,
+            }
+
+
+snapshot_store = SnapshotStore()
+
+@on_commit
+def _bump_generations(tables):
+    if snapshot_store.enabled and snapshot_store._generations is not None:
+        snapshot_store.bump(tables)
+
+
+def warm_snapshots():
+    """Render every public export path once; returns how many succeeded."""
+    from export import export_paths
+    client = current_app.test_client()
+    return sum(1 for path in export_paths() if client.get(path).status_code == 200)
+
+
+@click.group('snapshots')
+def snapshots_cli():
+    """Shared response snapshot commands."""
+
+@snapshots_cli.command('warm')
+@with_appcontext
+def warm_command():
+    """Render the public routes into the snapshot store."""
+    click.echo(f'Rendered {warm_snapshots()} response(s) into {snapshot_store.directory}')
+
+@snapshots_cli.command('clear')
+@with_appcontext
+def clear_command():
+    """Delete every stored snapshot."""
+    click.echo(f'Removed {snapshot_store.clear()} file(s)')
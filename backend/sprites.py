@@ -0,0 +1,296 @@
+import hashlib
+import io
+import math
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+import click
+from flask import current_app, g, has_app_context
+from flask.cli import with_appcontext
+from PIL import Image, ImageOps
+from sqlalchemy import select, update
+from cache import on_commit
+from images import is_raster
+from jobs import job_queue, QueueFull
+from models import db, Skill, Certification
+from static_assets import precompress
+from uploads import upload_path
+
+SVG_NS = 'http://www.w3.org/2000/svg'
+XLINK_NS = 'http://www.w3.org/1999/xlink'
+ET.register_namespace('', SVG_NS)
+ET.register_namespace('xlink', XLINK_NS)
+
+# Sprites are written to UPLOAD_FOLDER/sprites/<sha256>.<ext> and served as immutable uploads
+SPRITE_DIR = 'sprites'
+SPRITE_TABLES = {Skill.__tablename__, Certification.__tablename__}
+# Superseded sprites are kept this long for clients holding responses that still point at them
+STALE_AFTER = 24 * 3600
+
+# The sprite is inlined into pages (bypassing Angular's sanitizer), so only
+# drawing elements and presentation attributes are kept; anything else,
+# including scripts, links, animation and foreign content, is dropped.
+ALLOWED_ELEMENTS = {'g', 'defs', 'path', 'rect', 'circle', 'ellipse', 'line', 'polyline', 'polygon', 'text', 'tspan', 'textPath',
+                    'use', 'linearGradient', 'radialGradient', 'stop', 'clipPath', 'mask', 'style'}
+ALLOWED_ATTRIBUTES = {
+    'id', 'class', 'style', 'transform', 'viewBox', 'preserveAspectRatio', 'href', f'{{{XLINK_NS}}}href',
+    'd', 'points', 'x', 'y', 'x1', 'y1', 'x2', 'y2', 'cx', 'cy', 'r', 'rx', 'ry', 'fx', 'fy', 'fr', 'width', 'height', 'dx', 'dy', 'pathLength',
+    'fill', 'fill-opacity', 'fill-rule', 'stroke', 'stroke-width', 'stroke-linecap', 'stroke-linejoin', 'stroke-miterlimit',
+    'stroke-dasharray', 'stroke-dashoffset', 'stroke-opacity', 'opacity', 'color', 'display', 'visibility', 'overflow',
+    'clip-path', 'clip-rule', 'clipPathUnits', 'mask', 'maskUnits', 'maskContentUnits', 'vector-effect', 'shape-rendering', 'paint-order',
+    'offset', 'stop-color', 'stop-opacity', 'gradientUnits', 'gradientTransform', 'spreadMethod',
+    'font-family', 'font-size', 'font-style', 'font-weight', 'text-anchor', 'dominant-baseline', 'letter-spacing', 'startOffset',
+}
+DROPPED_ROOT_ATTRIBUTES = {'width', 'height', 'x', 'y', 'id', 'class'}
+TEXT_ELEMENTS = {'text', 'tspan', 'textPath', 'style'}
+# url() must point into the document; @import, other at-rules and CSS escapes (which could spell either) are refused
+UNSAFE_CSS_RE = re.compile(r'@|\\|url\(\s*(?![\'"]?\s*#)|javascript:|expression\(', re.I)
+ID_REF_RE = re.compile(r'#([A-Za-z_][\w.:-]*)')
+CLASS_REF_RE = re.compile(r'\.([A-Za-z_][\w-]*)')
+LENGTH_RE = re.compile(r'^\s*([\d.]+)\s*(px)?\s*$')
+
+
+# ========== SVG SYMBOL SPRITE ==========
+
+def _view_box(root):
+    width, height = (LENGTH_RE.match(root.get(a) or '') for a in ('width', 'height'))
+    return f'0 0 {width.group(1)} {height.group(1)}' if width and height else None
+
+def _symbol(path, symbol_id):
+    """The drawing of the SVG file at ``path`` as ``<symbol id=symbol_id>``,
+    or None when it cannot be used.
+
+    Only ``ALLOWED_ELEMENTS`` and ``ALLOWED_ATTRIBUTES`` are copied; hrefs
+    must be ``#fragment`` links, and attributes or ``<style>`` sheets whose
+    CSS could load or run anything else are dropped, as is insignificant
+    whitespace. Ids and class names are prefixed with ``symbol_id`` (along
+    with ``url(#..)``, ``href`` and ``<style>`` references to them) so icons
+    cannot clash once they share a document.
+    """
+    try:
+        root = ET.parse(path).getroot()
+    except (ET.ParseError, OSError):
+        return None
+    view_box = root.get('viewBox') or _view_box(root)
+    if root.tag != f'{{{SVG_NS}}}svg' or not view_box:
+        return None
+    ids = {el.get('id') for el in root.iter() if el.get('id')}
+    classes = {c for el in root.iter() for c in (el.get('class') or '').split()}
+
+    def refs(value):
+        value = ID_REF_RE.sub(lambda m: f'#{symbol_id}-{m.group(1)}' if m.group(1) in ids else m.group(0), value)
+        return CLASS_REF_RE.sub(lambda m: f'.{symbol_id}-{m.group(1)}' if m.group(1) in classes else m.group(0), value)
+
+    def attributes(el, dropped=()):
+        kept = {}
+        for name, value in el.attrib.items():
+            if name not in ALLOWED_ATTRIBUTES or name in dropped or UNSAFE_CSS_RE.search(value):
+                continue
+            if name.endswith('href') and not ID_REF_RE.fullmatch(value.strip()):
+                continue
+            if name == 'id':
+                value = f'{symbol_id}-{value}'
+            elif name == 'class':
+                value = ' '.join(f'{symbol_id}-{c}' for c in value.split())
+            else:
+                value = refs(value)
+            kept[name] = value
+        return kept
+
+    def copy(el, parent, keep_space):
+        local = el.tag.rpartition('}')[2]
+        if not el.tag.startswith(f'{{{SVG_NS}}}') or local not in ALLOWED_ELEMENTS:
+            return None
+        if local == 'style' and (len(el) or UNSAFE_CSS_RE.search(el.text or '')):
+            return None
+        node = ET.SubElement(parent, el.tag, attributes(el))
+        keep = keep_space or local in TEXT_ELEMENTS
+        node.text = el.text if keep else (el.text or '').strip() or None
+        if local == 'style' and node.text:
+            node.text = refs(node.text)
+        for child in el:
+            copied = copy(child, node, keep)
+            if copied is not None and keep:
+                copied.tail = child.tail
+        return node
+
+    symbol = ET.Element(f'{{{SVG_NS}}}symbol', {**attributes(root, DROPPED_ROOT_ATTRIBUTES), 'id': symbol_id, 'viewBox': view_box})
+    for child in root:
+        copy(child, symbol, False)
+    return symbol
+
+def build_icon_sprite(icons):
+    """Combine SVG files into one minified ``<svg>`` of ``<symbol>`` elements.
+
+    ``icons`` is a list of ``(symbol id, path)``. Returns the sprite and the
+    ids that made it in; files that are not usable SVG are left out.
+    """
+    sprite = ET.Element(f'{{{SVG_NS}}}svg')
+    included = []
+    for symbol_id, path in icons:
+        symbol = _symbol(path, symbol_id)
+        if symbol is not None:
+            sprite.append(symbol)
+            included.append(symbol_id)
+    return ET.tostring(sprite), included
+
+
+# ========== RASTER BADGE ATLAS ==========
+
+def build_badge_atlas(badges, size):
+    """Pack raster images into one PNG atlas of ``size`` x ``size`` cells.
+
+    ``badges`` is a list of ``(key, path)``; each image is scaled down to fit
+    its cell, keeping its aspect ratio, and placed at the cell's top left.
+    Returns the PNG (None when nothing could be read) and
+    ``{key: (x, y, width, height)}``.
+    """
+    images = []
+    for key, path in badges:
+        try:
+            with Image.open(path) as source:
+                img = ImageOps.exif_transpose(source).convert('RGBA')
+        except (OSError, ValueError):
+            continue
+        img.thumbnail((size, size), Image.LANCZOS)
+        images.append((key, img))
+    if not images:
+        return None, {}
+
+    columns = math.ceil(math.sqrt(len(images)))
+    atlas = Image.new('RGBA', (columns * size, math.ceil(len(images) / columns) * size), (0, 0, 0, 0))
+    cells = {}
+    for i, (key, img) in enumerate(images):
+        x, y = (i % columns) * size, (i // columns) * size
+        atlas.paste(img, (x, y))
+        cells[key] = (x, y, img.width, img.height)
+    buffer = io.BytesIO()
+    atlas.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue(), cells
+
+
+# ========== REBUILD ==========
+
+def _store(folder, data, ext):
+    """Write ``data`` as ``<sha256>.<ext>`` in ``folder`` (once) and return its name."""
+    name = f'{hashlib.sha256(data).hexdigest()}.{ext}'
+    path = os.path.join(folder, name)
+    if not os.path.exists(path):
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        precompress(path)
+    return name
+
+def _prune(folder, current):
+    for entry in os.scandir(folder):
+        if entry.is_file() and entry.name.split('.', 1)[0] not in current and time.time() - entry.stat().st_mtime > STALE_AFTER:
+            os.unlink(entry.path)
+
+def rebuild_sprites():
+    """Rebuild the skill icon sprite and the certification badge atlas.
+
+    Local SVG icons (``Skill.icon``) become ``<symbol>`` elements of one
+    sprite and local raster badges (``Certification.badge_image``) cells of
+    one PNG atlas; rows sharing a file share its symbol or cell. Rows whose
+    ``icon_sprite`` / ``badge_sprite`` changed are updated (with
+    ``updated_at``, so ETags move) in one commit; rows without a usable file
+    get None. Must run in an app context. Returns counts.
+    """
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    folder = os.path.join(upload_folder, SPRITE_DIR)
+    os.makedirs(folder, exist_ok=True)
+    prefix = f'/uploads/{SPRITE_DIR}/'
+    skills = db.session.execute(select(Skill.id, Skill.icon, Skill.icon_sprite).order_by(Skill.id)).all()
+    certifications = db.session.execute(select(Certification.id, Certification.badge_image, Certification.badge_sprite).order_by(Certification.id)).all()
+
+    symbols = {}  # icon path -> symbol id
+    for id, icon, _ in skills:
+        path = upload_path(upload_folder, icon)
+        if path and path.lower().endswith('.svg'):
+            symbols.setdefault(path, f'skill-{id}')
+    svg, included = build_icon_sprite([(symbol_id, path) for path, symbol_id in symbols.items()])
+    sprite = _store(folder, svg, 'svg') if included else None
+    included = set(included)
+
+    badges = {}  # badge path -> first certification id
+    for id, badge, _ in certifications:
+        path = upload_path(upload_folder, badge)
+        if path and is_raster(path):
+            badges.setdefault(path, id)
+    png, cells = build_badge_atlas([(id, path) for path, id in badges.items()], current_app.config['SPRITE_BADGE_SIZE'])
+    atlas = _store(folder, png, 'png') if png else None
+
+    now = datetime.utcnow()
+    skill_rows, certification_rows = [], []
+    for id, icon, current in skills:
+        symbol_id = symbols.get(upload_path(upload_folder, icon))
+        fragment = f'{prefix}{sprite}#{symbol_id}' if symbol_id in included else None
+        if fragment != current:
+            skill_rows.append({'id': id, 'icon_sprite': fragment, 'updated_at': now})
+    for id, badge, current in certifications:
+        cell = cells.get(badges.get(upload_path(upload_folder, badge)))
+        fragment = f"{prefix}{atlas}#xywh={','.join(map(str, cell))}" if cell else None
+        if fragment != current:
+            certification_rows.append({'id': id, 'badge_sprite': fragment, 'updated_at': now})
+    if skill_rows:
+        db.session.execute(update(Skill), skill_rows)
+    if certification_rows:
+        db.session.execute(update(Certification), certification_rows)
+    if skill_rows or certification_rows:
+        db.session.commit()
+
+    _prune(folder, {name.split('.', 1)[0] for name in (sprite, atlas) if name})
+    return {'icons': len(included), 'badges': len(cells), 'updated': len(skill_rows) + len(certification_rows)}
+
+
+@on_commit
+def _schedule_rebuild(tables):
+    """Rebuild the sprites on the job queue after skills or certifications
+    change; a burst of commits collapses into one rebuild while a previous
+    one is still waiting to start. The rebuild's own commit schedules one
+    more run, which finds nothing to update.
+
+    With ``JOB_ASYNC`` disabled the job would run inline, committing from
+    inside this hook; it is deferred to the app context's teardown instead.
+    """
+    if not tables & SPRITE_TABLES or not has_app_context() or not current_app.config.get('SPRITES_ENABLED'):
+        return
+    if not job_queue.run_async:
+        g.sprites_rebuild = True
+        return
+    _submit_rebuild(current_app._get_current_object())
+
+def _submit_rebuild(app):
+    state = app.extensions.setdefault('sprites', {'job': None})
+    job = state['job']
+    if job is not None and job.status == 'queued':
+        return
+    try:
+        state['job'] = job_queue.submit('sprites', _rebuild_job, app)
+    except QueueFull:
+        app.logger.warning('Sprite rebuild skipped: job queue is full')
+
+def _run_deferred_rebuild(exc):
+    if g.pop('sprites_rebuild', False):
+        _submit_rebuild(current_app._get_current_object())
+
+def _rebuild_job(job, app):
+    with app.app_context():
+        return rebuild_sprites()
+
+def register_rebuild_hook(app):
+    """Run rebuilds deferred by inline (``JOB_ASYNC=False``) commits once
+    the app context that committed ends."""
+    app.teardown_appcontext(_run_deferred_rebuild)
+
+
+@click.command('sprites')
+@with_appcontext
+def sprites_command():
+    """Rebuild the skill icon sprite and certification badge atlas."""
+    result = rebuild_sprites()
+    click.echo(f"Sprite: {result['icons']} icon(s), atlas: {result['badges']} badge(s), {result['updated']} row(s) updated")
@@ -0,0 +1,95 @@
+import mimetypes
+import os
+import re
+import tempfile
+import click
+from flask import abort, current_app, request, send_file
+from flask.cli import with_appcontext
+from werkzeug.security import safe_join
+from compression import COMPRESSIBLE_EXTENSIONS, ENCODERS, FILE_SUFFIXES, accepted_encodings
+
+# <sha256>.<ext> originals and their <sha256>_<width>w.<ext> derivatives never change content
+VERSIONED_RE = re.compile(r'^[0-9a-f]{64}(_\d+w)?\.[a-z0-9]+$')
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def is_compressible(filename):
+    return filename.rsplit('.', 1)[-1].lower() in COMPRESSIBLE_EXTENSIONS
+
+def _write_atomic(path, data):
+    # A reader (or an interrupted build) must never see a truncated sibling
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.precompress-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def precompress(path):
+    """Write ``.gz`` (and ``.br`` when brotli is installed) siblings of a
+    compressible file, keeping only those that are actually smaller. Each is
+    written to a temporary file and renamed into place."""
+    if not is_compressible(path):
+        return []
+    with open(path, 'rb') as f:
+        data = f.read()
+    written = []
+    for encoding, encode in ENCODERS.items():
+        compressed = encode(data)
+        if len(compressed) < len(data):
+            _write_atomic(path + FILE_SUFFIXES[encoding], compressed)
+            written.append(encoding)
+    return written
+
+
+def send_upload(folder, filename):
+    """Serve a file from ``folder`` with caching suited to its name.
+
+    Content-addressed files get a one-year ``immutable`` Cache-Control;
+    anything else may be cached for ``UPLOAD_CACHE_MAX_AGE`` and is then
+    revalidated. A precompressed ``.br``/``.gz`` sibling is sent instead of
+    the original when the client accepts it. ``send_file`` answers
+    conditional (ETag/If-Modified-Since) and byte-range requests itself.
+    """
+    path = safe_join(folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    encoding = None
+    if is_compressible(filename):
+        for candidate in accepted_encodings(request):
+            if os.path.isfile(path + FILE_SUFFIXES[candidate]):
+                encoding = candidate
+                path += FILE_SUFFIXES[candidate]
+                break
+
+    versioned = VERSIONED_RE.match(os.path.basename(filename))
+    max_age = IMMUTABLE_MAX_AGE if versioned else current_app.config['UPLOAD_CACHE_MAX_AGE']
+    response = send_file(path, mimetype=mimetype, download_name=os.path.basename(filename), conditional=True, max_age=max_age)
+    response.cache_control.public = True
+    if versioned:
+        response.cache_control.immutable = True
+    if is_compressible(filename):
+        response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+@click.command('precompress')
+@with_appcontext
+def precompress_command():
+    """Write .gz/.br siblings for every compressible upload."""
+    folder = current_app.config['UPLOAD_FOLDER']
+    count = 0
+    for entry in os.scandir(folder):
+        if entry.is_file() and not entry.name.startswith('.') and is_compressible(entry.name):
+            if precompress(entry.path):
+                count += 1
+    click.echo(f"Precompressed {count} file(s)")
@@ -0,0 +1,114 @@
+import json
+from datetime import datetime
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from models import db, Project, ProjectTechnology, Skill, Technology
+
+
+def parse_technologies(value):
+    """Technology names from a list, a JSON list string or a comma-separated
+    string; whitespace is collapsed and case-insensitive duplicates dropped."""
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            value = json.loads(value) if value.startswith('[') else value.split(',')
+        except ValueError:
+            value = value.strip('[]').split(',')
+    names, seen = [], set()
+    for name in value or []:
+        name = ' '.join(str(name).strip().strip('"\'').split())
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+def slugify(name):
+    return name.lower()
+
+def parse_tech_filter(value):
+    return [slugify(n) for n in parse_technologies(value or '')]
+
+
+def technologies_for(names):
+    """``{slug: Technology}`` for ``names``, creating the missing ones and
+    linking each to the Skill with the same (case-insensitive) name."""
+    slugs = [slugify(n) for n in names]
+    if not slugs:
+        return {}
+    existing = {t.slug: t for t in Technology.query.filter(Technology.slug.in_(slugs))}
+    name = func.lower(Skill.name)
+    skills = dict(db.session.execute(select(name, func.min(Skill.id)).where(name.in_(slugs)).group_by(name)).all())
+    for name, slug in zip(names, slugs):
+        technology = existing.get(slug)
+        if technology is None:
+            technology = existing[slug] = _create_technology(slug, name)
+        if technology.skill_id != skills.get(slug):
+            technology.skill_id = skills.get(slug)
+    return existing
+
+def _create_technology(slug, name):
+    """Insert a Technology in a savepoint; when a concurrent request created
+    the same slug first, roll back to the savepoint and use its row."""
+    technology = Technology(slug=slug, name=name)
+    try:
+        with db.session.begin_nested():
+            db.session.add(technology)
+    except IntegrityError:
+        technology = Technology.query.filter_by(slug=slug).one()
+    return technology
+
+def link_skills(exclude=()):
+    """Re-point every Technology at the Skill of the same name (None when
+    there is none) after skills are created, renamed or deleted. Skills in
+    ``exclude`` are about to be deleted and no longer count."""
+    match = select(func.min(Skill.id)).where(func.lower(Skill.name) == Technology.slug)
+    if exclude:
+        match = match.where(Skill.id.not_in(exclude))
+    match = match.scalar_subquery()
+    db.session.execute(update(Technology)
+                       .where(Technology.skill_id.is_distinct_from(match))
+                       .values(skill_id=match, updated_at=datetime.utcnow())
+                       .execution_options(synchronize_session='fetch'))
+
+def set_project_technologies(project, value):
+    """Store ``value`` on ``project`` and replace its tags to match."""
+    names = parse_technologies(value)
+    technologies = technologies_for(names)
+    project.technologies = value if isinstance(value, str) or value is None else ', '.join(names)
+    current = {tag.technology.slug: tag for tag in project.tags}
+    tags = []
+    for position, name in enumerate(names):
+        tag = current.get(slugify(name)) or ProjectTechnology(technology=technologies[slugify(name)])
+        tag.position = position
+        tags.append(tag)
+    project.tags = tags
+
+def sync_project_technologies(ids):
+    """Re-derive the tags of the given projects from their ``technologies``
+    column (used after bulk writes, which bypass the ORM)."""
+    for project in Project.query.filter(Project.id.in_(ids)).populate_existing():
+        set_project_technologies(project, project.technologies)
+    db.session.flush()
+
+
+def tagged_with(slugs):
+    """Ids of projects tagged with every one of ``slugs`` (index-only)."""
+    return (select(ProjectTechnology.project_id)
+            .join(Technology, Technology.id == ProjectTechnology.technology_id)
+            .where(Technology.slug.in_(slugs))
+            .group_by(ProjectTechnology.project_id)
+            .having(func.count() == len(set(slugs))))
+
+def filter_projects(query, slugs):
+    return query.filter(Project.id.in_(tagged_with(slugs))) if slugs else query
+
+def technology_facets(slugs=()):
+    """Per technology, how many projects matching ``slugs`` also carry it."""
+    count = func.count(ProjectTechnology.project_id)
+    statement = (select(Technology.slug, Technology.name, Technology.skill_id, count)
+                 .join(ProjectTechnology, ProjectTechnology.technology_id == Technology.id)
+                 .group_by(Technology.id)
+                 .order_by(count.desc(), Technology.slug))
+    if slugs:
+        statement = statement.where(ProjectTechnology.project_id.in_(tagged_with(slugs)))
+    return [{'slug': slug, 'name': name, 'skill_id': skill_id, 'count': n} for slug, name, skill_id, n in db.session.execute(statement)]
@@ -0,0 +1,36 @@
+import os
+import sys
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from config import Config  # noqa: E402
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Build an app on a fresh SQLite database under ``tmp_path``."""
+    from app import create_app
+
+    def make(**overrides):
+        settings = {
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+            'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+            'SNAPSHOT_DIR': str(tmp_path / 'snapshots'),
+            'ADMIN_PASSWORD': 'test',
+            'JOB_ASYNC': False,
+            'TESTING': True,
+            **overrides,
+        }
+        os.makedirs(settings['UPLOAD_FOLDER'], exist_ok=True)
+        return create_app(type('TestConfig', (Config,), settings))
+    return make
+
+
+@pytest.fixture
+def admin_headers():
+    def headers(client):
+        token = client.post('/api/auth/login', json={'password': 'test'}).get_json()['token']
+        return {'Authorization': f'Bearer {token}'}
+    return headers
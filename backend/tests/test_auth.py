@@ -0,0 +1,36 @@
+from unittest.mock import patch
+import jwt
+import pytest
+from auth import token_cache
+from config import ProductionConfig
+
+
+@pytest.mark.parametrize('body', [{}, {'password': ''}, {'password': None}, [], 'x'])
+def test_login_needs_the_password(make_app, body):
+    client = make_app().test_client()
+    assert client.post('/api/auth/login', json=body).status_code == 401
+    assert client.post('/api/auth/login', json={'password': 'test'}).status_code == 200
+
+
+@pytest.mark.parametrize('settings', [{'ADMIN_PASSWORD': None, 'SECRET_KEY': 'k'}, {'ADMIN_PASSWORD': 'p', 'SECRET_KEY': None},
+                                      {'ADMIN_PASSWORD': 'admin123', 'SECRET_KEY': 'k'}])
+def test_production_refuses_default_secrets(tmp_path, settings):
+    from app import create_app
+    config = type('Config', (ProductionConfig,), {'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}", 'UPLOAD_FOLDER': str(tmp_path), **settings})
+    with pytest.raises(RuntimeError, match='must be set'):
+        create_app(config)
+
+
+def test_verified_tokens_are_cached_until_revoked(make_app, admin_headers):
+    client = make_app().test_client()
+    headers = admin_headers(client)
+    with patch('auth.jwt.decode', wraps=jwt.decode) as decode:
+        for _ in range(3):
+            assert client.get('/api/kpis/all', headers=headers).status_code == 200
+    assert decode.call_count == 1
+
+    assert client.post('/api/auth/logout', headers=headers).status_code == 200
+    assert client.get('/api/kpis/all', headers=headers).status_code == 401
+    token_cache.clear()  # as in another worker: the revocation is read from the database
+    assert client.get('/api/kpis/all', headers=headers).status_code == 401
+    assert client.get('/api/kpis/all', headers=admin_headers(client)).status_code == 200
@@ -0,0 +1,23 @@
+import pytest
+from models import db, Skill
+
+
+@pytest.mark.parametrize('data', [['name'], 'name', 3])
+def test_non_object_data_is_a_per_operation_error(make_app, admin_headers, data):
+    client = make_app().test_client()
+    response = client.post('/api/skills/batch', json=[{'op': 'create', 'data': {'name': 'Go'}}, {'op': 'create', 'data': data}], headers=admin_headers(client))
+    assert response.status_code == 400
+    assert [r['status'] for r in response.get_json()['results']] == ['skipped', 'error']
+    assert response.get_json()['results'][1]['error'] == '"data" must be an object'
+
+
+def test_operations_on_a_row_deleted_earlier_are_rejected(make_app, admin_headers):
+    app = make_app()
+    client = app.test_client()
+    headers = admin_headers(client)
+    id = client.post('/api/skills', json={'name': 'Go'}, headers=headers).get_json()['id']
+    response = client.post('/api/skills/batch', json=[{'op': 'delete', 'id': id}, {'op': 'update', 'id': id, 'data': {'name': 'Rust'}}], headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['results'][1] == {'index': 1, 'status': 'error', 'error': 'Deleted by operation 0'}
+    with app.app_context():
+        assert db.session.get(Skill, id).name == 'Go'
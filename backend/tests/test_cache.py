@@ -0,0 +1,22 @@
+from sqlalchemy import event
+from cache import response_cache
+from models import db
+
+
+def test_reads_are_cached_until_a_write(make_app, admin_headers):
+    app = make_app(SNAPSHOT_ENABLED=False)
+    client = app.test_client()
+    headers = admin_headers(client)
+    client.post('/api/skills', json={'name': 'Python'}, headers=headers)
+    queries = []
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', lambda *args: queries.append(args[2]))
+
+    first = client.get('/api/skills')
+    hits, filled = response_cache.hits, len(queries)
+    second = client.get('/api/skills')
+    assert second.data == first.data and second.headers['Server-Timing'].endswith('cache;desc=hit')
+    assert response_cache.hits == hits + 1 and len(queries) == filled
+
+    client.post('/api/skills', json={'name': 'Flask'}, headers=headers)
+    assert [s['name'] for s in client.get('/api/skills').get_json()] == ['Python', 'Flask']
@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from models import db, Change
+
+
+def log(app, ages):
+    with app.app_context():
+        now = datetime.utcnow()
+        db.session.add_all([Change(table_name='skills', row_id=i, op='update', created_at=now - timedelta(seconds=age)) for i, age in enumerate(ages)])
+        db.session.commit()
+
+
+def test_recent_changes_are_held_back_on_server_databases(make_app, admin_headers):
+    # Entry 3 is still settling (its transaction may have committed ahead of
+    # an earlier one); entry 4 is older but comes after it and is held too
+    app = make_app(CHANGES_SETTLE_SECONDS=30)
+    log(app, [120, 60, 1, 90])
+    client = app.test_client()
+    headers = admin_headers(client)
+
+    page = client.get('/api/changes', query_string={'data': 0}, headers=headers).get_json()
+    assert [c['id'] for c in page['changes']] == [1, 2]
+    assert page['cursor'] == 2
+    assert client.get('/api/changes', query_string={'since': 'latest'}, headers=headers).get_json()['cursor'] == 2
+
+
+def test_sqlite_hands_out_changes_at_once(make_app, admin_headers):
+    app = make_app()
+    log(app, [120, 60, 1, 90])
+    client = app.test_client()
+    page = client.get('/api/changes', query_string={'data': 0}, headers=admin_headers(client)).get_json()
+    assert [c['id'] for c in page['changes']] == [1, 2, 3, 4]
+
+
+def feed(client, headers, since=0):
+    return [(c['table'], c['row_id'], c['op']) for c in client.get('/api/changes', query_string={'since': since, 'data': 0}, headers=headers).get_json()['changes']]
+
+
+def test_admin_writes_are_logged(make_app, admin_headers):
+    app = make_app()
+    client = app.test_client()
+    headers = admin_headers(client)
+    skill = client.post('/api/skills', json={'name': 'Go'}, headers=headers).get_json()['id']
+    client.put(f'/api/skills/{skill}', json={'category': 'backend'}, headers=headers)
+    client.delete(f'/api/skills/{skill}', headers=headers)
+    assert feed(client, headers) == [('skills', skill, 'create'), ('skills', skill, 'update'), ('skills', skill, 'delete')]
+
+    results = client.post('/api/batch', json=[{'resource': 'kpis', 'op': 'create', 'data': {'title': 'A', 'description': 'a', 'status': 'Planned'}},
+                                              {'resource': 'kpis', 'op': 'create', 'data': {'title': 'B', 'description': 'b', 'status': 'Planned'}}], headers=headers).get_json()['results']
+    a, b = (r['id'] for r in results)
+    client.post('/api/batch', json=[{'resource': 'kpis', 'op': 'update', 'id': a, 'data': {'status': 'Completed'}},
+                                    {'resource': 'kpis', 'op': 'delete', 'id': b}], headers=headers)
+    assert feed(client, headers, since=3) == [('kpis', a, 'create'), ('kpis', b, 'create'), ('kpis', a, 'update'), ('kpis', b, 'delete')]
+
+
+def test_cursor_expires_once_the_log_is_pruned(make_app, admin_headers):
+    app = make_app()
+    log(app, [180, 120, 60])
+    client = app.test_client()
+    headers = admin_headers(client)
+
+    def status(since):
+        return client.get('/api/changes', query_string={'since': since}, headers=headers).status_code
+
+    def prune(*ids):
+        with app.app_context():
+            db.session.execute(db.delete(Change).where(Change.id.in_(ids)))
+            db.session.commit()
+
+    assert status(1) == 200
+    prune(1, 2)
+    assert (status(0), status(1), status(2)) == (200, 410, 200)
+    prune(3)
+    assert (status(0), status(3)) == (200, 410)
@@ -0,0 +1,25 @@
+import gzip
+from compression import response_compressor
+
+
+def test_cached_responses_are_compressed_once(make_app, admin_headers):
+    client = make_app(SNAPSHOT_ENABLED=False).test_client()
+    client.post('/api/projects', json={'name': 'Site', 'description': 'A long description. ' * 200}, headers=admin_headers(client))
+    plain = client.get('/api/projects')
+    assert 'Content-Encoding' not in plain.headers
+
+    compressed, reused = response_compressor.compressed, response_compressor.reused
+    first = client.get('/api/projects', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/api/projects', headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in first.headers['Vary']
+    assert gzip.decompress(first.data) == plain.data and second.data == first.data
+    assert (response_compressor.compressed, response_compressor.reused) == (compressed + 1, reused + 1)
+
+    assert first.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+    assert client.get('/api/projects', headers={'Accept-Encoding': 'gzip', 'If-None-Match': first.headers['ETag']}).status_code == 304
+
+
+def test_small_responses_are_sent_as_is(make_app):
+    client = make_app(SNAPSHOT_ENABLED=False).test_client()
+    response = client.get('/api/skills', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.status_code == 200 and 'Content-Encoding' not in response.headers
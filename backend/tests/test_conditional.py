@@ -0,0 +1,11 @@
+def test_etags_are_per_app(make_app, admin_headers, tmp_path):
+    first = make_app(SNAPSHOT_ENABLED=False)
+    second = make_app(SNAPSHOT_ENABLED=False, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'other.db'}")
+    client = first.test_client()
+    client.post('/api/skills', json={'name': 'Python'}, headers=admin_headers(client))
+    etag = client.get('/api/skills').headers['ETag']
+
+    other = second.test_client()
+    assert other.get('/api/skills').headers['ETag'] != etag
+    assert other.get('/api/skills', headers={'If-None-Match': etag}).status_code == 200
+
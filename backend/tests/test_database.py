@@ -0,0 +1,20 @@
+from config import Config
+from database import engine_options
+from models import db
+
+
+def test_sqlite_connections_use_wal_and_pragmas(make_app):
+    app = make_app(SQLITE_CACHE_SIZE=-2048, SQLITE_BUSY_TIMEOUT=1500)
+    with app.app_context():
+        pragma = lambda name: db.session.execute(db.text(f'PRAGMA {name}')).scalar()
+        assert pragma('journal_mode') == 'wal'
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('cache_size') == -2048
+        assert pragma('busy_timeout') == 1500
+
+
+def test_server_databases_get_a_pool():
+    config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+    options = engine_options({**config, 'SQLALCHEMY_DATABASE_URI': 'postgresql://db/portfolio'})
+    assert options == {'pool_size': Config.DB_POOL_SIZE, 'max_overflow': Config.DB_MAX_OVERFLOW, 'pool_timeout': Config.DB_POOL_TIMEOUT,
+                       'pool_recycle': Config.DB_POOL_RECYCLE, 'pool_pre_ping': True}
@@ -0,0 +1,58 @@
+from datetime import date
+import pytest
+from sqlalchemy import event
+from cache import response_cache
+from models import db, WorkExperience, ExperienceSkill
+
+
+def seed_experiences(count, skills_each=5):
+    for i in range(count):
+        experience = WorkExperience(company=f'Company {i}', role='Engineer', start_date=date(2020, 1, 1), order=i)
+        experience.skills_acquired = [ExperienceSkill(skill_name=f'Skill {j}', explanation='...', order=skills_each - j) for j in range(skills_each)]
+        db.session.add(experience)
+    db.session.commit()
+
+
+def count_selects(app, fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    return statements, result
+
+
+@pytest.mark.parametrize('count', [3, 200])
+def test_experience_timeline_query_count_is_constant(make_app, count):
+    app = make_app(SNAPSHOT_ENABLED=False)
+    with app.app_context():
+        seed_experiences(count)
+    client = app.test_client()
+    # Prime the ETag stamp, then drop the cached body so only the view's own queries run
+    assert client.get('/api/experience').status_code == 200
+    response_cache.clear()
+
+    statements, response = count_selects(app, lambda: client.get('/api/experience'))
+
+    assert response.status_code == 200
+    experiences = response.get_json()
+    assert len(experiences) == count
+    assert all(len(e['skills_acquired']) == 5 for e in experiences)
+    assert len(statements) <= 2, statements
+
+
+def test_experience_skills_are_ordered_by_the_database(make_app):
+    app = make_app(SNAPSHOT_ENABLED=False)
+    with app.app_context():
+        seed_experiences(2)
+    response = app.test_client().get('/api/experience/1')
+    orders = [s['order'] for s in response.get_json()['skills_acquired']]
+    assert orders == sorted(orders)
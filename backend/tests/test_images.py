@@ -0,0 +1,25 @@
+import os
+import pytest
+from PIL import Image
+from images import build_variants
+
+
+def test_interrupted_encode_leaves_no_partial_variant(tmp_path, monkeypatch):
+    source = tmp_path / 'a.png'
+    Image.new('RGB', (400, 300), 'red').save(source)
+    save = Image.Image.save
+
+    def crash(self, fp, *args, **kwargs):
+        fp.write(b'partial')
+        raise OSError('disk full')
+
+    monkeypatch.setattr(Image.Image, 'save', crash)
+    with pytest.raises(OSError):
+        build_variants(str(source), [160], ['webp'])
+    assert sorted(os.listdir(tmp_path)) == ['a.png']
+
+    monkeypatch.setattr(Image.Image, 'save', save)
+    _, variants = build_variants(str(source), [160], ['webp'])
+    for variant in variants:
+        with Image.open(tmp_path / variant['url'].rsplit('/', 1)[1]) as img:
+            assert img.width == 160
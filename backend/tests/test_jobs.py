@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+from jobs import INTERRUPTED, Job, JobQueue
+
+
+def test_job_state_is_visible_to_other_workers(make_app):
+    app = make_app(JOB_ASYNC=False)
+    owner, other = JobQueue(app), JobQueue(app)
+
+    def work(job):
+        job.set_progress(0.5)
+        return {'ok': True}
+
+    job = owner.submit('resize', work)
+    seen = other.get(job.id)
+    assert seen is not None
+    assert seen.to_dict() == job.to_dict()
+    assert seen.status == 'done' and seen.result == {'ok': True}
+
+
+def test_unknown_or_malformed_job_ids(make_app):
+    queue = JobQueue(make_app())
+    assert queue.get('0' * 32) is None
+    assert queue.get('../config') is None
+
+
+def test_interrupted_jobs_are_reclaimed(make_app):
+    app = make_app()
+    queue = JobQueue(app)
+    dead = subprocess.Popen([sys.executable, '-c', 'pass'])
+    dead.wait()
+    crashed, expired, live = (Job(name) for name in ('crashed', 'expired', 'live'))
+    for job, pid, lease in ((crashed, dead.pid, 600), (expired, os.getpid(), -1), (live, os.getpid(), 600)):
+        job.status = 'running'
+        queue.lease = lease
+        with patch('os.getpid', return_value=pid):
+            queue._save(job)
+
+    assert JobQueue(app).reclaim() == 0  # init_app already reclaimed both
+    fresh = JobQueue(app)
+    assert fresh.get(crashed.id).status == 'failed'
+    assert fresh.get(crashed.id).error == INTERRUPTED
+    assert fresh.get(expired.id).status == 'failed'
+    assert fresh.get(live.id).status == 'running'
+
+
+def test_job_failures_are_logged(make_app, caplog):
+    queue = JobQueue(make_app(JOB_ASYNC=False))
+
+    def work(job):
+        raise ValueError('bad image')
+
+    job = queue.submit('resize', work)
+    assert job.status == 'failed' and job.error == 'ValueError: bad image'
+    assert f'Job {job.id} (resize) failed' in caplog.text
+    assert 'ValueError: bad image' in caplog.text
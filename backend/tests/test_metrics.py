@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from models import db
+
+
+def test_metrics_need_a_token(make_app, admin_headers):
+    app = make_app(METRICS_TOKEN='scrape-secret')
+    client = app.test_client()
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+    assert client.get('/metrics', headers=admin_headers(client)).status_code == 200
+
+
+def test_failed_statements_leave_no_timer_behind(make_app):
+    app = make_app()
+    with app.app_context():
+        with db.engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text('SELECT * FROM no_such_table'))
+            assert not conn.info.get('query_started')
+            assert conn.execute(text('SELECT 1')).scalar() == 1
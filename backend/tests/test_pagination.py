@@ -0,0 +1,40 @@
+from sqlalchemy import event, text
+from models import db, Skill
+
+
+def test_null_order_is_stored_as_zero_and_paged_once(make_app, admin_headers):
+    app = make_app(SNAPSHOT_ENABLED=False)
+    client = app.test_client()
+    headers = admin_headers(client)
+    for i in range(10):
+        client.post('/api/skills', json={'name': f'Skill {i}', 'order': None if i % 3 == 0 else i % 4}, headers=headers)
+    client.post('/api/skills/batch', json=[{'op': 'update', 'id': 2, 'data': {'order': None}}], headers=headers)
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count()).where(Skill.order == 0)) == 7  # 4 nulls, 2 zeros, 1 null batch update
+
+    seen, cursor = [], None
+    while True:
+        response = client.get('/api/skills', query_string={'limit': 3, 'fields': 'id', **({'cursor': cursor} if cursor else {})})
+        seen += [s['id'] for s in response.get_json()]
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+
+    assert sorted(seen) == list(range(1, 11))
+    assert len(seen) == len(set(seen))
+
+
+def test_pages_are_read_through_the_order_index(make_app):
+    app = make_app(SNAPSHOT_ENABLED=False, RESPONSE_CACHE_ENABLED=False)
+    client = app.test_client()
+    with app.app_context():
+        db.session.add_all([Skill(name=f'Skill {i}', order=i % 3) for i in range(10)])
+        db.session.commit()
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute', lambda conn, cursor, statement, parameters, context, executemany: statements.append((statement, parameters)))
+        cursor = client.get('/api/skills', query_string={'limit': 3}).headers['X-Next-Cursor']
+        client.get('/api/skills', query_string={'limit': 3, 'cursor': cursor})
+        statement, parameters = next((s, p) for s, p in statements if 'FROM skills' in s and 'LIMIT' in s and '>' in s)
+        with db.engine.connect() as conn:
+            plan = ' '.join(row[-1] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters))
+    assert 'ix_skills_order_id' in plan and 'TEMP B-TREE' not in plan
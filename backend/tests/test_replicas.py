@@ -0,0 +1,42 @@
+import shutil
+from sqlalchemy import text
+from models import db, Skill
+
+
+def make_replicated(make_app, tmp_path, **overrides):
+    """An app on ``test.db`` with a replica copy taken after one skill was added;
+    a second skill is only on the primary."""
+    replica = tmp_path / 'replica.db'
+    app = make_app(DATABASE_REPLICA_URLS=[f'sqlite:///{replica}'], DATABASE_REPLICA_STICKY=0, **overrides)
+    with app.app_context():
+        db.session.add(Skill(name='On both'))
+        db.session.commit()
+        db.session.execute(text('PRAGMA wal_checkpoint(TRUNCATE)'))
+        shutil.copy(tmp_path / 'test.db', replica)
+        db.session.add(Skill(name='Primary only'))
+        db.session.commit()
+    return app
+
+
+def names(response):
+    return [s['name'] for s in response.get_json()]
+
+
+def test_public_reads_go_to_the_replica(make_app, tmp_path, admin_headers):
+    app = make_replicated(make_app, tmp_path, RESPONSE_CACHE_ENABLED=False)
+    client = app.test_client()
+    assert names(client.get('/api/skills')) == ['On both']
+    assert app.extensions['replica_router'].stats()['replica_reads'] > 0
+    # Writes stick the next reads of this worker to the primary
+    client.post('/api/skills', json={'name': 'Written'}, headers=admin_headers(client))
+    app.extensions['replica_router'].sticky = 60
+    assert names(client.get('/api/skills')) == ['On both', 'Primary only', 'Written']
+
+
+def test_cached_responses_are_built_from_the_primary(make_app, tmp_path):
+    app = make_replicated(make_app, tmp_path)
+    client = app.test_client()
+    first = client.get('/api/skills')
+    assert names(first) == ['On both', 'Primary only']
+    assert names(client.get('/api/skills')) == ['On both', 'Primary only']
+    assert client.get('/api/skills', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
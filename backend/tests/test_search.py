@@ -0,0 +1,33 @@
+from datetime import date
+import pytest
+from models import db, ExperienceSkill, WorkExperience
+
+
+@pytest.mark.parametrize('backend', ['fts5', 'memory'])
+def test_search_ranks_and_follows_writes(make_app, admin_headers, backend):
+    app = make_app(SEARCH_BACKEND=backend, SNAPSHOT_ENABLED=False)
+    client = app.test_client()
+    headers = admin_headers(client)
+    client.post('/api/projects', json={'name': 'Python API', 'description': 'A <Flask> service', 'technologies': 'Python'}, headers=headers)
+    client.post('/api/projects', json={'name': 'Site', 'description': 'Static pages, some python scripts'}, headers=headers)
+    with app.app_context():
+        db.session.add(WorkExperience(company='Acme', role='Dev', start_date=date(2021, 3, 1),
+                                      skills_acquired=[ExperienceSkill(skill_name='Pythonic code', explanation='Reviews')]))
+        db.session.commit()
+
+    results = {r['title']: r for r in client.get('/api/search?q=pyth').get_json()['results']}
+    # Title matches outrank body matches
+    assert list(results)[2] == 'Site' and '<mark>python</mark>' in results['Site']['snippet']
+    assert results['<mark>Python</mark> API']['type'] == 'project' and '&lt;Flask&gt;' in results['<mark>Python</mark> API']['snippet']
+    assert results['<mark>Pythonic</mark> code']['type'] == 'experience_skill' and results['<mark>Pythonic</mark> code']['experience_id'] == 1
+    assert [r['id'] for r in client.get('/api/search?q=python+flask&type=project').get_json()['results']] == [1]
+
+    client.delete('/api/projects/1', headers=headers)
+    assert [r['title'] for r in client.get('/api/search?q=pyth&type=project').get_json()['results']] == ['Site']
+
+
+def test_search_rejects_bad_queries(make_app):
+    client = make_app().test_client()
+    assert client.get('/api/search').status_code == 400
+    assert client.get('/api/search?q=x&type=blog').status_code == 400
+    assert client.get('/api/search?q=x&limit=many').status_code == 400
@@ -0,0 +1,32 @@
+from datetime import date
+from models import db, Project, WorkExperience
+from seed import seed_synthetic
+
+SIZES = {'social_links': 2, 'skills': 5, 'services': 2, 'certifications': 3, 'experiences': 4, 'skills_per_experience': 3,
+         'projects': 6, 'technologies_per_project': 2, 'kpis': 4}
+
+
+def test_seeded_children_belong_to_their_parents(make_app):
+    app = make_app()
+    with app.app_context():
+        # Existing rows offset the ids the seeder gets back
+        db.session.add(WorkExperience(company='Kept', role='Dev', start_date=date(2020, 1, 1)))
+        db.session.add(Project(name='Kept', description='x'))
+        db.session.commit()
+
+        counts = seed_synthetic(SIZES, seed=1)
+        assert counts['work_experience'] == 5 and counts['experience_skills'] == 12 and counts['projects'] == 7
+        for experience in WorkExperience.query:
+            assert len(experience.skills_acquired) == (0 if experience.company == 'Kept' else 3)
+        for project in Project.query.filter(Project.name != 'Kept'):
+            assert ', '.join(tag.technology.name for tag in project.tags) == project.technologies
+
+
+def test_seed_command_refuses_to_mix_with_content(make_app):
+    app = make_app()
+    runner = app.test_cli_runner()
+    assert runner.invoke(args=['seed', '--projects', '2', '--experiences', '1']).exit_code == 0
+    refused = runner.invoke(args=['seed', '--projects', '2', '--experiences', '1'])
+    assert refused.exit_code != 0 and '--reset' in refused.output
+    result = runner.invoke(args=['seed', '--projects', '3', '--experiences', '1', '--reset'])
+    assert result.exit_code == 0 and 'projects: 3' in result.output
@@ -0,0 +1,32 @@
+from datetime import date
+import pytest
+from models import db, ExperienceSkill, Skill, WorkExperience
+from serializers import orjson, row_serializer
+
+
+def seed(app):
+    with app.app_context():
+        db.session.add(WorkExperience(company='Acme', role='Dev', start_date=date(2021, 3, 1), summary='Ünïcode "quoted"',
+                                      skills_acquired=[ExperienceSkill(skill_name='Python', explanation='APIs', order=1)]))
+        db.session.commit()
+
+
+@pytest.mark.skipif(orjson is None, reason='orjson is not installed')
+def test_backends_write_the_same_bytes(make_app):
+    bodies = {}
+    for backend in ('orjson', 'stdlib'):
+        app = make_app(JSON_BACKEND=backend, DEBUG=False, SNAPSHOT_ENABLED=False, RESPONSE_CACHE_ENABLED=False)
+        if not bodies:
+            seed(app)
+        assert app.json.backend == backend
+        bodies[backend] = app.test_client().get('/api/experience').data
+    assert bodies['orjson'] == bodies['stdlib']
+    assert b'"start_date":"2021-03-01"' in bodies['stdlib'] and b'"end_date":null' in bodies['stdlib']
+
+
+def test_row_serializers_are_compiled_once():
+    serializer = row_serializer(Skill, ('id', 'name'))
+    assert row_serializer(Skill, ['id', 'name']) is serializer
+    assert serializer(Skill(id=1, name='Python', category='x')) == {'id': 1, 'name': 'Python'}
+    with pytest.raises(ValueError, match='Invalid field'):
+        row_serializer(Skill, ('id', '__class__.mro()'))
@@ -0,0 +1,20 @@
+import os
+
+
+def test_only_canonical_requests_are_persisted(make_app, tmp_path):
+    app = make_app()
+    client = app.test_client()
+    directory = tmp_path / 'snapshots'
+
+    def snapshots():
+        return {name for name in os.listdir(directory) if name != 'generations'}
+
+    assert client.get('/api/skills').status_code == 200
+    persisted = snapshots()
+    assert len(persisted) == 1
+
+    for i in range(5):
+        client.get('/api/skills', query_string={'junk': i})
+        client.get('/api/search', query_string={'q': f'term{i}'})
+    client.get('/api/search')
+    assert snapshots() == persisted
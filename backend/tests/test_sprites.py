@@ -0,0 +1,60 @@
+import traceback
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+import pytest
+from sprites import SVG_NS, build_icon_sprite, rebuild_sprites
+
+PAYLOADS = [
+    '<a href="#a"><set attributeName="href" to="javascript:alert(1)"/><animate attributeName="href" values="javascript:alert(2)"/></a>',
+    '<style>@import url(https://evil.example/x.css);</style>',
+    '<style>.a { fill: url(https://evil.example/x.svg#p) }</style>',
+    '<style>@\\69mport "x.css";</style>',
+    '<script>alert(3)</script>',
+    '<foreignObject><div xmlns="http://www.w3.org/1999/xhtml" onclick="alert(4)"/></foreignObject>',
+    '<path d="M0 0" onload="alert(5)" style="fill: url(//evil.example/p)"/>',
+    '<use href="javascript:alert(6)"/><use xlink:href="https://evil.example/s.svg#x"/>',
+    '<animateTransform attributeName="transform" type="rotate"/><image href="https://evil.example/i.png"/>',
+]
+
+
+def sprite(tmp_path, body):
+    path = tmp_path / 'icon.svg'
+    path.write_text(f'<svg xmlns="{SVG_NS}" xmlns:xlink="http://www.w3.org/1999/xlink" viewBox="0 0 24 24">{body}</svg>')
+    svg, included = build_icon_sprite([('skill-1', str(path))])
+    assert included == ['skill-1']
+    return svg.decode()
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+def test_unsafe_content_is_dropped(tmp_path, payload):
+    svg = sprite(tmp_path, f'{payload}<circle cx="12" cy="12" r="10"/>')
+    for marker in ('alert', 'evil.example', '<a', 'set', 'animate', 'script', 'foreignObject', 'image', 'onload', 'onclick', 'import', 'mport'):
+        assert marker not in svg
+    assert 'circle' in svg
+
+
+def test_drawing_is_kept_and_ids_are_prefixed(tmp_path):
+    svg = sprite(tmp_path, '<defs><linearGradient id="g"><stop offset="0" stop-color="#fff"/></linearGradient></defs>'
+                           '<style>.c { fill: url(#g) }</style><path id="p" class="c" d="M0 0h24"/><use href="#p" fill="url(#g)"/>')
+    symbol = ET.fromstring(svg)[0]
+    assert symbol.get('id') == 'skill-1' and symbol.get('viewBox') == '0 0 24 24'
+    assert [el.tag.rpartition('}')[2] for el in symbol.iter()] == ['symbol', 'defs', 'linearGradient', 'stop', 'style', 'path', 'use']
+    assert 'url(#skill-1-g)' in svg and 'href="#skill-1-p"' in svg and '.skill-1-c' in svg
+
+
+def test_inline_rebuild_runs_after_the_commit(make_app, admin_headers, tmp_path):
+    app = make_app(JOB_ASYNC=False, SPRITES_ENABLED=True, RESPONSE_CACHE_ENABLED=False)
+    (tmp_path / 'uploads' / 'icon.svg').write_text(f'<svg xmlns="{SVG_NS}" viewBox="0 0 24 24"><circle r="10"/></svg>')
+    client = app.test_client()
+    stacks = []
+
+    def rebuild():
+        stacks.append([frame.name for frame in traceback.extract_stack()])
+        return rebuild_sprites()
+
+    with patch('sprites.rebuild_sprites', rebuild):
+        created = client.post('/api/skills', json={'name': 'SVG', 'icon': '/uploads/icon.svg'}, headers=admin_headers(client))
+    assert created.status_code == 201
+    assert stacks and all('_invalidate_committed_tables' not in stack for stack in stacks)
+    [skill] = client.get('/api/skills').get_json()
+    assert skill['icon_sprite'].endswith('.svg#skill-1')
@@ -0,0 +1,23 @@
+import gzip
+import os
+import pytest
+import static_assets
+from static_assets import precompress
+
+
+def test_precompressed_siblings_are_complete_or_absent(tmp_path, monkeypatch):
+    path = tmp_path / 'sprite.svg'
+    path.write_text('<svg>' + '<path d="M0 0h24"/>' * 200 + '</svg>')
+
+    def interrupted(fd, *args):
+        raise OSError('disk full')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(static_assets.os, 'fdopen', interrupted)
+        with pytest.raises(OSError):
+            precompress(str(path))
+    assert os.listdir(tmp_path) == ['sprite.svg']
+
+    assert 'gzip' in precompress(str(path))
+    assert gzip.decompress((tmp_path / 'sprite.svg.gz').read_bytes()) == path.read_bytes()
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('.')]
@@ -0,0 +1,69 @@
+from datetime import datetime
+from sqlalchemy import event, func, insert
+from sqlalchemy.orm import Session
+from models import db, Project, Technology
+
+
+def skill_links(app):
+    with app.app_context():
+        return dict(db.session.execute(db.select(Technology.slug, Technology.skill_id)).all())
+
+
+def test_skill_writes_relink_technologies(make_app, admin_headers):
+    app = make_app(SNAPSHOT_ENABLED=False)
+    client = app.test_client()
+    headers = admin_headers(client)
+    client.post('/api/projects', json={'name': 'Site', 'description': 'x', 'technologies': 'Python, Flask'}, headers=headers)
+    assert skill_links(app) == {'python': None, 'flask': None}
+
+    python = client.post('/api/skills', json={'name': 'Python'}, headers=headers).get_json()['id']
+    assert skill_links(app) == {'python': python, 'flask': None}
+
+    client.put(f'/api/skills/{python}', json={'name': 'Flask'}, headers=headers)
+    assert skill_links(app) == {'python': None, 'flask': python}
+
+    client.delete(f'/api/skills/{python}', headers=headers)
+    assert skill_links(app) == {'python': None, 'flask': None}
+
+
+def test_batch_skill_writes_relink_technologies(make_app, admin_headers):
+    app = make_app(SNAPSHOT_ENABLED=False)
+    client = app.test_client()
+    headers = admin_headers(client)
+    client.post('/api/projects', json={'name': 'Site', 'description': 'x', 'technologies': 'Python, Flask'}, headers=headers)
+
+    results = client.post('/api/skills/batch', json=[{'op': 'create', 'data': {'name': 'python'}}, {'op': 'create', 'data': {'name': 'Go'}}], headers=headers).get_json()['results']
+    python, go = (r['id'] for r in results)
+    assert skill_links(app) == {'python': python, 'flask': None}
+
+    client.post('/api/skills/batch', json=[{'op': 'update', 'id': go, 'data': {'name': 'FLASK'}}], headers=headers)
+    assert skill_links(app) == {'python': python, 'flask': go}
+
+    client.post('/api/skills/batch', json=[{'op': 'delete', 'id': python}, {'op': 'delete', 'id': go}], headers=headers)
+    assert skill_links(app) == {'python': None, 'flask': None}
+
+
+def test_concurrently_created_technology_is_reused(make_app, admin_headers):
+    app = make_app(SNAPSHOT_ENABLED=False)
+    client = app.test_client()
+    headers = admin_headers(client)
+
+    raced = []  # another request inserts "python" just before this one flushes its own
+
+    def other_request_first(session, context, instances):
+        if raced or not any(isinstance(obj, Technology) for obj in session.new):
+            return
+        raced.append(True)
+        with db.engine.begin() as connection:
+            connection.execute(insert(Technology).values(slug='python', name='Python', created_at=datetime.utcnow(), updated_at=datetime.utcnow()))
+
+    event.listen(Session, 'before_flush', other_request_first)
+    try:
+        created = client.post('/api/projects', json={'name': 'Site', 'description': 'x', 'technologies': 'Python, Flask'}, headers=headers)
+    finally:
+        event.remove(Session, 'before_flush', other_request_first)
+    assert created.status_code == 201
+    with app.app_context():
+        project = db.session.get(Project, created.get_json()['id'])
+        assert [tag.technology.slug for tag in project.tags] == ['python', 'flask']
+        assert db.session.execute(db.select(func.count()).select_from(Technology)).scalar() == 2
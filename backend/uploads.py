@@ -0,0 +1,133 @@
+import hashlib
+import os
+import re
+import tempfile
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from werkzeug.security import safe_join
+from werkzeug.utils import secure_filename
+from images import build_variants, is_raster, srcset
+from static_assets import is_compressible, precompress
+from models import db, SocialLink, About, Skill, Service, Certification, Project, Contact
+
+CHUNK_SIZE = 64 * 1024
+
+# Every column that may hold an /uploads/ URL
+UPLOAD_REFERENCES = [
+    (SocialLink, 'icon'),
+    (About, 'profile_image'),
+    (Skill, 'icon'),
+    (Service, 'icon'),
+    (Certification, 'badge_image'),
+    (Certification, 'cert_image'),
+    (Project, 'image'),
+    (Contact, 'cv_url'),
+]
+
+DERIVATIVE_RE = re.compile(r'^(?P<stem>.+)_\d+w\.[a-z]+$')
+PRECOMPRESSED_RE = re.compile(r'\.(gz|br)$')
+
+
+def store_upload(file, folder):
+    """Stream ``file`` to disk while hashing it, and store it as ``<sha256><ext>``.
+
+    The upload is copied in ``CHUNK_SIZE`` pieces to a temporary file in
+    ``folder`` and atomically renamed once the digest is known, so it is
+    never held in memory. If an object with the same digest already exists
+    the temporary copy is discarded.
+
+    Returns ``(filename, created)``.
+    """
+    ext = os.path.splitext(secure_filename(file.filename))[1].lower()
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                out.write(chunk)
+        filename = f"{digest.hexdigest()}{ext}"
+        path = os.path.join(folder, filename)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            return filename, False
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+        return filename, True
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def upload_options(config):
+    """The subset of app config that upload processing needs, so jobs can
+    run outside the request/app context."""
+    return {
+        'widths': config['IMAGE_VARIANT_WIDTHS'],
+        'formats': config['IMAGE_VARIANT_FORMATS'],
+        'quality': config['IMAGE_VARIANT_QUALITY'],
+    }
+
+def process_upload(job, path, url, options):
+    """Background job body: build derivatives for a stored upload."""
+    result = {'url': url}
+    if is_raster(path):
+        info, variants = build_variants(path, options['widths'], options['formats'], options['quality'], progress=job.set_progress)
+        result.update(info or {}, variants=variants, srcset=srcset(variants))
+    elif is_compressible(path):
+        result['encodings'] = precompress(path)
+    return result
+
+
+def upload_name(url):
+    """The filename an (absolute or relative) /uploads/ URL points to, or None."""
+    if not url or '/uploads/' not in url:
+        return None
+    return url.split('/uploads/', 1)[1].split('?', 1)[0].split('#', 1)[0]
+
+def upload_path(folder, url):
+    """Path of the existing file in ``folder`` behind an /uploads/ URL, or None."""
+    name = upload_name(url)
+    path = safe_join(folder, name) if name else None
+    return path if path and os.path.isfile(path) else None
+
+def referenced_uploads():
+    """Filenames under /uploads/ that some model row points to."""
+    names = set()
+    for model, column in UPLOAD_REFERENCES:
+        for (value,) in db.session.query(getattr(model, column)).filter(getattr(model, column).like('%/uploads/%')):
+            names.add(upload_name(value))
+    return names
+
+def find_orphans(folder):
+    """Top-level files in ``folder`` that no row references, directly, as a
+    resized derivative of a referenced image or as a precompressed copy."""
+    referenced = referenced_uploads()
+    stems = {os.path.splitext(name)[0] for name in referenced}
+    orphans = []
+    for entry in os.scandir(folder):
+        name = PRECOMPRESSED_RE.sub('', entry.name)
+        if not entry.is_file() or entry.name.startswith('.') or name in referenced:
+            continue
+        match = DERIVATIVE_RE.match(name)
+        if match and match.group('stem') in stems:
+            continue
+        orphans.append(entry.name)
+    return sorted(orphans)
+
+
+uploads_cli = AppGroup('uploads', help='Manage uploaded files.')
+
+@uploads_cli.command('orphans')
+@click.option('--delete', is_flag=True, help='Remove the orphaned files.')
+def orphans_command(delete):
+    """List (or delete) uploads that no model row references."""
+    folder = current_app.config['UPLOAD_FOLDER']
+    orphans = find_orphans(folder)
+    for name in orphans:
+        click.echo(name)
+        if delete:
+            os.remove(os.path.join(folder, name))
+    click.echo(f"{len(orphans)} orphaned file(s){' deleted' if delete and orphans else ''}")
@@ -0,0 +1,12 @@
+"""Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The configuration class is picked with ``FLASK_CONFIG`` (default
+``production``).
+"""
+import os
+from app import create_app
+from config import config
+
+app = create_app(config[os.environ.get('FLASK_CONFIG', 'production')])
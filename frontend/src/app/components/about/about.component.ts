@@ -1,6 +1,7 @@
 import { Component, OnInit } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { FormsModule } from '@angular/forms';
+import { DomSanitizer, SafeHtml } from '@angular/platform-browser';
 import { PortfolioService } from '../../services/portfolio.service';
 import { About, Skill } from '../../models/portfolio.models';
 
@@ -22,8 +23,9 @@ export class AboutComponent implements OnInit {
   editSkillData: Skill = { name: '', order: 0 };
   skillIconPreview: string | null = null;
   skillIconFile: File | null = null;
+  iconSprite: SafeHtml | null = null;
 
-  constructor(private portfolioService: PortfolioService) {}
+  constructor(private portfolioService: PortfolioService, private sanitizer: DomSanitizer) {}
 
   ngOnInit(): void {
     this.loadData();
@@ -32,7 +34,22 @@ export class AboutComponent implements OnInit {
 
   loadData(): void {
     this.portfolioService.getAbout().subscribe(about => this.about = about);
-    this.portfolioService.getSkills().subscribe(skills => this.skills = skills);
+    this.portfolioService.getSkills().subscribe(skills => {
+      this.skills = skills;
+      this.loadIconSprite();
+    });
+  }
+
+  // One request for every icon: the sprite is inlined once and each skill <use>s its symbol
+  loadIconSprite(): void {
+    const sprited = this.skills.find(skill => skill.icon_sprite);
+    if (!sprited) return;
+    // Built server-side from an allowlist of drawing elements and presentation attributes (sprites.py)
+    this.portfolioService.getSprite(sprited.icon_sprite!).subscribe(svg => this.iconSprite = this.sanitizer.bypassSecurityTrustHtml(svg));
+  }
+
+  symbolRef(skill: Skill): string {
+    return '#' + skill.icon_sprite!.split('#')[1];
   }
 
   saveAbout(): void {
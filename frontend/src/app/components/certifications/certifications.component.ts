@@ -16,7 +16,8 @@ import { Certification } from '../../models/portfolio.models';
         <div class="carousel">
           <div *ngFor="let cert of certifications" class="cert-item">
             <div class="cert-card" *ngIf="editingCert !== cert.id">
-              <img *ngIf="cert.badge_image" [src]="cert.badge_image" [alt]="cert.name" class="badge" />
+              <div *ngIf="cert.badge_sprite" class="badge badge-sprite" role="img" [attr.aria-label]="cert.name" [ngStyle]="badgeStyle(cert.badge_sprite)"></div>
+              <img *ngIf="cert.badge_image && !cert.badge_sprite" [src]="cert.badge_image" [alt]="cert.name" class="badge" />
               <div *ngIf="!cert.badge_image" class="badge-placeholder">🏆</div>
               <h4>{{ cert.name }}</h4>
               <p *ngIf="cert.issuer">{{ cert.issuer }}</p>
@@ -106,6 +107,7 @@ import { Certification } from '../../models/portfolio.models';
     .cert-card.edit-mode:hover { transform: none; }
     .cert-card.edit-mode input { width: 100%; padding: $spacing-sm; margin: $spacing-xs 0; border: $border-width solid $border-color; border-radius: $border-radius; }
     .badge { width: 100%; height: 200px; object-fit: contain; margin-bottom: $spacing-md; }
+    .badge-sprite { margin: 0 auto $spacing-md; background-repeat: no-repeat; }
     .badge-placeholder { width: 100%; height: 200px; @include flex-center; font-size: 4rem; background: #f0f0f0; border-radius: $border-radius; margin-bottom: $spacing-md; }
     .cert-card h4 { margin-bottom: $spacing-sm; }
     .cert-card p { color: $text-secondary; font-size: 14px; }
@@ -150,6 +152,17 @@ export class CertificationsComponent implements OnInit {
     this.portfolioService.getCertifications().subscribe(certs => this.certifications = certs);
   }
 
+  // Every badge is a cell of one atlas image: <atlas url>#xywh=x,y,width,height
+  badgeStyle(sprite: string): Record<string, string> {
+    const [x, y, width, height] = sprite.split('#xywh=')[1].split(',');
+    return {
+      'background-image': `url(${this.portfolioService.spriteUrl(sprite)})`,
+      'background-position': `-${x}px -${y}px`,
+      'width': `${width}px`,
+      'height': `${height}px`
+    };
+  }
+
   addCert(): void {
     // Upload badge image first if provided
     if (this.badgeFile) {
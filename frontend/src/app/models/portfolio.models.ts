@@ -21,6 +21,7 @@ export interface Skill {
   name: string;
   category?: string;
   icon?: string;
+  icon_sprite?: string;  // <sprite url>#<symbol id>
   order: number;
 }
 
@@ -37,6 +38,7 @@ export interface Certification {
   name: string;
   issuer?: string;
   badge_image?: string;
+  badge_sprite?: string;  // <atlas url>#xywh=x,y,width,height
   cert_image?: string;
   issued_date?: string;
   order: number;
@@ -67,10 +69,25 @@ export interface Project {
   image?: string;
   live_url?: string;
   github_url?: string;
-  technologies?: string;
+  technologies?: string | string[];  // write: list or comma-separated; read: as entered
+  tags?: Technology[];
   order: number;
 }
 
+export interface Technology {
+  id: number;
+  slug: string;
+  name: string;
+  skill_id: number | null;
+}
+
+export interface TechnologyFacet {
+  slug: string;
+  name: string;
+  skill_id: number | null;
+  count: number;
+}
+
 export interface KPI {
   id?: number;
   title: string;
@@ -91,11 +108,66 @@ export interface Contact {
   cv_url?: string;
 }
 
+export interface Portfolio {
+  social_links?: SocialLink[];
+  about?: About;
+  skills?: Skill[];
+  services?: Service[];
+  certifications?: Certification[];
+  experience?: WorkExperience[];
+  projects?: Project[];
+  kpis?: KPI[];
+  contact?: Contact;
+}
+
+export interface SearchResult {
+  type: 'project' | 'experience' | 'experience_skill' | 'skill' | 'certification';
+  id: number;
+  title: string;    // HTML-escaped, matches wrapped in <mark>
+  snippet: string;  // HTML-escaped, matches wrapped in <mark>
+  score: number;
+  experience_id?: number;
+}
+
+export interface SearchResponse {
+  query: string;
+  results: SearchResult[];
+}
+
+export interface Change {
+  id: number;  // cursor; pass the last one seen as ?since=
+  table: string;
+  row_id: number;
+  op: 'create' | 'update' | 'delete';
+  at: string;
+  data?: any;  // current state of the row (absent for deletes, null if deleted later)
+}
+
+export interface ChangeFeed {
+  changes: Change[];
+  cursor: number;
+  has_more: boolean;
+}
+
 export interface AuthResponse {
   token: string;
   message: string;
 }
 
+export interface ImageVariant {
+  url: string;
+  width: number;
+  height: number;
+  format: string;
+}
+
 export interface UploadResponse {
   url: string;
+  job_id?: string;
+  status?: string;
+  status_url?: string;
+  width?: number;
+  height?: number;
+  variants?: ImageVariant[];
+  srcset?: { [format: string]: string };
 }
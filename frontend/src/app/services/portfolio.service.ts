@@ -1,7 +1,7 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpHeaders } from '@angular/common/http';
 import { Observable, BehaviorSubject } from 'rxjs';
-import { tap } from 'rxjs/operators';
+import { map, shareReplay, tap } from 'rxjs/operators';
 import { environment } from '../../environments/environment';
 import * as Models from '../models/portfolio.models';
 
@@ -11,6 +11,8 @@ import * as Models from '../models/portfolio.models';
 export class PortfolioService {
   private apiUrl = environment.apiUrl;
   private tokenKey = 'admin_token';
+  private sprites = new Map<string, Observable<string>>();
+  private portfolio$: Observable<Models.Portfolio> | null = null;
   
   // Admin mode state
   private adminModeSubject = new BehaviorSubject<boolean>(this.hasToken());
@@ -61,92 +63,148 @@ export class PortfolioService {
     return this.http.post<Models.UploadResponse>(`${this.apiUrl}/api/upload`, formData, { headers });
   }
 
+  // ========== SPRITES ==========
+
+  // Skill icons and certification badges point into one sprite/atlas per kind
+  spriteUrl(fragment: string): string {
+    return `${this.apiUrl}${fragment.split('#')[0]}`;
+  }
+
+  // The SVG sprite is fetched once and inlined, so <use href="#symbol"> works across origins
+  getSprite(fragment: string): Observable<string> {
+    const url = this.spriteUrl(fragment);
+    if (!this.sprites.has(url)) {
+      this.sprites.set(url, this.http.get(url, { responseType: 'text' }).pipe(shareReplay(1)));
+    }
+    return this.sprites.get(url)!;
+  }
+
+  // ========== PORTFOLIO SNAPSHOT ==========
+  
+  getPortfolio(sections?: string[]): Observable<Models.Portfolio> {
+    const query = sections && sections.length ? `?sections=${sections.join(',')}` : '';
+    return this.http.get<Models.Portfolio>(`${this.apiUrl}/api/portfolio${query}`);
+  }
+
+  // The public sections of a page load all come from one shared /api/portfolio request;
+  // admin writes drop it so the components' reloads fetch a fresh document
+  private section<K extends keyof Models.Portfolio>(name: K): Observable<NonNullable<Models.Portfolio[K]>> {
+    if (!this.portfolio$) {
+      this.portfolio$ = this.getPortfolio().pipe(shareReplay(1));
+    }
+    return this.portfolio$.pipe(map(portfolio => portfolio[name] as NonNullable<Models.Portfolio[K]>));
+  }
+
+  private write<T>(request: Observable<T>): Observable<T> {
+    return request.pipe(tap({ next: () => this.portfolio$ = null, error: () => this.portfolio$ = null }));
+  }
+
+  // ========== SEARCH ==========
+
+  search(q: string, types?: string[], limit?: number): Observable<Models.SearchResponse> {
+    const params: Record<string, string> = { q };
+    if (types && types.length) params['type'] = types.join(',');
+    if (limit) params['limit'] = String(limit);
+    return this.http.get<Models.SearchResponse>(`${this.apiUrl}/api/search`, { params });
+  }
+
+  // ========== CHANGE FEED ==========
+
+  // Admin: rows changed after `since`; with `wait` the server holds the request up to that many seconds
+  getChanges(since: number | 'latest' = 0, options: { tables?: string[]; wait?: number; limit?: number } = {}): Observable<Models.ChangeFeed> {
+    const params: Record<string, string> = { since: String(since) };
+    if (options.tables && options.tables.length) params['tables'] = options.tables.join(',');
+    if (options.wait) params['wait'] = String(options.wait);
+    if (options.limit) params['limit'] = String(options.limit);
+    return this.http.get<Models.ChangeFeed>(`${this.apiUrl}/api/changes`, { headers: this.getHeaders(), params });
+  }
+
   // ========== SOCIAL LINKS ==========
   
   getSocialLinks(): Observable<Models.SocialLink[]> {
-    return this.http.get<Models.SocialLink[]>(`${this.apiUrl}/api/social-links`);
+    return this.section('social_links');
   }
 
   createSocialLink(link: Models.SocialLink): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/social-links`, link, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/social-links`, link, { headers: this.getHeaders() }));
   }
 
   updateSocialLink(id: number, link: Models.SocialLink): Observable<any> {
-    return this.http.put(`${this.apiUrl}/api/social-links/${id}`, link, { headers: this.getHeaders() });
+    return this.write(this.http.put(`${this.apiUrl}/api/social-links/${id}`, link, { headers: this.getHeaders() }));
   }
 
   deleteSocialLink(id: number): Observable<any> {
-    return this.http.delete(`${this.apiUrl}/api/social-links/${id}`, { headers: this.getHeaders() });
+    return this.write(this.http.delete(`${this.apiUrl}/api/social-links/${id}`, { headers: this.getHeaders() }));
   }
 
   // ========== ABOUT ==========
   
   getAbout(): Observable<Models.About> {
-    return this.http.get<Models.About>(`${this.apiUrl}/api/about`);
+    return this.section('about');
   }
 
   updateAbout(about: Models.About): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/about`, about, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/about`, about, { headers: this.getHeaders() }));
   }
 
   // ========== SKILLS ==========
   
   getSkills(): Observable<Models.Skill[]> {
-    return this.http.get<Models.Skill[]>(`${this.apiUrl}/api/skills`);
+    return this.section('skills');
   }
 
   createSkill(skill: Models.Skill): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/skills`, skill, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/skills`, skill, { headers: this.getHeaders() }));
   }
 
   updateSkill(id: number, skill: Models.Skill): Observable<any> {
-    return this.http.put(`${this.apiUrl}/api/skills/${id}`, skill, { headers: this.getHeaders() });
+    return this.write(this.http.put(`${this.apiUrl}/api/skills/${id}`, skill, { headers: this.getHeaders() }));
   }
 
   deleteSkill(id: number): Observable<any> {
-    return this.http.delete(`${this.apiUrl}/api/skills/${id}`, { headers: this.getHeaders() });
+    return this.write(this.http.delete(`${this.apiUrl}/api/skills/${id}`, { headers: this.getHeaders() }));
   }
 
   // ========== SERVICES ==========
   
   getServices(): Observable<Models.Service[]> {
-    return this.http.get<Models.Service[]>(`${this.apiUrl}/api/services`);
+    return this.section('services');
   }
 
   createService(service: Models.Service): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/services`, service, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/services`, service, { headers: this.getHeaders() }));
   }
 
   updateService(id: number, service: Models.Service): Observable<any> {
-    return this.http.put(`${this.apiUrl}/api/services/${id}`, service, { headers: this.getHeaders() });
+    return this.write(this.http.put(`${this.apiUrl}/api/services/${id}`, service, { headers: this.getHeaders() }));
   }
 
   deleteService(id: number): Observable<any> {
-    return this.http.delete(`${this.apiUrl}/api/services/${id}`, { headers: this.getHeaders() });
+    return this.write(this.http.delete(`${this.apiUrl}/api/services/${id}`, { headers: this.getHeaders() }));
   }
 
   // ========== CERTIFICATIONS ==========
   
   getCertifications(): Observable<Models.Certification[]> {
-    return this.http.get<Models.Certification[]>(`${this.apiUrl}/api/certifications`);
+    return this.section('certifications');
   }
 
   createCertification(cert: Models.Certification): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/certifications`, cert, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/certifications`, cert, { headers: this.getHeaders() }));
   }
 
   updateCertification(id: number, cert: Models.Certification): Observable<any> {
-    return this.http.put(`${this.apiUrl}/api/certifications/${id}`, cert, { headers: this.getHeaders() });
+    return this.write(this.http.put(`${this.apiUrl}/api/certifications/${id}`, cert, { headers: this.getHeaders() }));
   }
 
   deleteCertification(id: number): Observable<any> {
-    return this.http.delete(`${this.apiUrl}/api/certifications/${id}`, { headers: this.getHeaders() });
+    return this.write(this.http.delete(`${this.apiUrl}/api/certifications/${id}`, { headers: this.getHeaders() }));
   }
 
   // ========== WORK EXPERIENCE ==========
   
   getExperience(): Observable<Models.WorkExperience[]> {
-    return this.http.get<Models.WorkExperience[]>(`${this.apiUrl}/api/experience`);
+    return this.section('experience');
   }
 
   getExperienceDetail(id: number): Observable<Models.WorkExperience> {
@@ -154,53 +212,61 @@ export class PortfolioService {
   }
 
   createExperience(exp: Models.WorkExperience): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/experience`, exp, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/experience`, exp, { headers: this.getHeaders() }));
   }
 
   updateExperience(id: number, exp: Models.WorkExperience): Observable<any> {
-    return this.http.put(`${this.apiUrl}/api/experience/${id}`, exp, { headers: this.getHeaders() });
+    return this.write(this.http.put(`${this.apiUrl}/api/experience/${id}`, exp, { headers: this.getHeaders() }));
   }
 
   deleteExperience(id: number): Observable<any> {
-    return this.http.delete(`${this.apiUrl}/api/experience/${id}`, { headers: this.getHeaders() });
+    return this.write(this.http.delete(`${this.apiUrl}/api/experience/${id}`, { headers: this.getHeaders() }));
   }
 
   // ========== EXPERIENCE SKILLS ==========
   
   addExperienceSkill(expId: number, skill: Models.ExperienceSkill): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/experience/${expId}/skills`, skill, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/experience/${expId}/skills`, skill, { headers: this.getHeaders() }));
   }
 
   updateExperienceSkill(id: number, skill: Models.ExperienceSkill): Observable<any> {
-    return this.http.put(`${this.apiUrl}/api/experience-skills/${id}`, skill, { headers: this.getHeaders() });
+    return this.write(this.http.put(`${this.apiUrl}/api/experience-skills/${id}`, skill, { headers: this.getHeaders() }));
   }
 
   deleteExperienceSkill(id: number): Observable<any> {
-    return this.http.delete(`${this.apiUrl}/api/experience-skills/${id}`, { headers: this.getHeaders() });
+    return this.write(this.http.delete(`${this.apiUrl}/api/experience-skills/${id}`, { headers: this.getHeaders() }));
   }
 
   // ========== PROJECTS ==========
   
-  getProjects(): Observable<Models.Project[]> {
-    return this.http.get<Models.Project[]>(`${this.apiUrl}/api/projects`);
+  getProjects(tech?: string[]): Observable<Models.Project[]> {
+    if (!tech || !tech.length) {
+      return this.section('projects');
+    }
+    return this.http.get<Models.Project[]>(`${this.apiUrl}/api/projects?tech=${encodeURIComponent(tech.join(','))}`);
+  }
+
+  getProjectFacets(tech?: string[]): Observable<{ technologies: Models.TechnologyFacet[] }> {
+    const query = tech && tech.length ? `?tech=${encodeURIComponent(tech.join(','))}` : '';
+    return this.http.get<{ technologies: Models.TechnologyFacet[] }>(`${this.apiUrl}/api/projects/facets${query}`);
   }
 
   createProject(project: Models.Project): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/projects`, project, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/projects`, project, { headers: this.getHeaders() }));
   }
 
   updateProject(id: number, project: Models.Project): Observable<any> {
-    return this.http.put(`${this.apiUrl}/api/projects/${id}`, project, { headers: this.getHeaders() });
+    return this.write(this.http.put(`${this.apiUrl}/api/projects/${id}`, project, { headers: this.getHeaders() }));
   }
 
   deleteProject(id: number): Observable<any> {
-    return this.http.delete(`${this.apiUrl}/api/projects/${id}`, { headers: this.getHeaders() });
+    return this.write(this.http.delete(`${this.apiUrl}/api/projects/${id}`, { headers: this.getHeaders() }));
   }
 
   // ========== KPIs ==========
   
   getKPIs(): Observable<Models.KPI[]> {
-    return this.http.get<Models.KPI[]>(`${this.apiUrl}/api/kpis`);
+    return this.section('kpis');
   }
 
   getAllKPIs(): Observable<Models.KPI[]> {
@@ -208,24 +274,24 @@ export class PortfolioService {
   }
 
   createKPI(kpi: Models.KPI): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/kpis`, kpi, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/kpis`, kpi, { headers: this.getHeaders() }));
   }
 
   updateKPI(id: number, kpi: Models.KPI): Observable<any> {
-    return this.http.put(`${this.apiUrl}/api/kpis/${id}`, kpi, { headers: this.getHeaders() });
+    return this.write(this.http.put(`${this.apiUrl}/api/kpis/${id}`, kpi, { headers: this.getHeaders() }));
   }
 
   deleteKPI(id: number): Observable<any> {
-    return this.http.delete(`${this.apiUrl}/api/kpis/${id}`, { headers: this.getHeaders() });
+    return this.write(this.http.delete(`${this.apiUrl}/api/kpis/${id}`, { headers: this.getHeaders() }));
   }
 
   // ========== CONTACT ==========
   
   getContact(): Observable<Models.Contact> {
-    return this.http.get<Models.Contact>(`${this.apiUrl}/api/contact`);
+    return this.section('contact');
   }
 
   updateContact(contact: Models.Contact): Observable<any> {
-    return this.http.post(`${this.apiUrl}/api/contact`, contact, { headers: this.getHeaders() });
+    return this.write(this.http.post(`${this.apiUrl}/api/contact`, contact, { headers: this.getHeaders() }));
   }
 }